@@ -60,4 +60,45 @@ public class ScoresController : ControllerBase
         var scores = await _gameService.GetTopScoresAsync(difficulty, limit);
         return Ok(scores);
     }
+
+    /// <summary>
+    /// Pobierz stronę wyników (stronicowanie keyset po TimeSeconds, Id)
+    /// </summary>
+    [HttpGet("page")]
+    public async Task<ActionResult<List<GameScore>>> GetScoresPage(
+        [FromQuery] string? difficulty = null,
+        [FromQuery] int? afterTime = null,
+        [FromQuery] int? afterId = null,
+        [FromQuery] int limit = 100)
+    {
+        if (limit < 1 || limit > 1000)
+        {
+            return BadRequest("Limit musi być między 1 a 1000");
+        }
+
+        if (afterTime.HasValue != afterId.HasValue)
+        {
+            return BadRequest("afterTime i afterId muszą być podane razem");
+        }
+
+        var scores = await _gameService.GetScoresPageAsync(difficulty, afterTime, afterId, limit);
+        return Ok(scores);
+    }
+
+    /// <summary>
+    /// Pobierz wyniki zapisane po wyniku afterId (rosnąco po Id) - przyrostowa synchronizacja
+    /// </summary>
+    [HttpGet("since")]
+    public async Task<ActionResult<List<GameScore>>> GetScoresSince(
+        [FromQuery] int afterId = 0,
+        [FromQuery] int limit = 1000)
+    {
+        if (limit < 1 || limit > 1000)
+        {
+            return BadRequest("Limit musi być między 1 a 1000");
+        }
+
+        var scores = await _gameService.GetScoresSinceAsync(afterId, limit);
+        return Ok(scores);
+    }
 }
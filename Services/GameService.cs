@@ -7,6 +7,8 @@ public interface IGameService
 {
     Task<GameScore> SaveScoreAsync(GameScore score);
     Task<List<GameScore>> GetTopScoresAsync(string? difficulty = null, int limit = 10);
+    Task<List<GameScore>> GetScoresPageAsync(string? difficulty, int? afterTime, int? afterId, int limit);
+    Task<List<GameScore>> GetScoresSinceAsync(int afterId, int limit);
     Task<PlayerProgress> GetPlayerProgressAsync(string playerName);
     Task<PlayerProgress> UpdatePlayerProgressAsync(string playerName, string difficulty);
     Task<List<Reward>> GetRewardsAsync(string playerName);
@@ -14,34 +16,107 @@ public interface IGameService
 
 public class GameService : IGameService
 {
-    private readonly ConcurrentBag<GameScore> _scores = new();
+    // Tablice wyników posortowane po (TimeSeconds, Id): top-N i stronicowanie keyset w O(log n + k)
+    private readonly object _scoresLock = new();
+    private readonly SortedSet<GameScore> _leaderboard = new(ScoreOrder.Instance);
+    private readonly Dictionary<string, SortedSet<GameScore>> _leaderboardByDifficulty = new(StringComparer.OrdinalIgnoreCase);
+    // Wyniki w kolejności zapisu (rosnące Id) - przyrostowa synchronizacja klientów
+    private readonly List<GameScore> _scoresById = new();
     private readonly ConcurrentDictionary<string, PlayerProgress> _progress = new();
     private int _scoreIdCounter = 1;
     private int _progressIdCounter = 1;
 
     public Task<GameScore> SaveScoreAsync(GameScore score)
     {
-        score.Id = Interlocked.Increment(ref _scoreIdCounter);
         score.PlayedAt = DateTime.UtcNow;
-        _scores.Add(score);
+
+        lock (_scoresLock)
+        {
+            // Id nadawane pod blokadą: widoczny wynik o Id N oznacza, że widoczne są wszystkie o Id < N
+            score.Id = ++_scoreIdCounter;
+            _scoresById.Add(score);
+            _leaderboard.Add(score);
+
+            if (!_leaderboardByDifficulty.TryGetValue(score.Difficulty, out var board))
+            {
+                board = new SortedSet<GameScore>(ScoreOrder.Instance);
+                _leaderboardByDifficulty[score.Difficulty] = board;
+            }
+            board.Add(score);
+        }
+
         return Task.FromResult(score);
     }
 
     public Task<List<GameScore>> GetTopScoresAsync(string? difficulty = null, int limit = 10)
     {
-        var query = _scores.AsEnumerable();
-        
-        if (!string.IsNullOrEmpty(difficulty))
+        lock (_scoresLock)
         {
-            query = query.Where(s => s.Difficulty.Equals(difficulty, StringComparison.OrdinalIgnoreCase));
+            var topScores = GetBoard(difficulty)?.Take(limit).ToList() ?? new List<GameScore>();
+            return Task.FromResult(topScores);
         }
+    }
+
+    public Task<List<GameScore>> GetScoresPageAsync(string? difficulty, int? afterTime, int? afterId, int limit)
+    {
+        lock (_scoresLock)
+        {
+            var board = GetBoard(difficulty);
+            if (board == null || board.Count == 0)
+            {
+                return Task.FromResult(new List<GameScore>());
+            }
+
+            IEnumerable<GameScore> view = board;
+
+            // Keyset: wyniki ściśle po (afterTime, afterId)
+            if (afterTime.HasValue && afterId.HasValue)
+            {
+                var cursor = new GameScore { TimeSeconds = afterTime.Value, Id = afterId.Value };
+                if (ScoreOrder.Instance.Compare(cursor, board.Max) >= 0)
+                {
+                    return Task.FromResult(new List<GameScore>());
+                }
 
-        var topScores = query
-            .OrderBy(s => s.TimeSeconds)
-            .Take(limit)
-            .ToList();
+                view = board.GetViewBetween(cursor, board.Max!)
+                    .SkipWhile(s => ScoreOrder.Instance.Compare(s, cursor) == 0);
+            }
 
-        return Task.FromResult(topScores);
+            return Task.FromResult(view.Take(limit).ToList());
+        }
+    }
+
+    public Task<List<GameScore>> GetScoresSinceAsync(int afterId, int limit)
+    {
+        lock (_scoresLock)
+        {
+            // Pierwszy wynik z Id > afterId - wyszukiwanie binarne po rosnących Id
+            int low = 0, high = _scoresById.Count;
+            while (low < high)
+            {
+                var middle = (low + high) / 2;
+                if (_scoresById[middle].Id <= afterId)
+                {
+                    low = middle + 1;
+                }
+                else
+                {
+                    high = middle;
+                }
+            }
+
+            return Task.FromResult(_scoresById.GetRange(low, Math.Min(limit, _scoresById.Count - low)));
+        }
+    }
+
+    private SortedSet<GameScore>? GetBoard(string? difficulty)
+    {
+        if (string.IsNullOrEmpty(difficulty))
+        {
+            return _leaderboard;
+        }
+
+        return _leaderboardByDifficulty.TryGetValue(difficulty, out var board) ? board : null;
     }
 
     public Task<PlayerProgress> GetPlayerProgressAsync(string playerName)
@@ -124,3 +199,21 @@ public class GameService : IGameService
         return Task.FromResult(rewards);
     }
 }
+
+/// <summary>
+/// Kolejność tablicy wyników: najpierw czas, potem Id (unikalny, stabilny klucz)
+/// </summary>
+internal sealed class ScoreOrder : IComparer<GameScore>
+{
+    public static readonly ScoreOrder Instance = new();
+
+    public int Compare(GameScore? x, GameScore? y)
+    {
+        if (ReferenceEquals(x, y)) return 0;
+        if (x is null) return -1;
+        if (y is null) return 1;
+
+        var byTime = x.TimeSeconds.CompareTo(y.TimeSeconds);
+        return byTime != 0 ? byTime : x.Id.CompareTo(y.Id);
+    }
+}
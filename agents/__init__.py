@@ -6,10 +6,34 @@ from .orchestrator import OrchestratorAgent
 from .game_agent import GameAgent
 from .data_agent import DataAgent
 from .mcp_agent import MCPAgent
+from .cache import ResultCache, TTLCache
+from .upstream import (AdaptiveLimiter, CircuitBreaker, CircuitOpenError, LimiterRejectedError,
+                       ResilientCaller, SingleFlight)
+from .aggregates import GameStatsAccumulator
+from .sketches import HyperLogLog, KLLSketch
+from .columnar import ScoreStore
+from .indexes import Leaderboard, PlayerIndex, PlayerSearchIndex
+from .scheduler import PriorityScheduler
 
 __all__ = [
     "OrchestratorAgent",
     "GameAgent",
     "DataAgent",
     "MCPAgent",
+    "TTLCache",
+    "ResultCache",
+    "SingleFlight",
+    "ResilientCaller",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "AdaptiveLimiter",
+    "LimiterRejectedError",
+    "GameStatsAccumulator",
+    "HyperLogLog",
+    "KLLSketch",
+    "ScoreStore",
+    "PlayerIndex",
+    "Leaderboard",
+    "PlayerSearchIndex",
+    "PriorityScheduler",
 ]
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Agregaty statystyk gry liczone w jednym przebiegu strumieniowym po wynikach
+"""
+
+import bisect
+import copy
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from .cache import TTLCache
+from .sketches import HyperLogLog, KLLSketch
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+UNIQUE_METHODS = ("exact", "hll")
+
+# Percentyle czasów ukończenia i granice przedziałów histogramu (sekundy)
+PERCENTILES = (50, 90, 99)
+HISTOGRAM_EDGES = (30, 60, 120, 300, 600, 1200, 2400)
+
+
+class GameStatsAccumulator:
+    """Statystyki gry aktualizowane wynik po wyniku - bez przechowywania listy wyników
+
+    Każda metryka ma stałą pamięć: liczniki, rozkład i minimum per poziom,
+    histogram czasów (stałe przedziały) i szkic KLL dla percentyli.
+    Unikalni gracze: `unique="exact"` (zbiór nazw, pamięć rośnie z liczbą graczy)
+    albo `unique="hll"` (HyperLogLog, 16 KiB, błąd ~0.8%).
+    """
+
+    def __init__(self, unique: str = "exact", difficulties: Optional[List[str]] = None):
+        if unique not in UNIQUE_METHODS:
+            raise ValueError(f"unique musi być jednym z: {', '.join(UNIQUE_METHODS)}")
+        self.unique = unique
+        self.total_games = 0
+        self.distribution: Dict[str, int] = {d: 0 for d in (difficulties or DIFFICULTIES)}
+        self.best_times: Dict[str, Optional[int]] = {d: None for d in self.distribution}
+        self.time_sketches: Dict[str, KLLSketch] = {d: KLLSketch() for d in self.distribution}
+        self.histograms: Dict[str, List[int]] = {d: [0] * (len(HISTOGRAM_EDGES) + 1) for d in self.distribution}
+        self._players = set() if unique == "exact" else HyperLogLog()
+
+    def add(self, player_name: str, difficulty: str, time_seconds: int) -> None:
+        self.total_games += 1
+        self._players.add(player_name)
+        if difficulty in self.distribution:
+            self.distribution[difficulty] += 1
+            best = self.best_times[difficulty]
+            if best is None or time_seconds < best:
+                self.best_times[difficulty] = time_seconds
+            self.time_sketches[difficulty].add(time_seconds)
+            self.histograms[difficulty][bisect.bisect_right(HISTOGRAM_EDGES, time_seconds)] += 1
+
+    def add_score(self, score: Dict) -> None:
+        """Dodaj wynik w formacie API (playerName, difficulty, timeSeconds)"""
+        self.add(score["playerName"], score["difficulty"], score["timeSeconds"])
+
+    def merge(self, other: "GameStatsAccumulator") -> None:
+        if other.unique != self.unique:
+            raise ValueError("Nie można łączyć agregatów z różną metodą liczenia graczy")
+        self.total_games += other.total_games
+        for difficulty, count in other.distribution.items():
+            self.distribution[difficulty] = self.distribution.get(difficulty, 0) + count
+            best, theirs = self.best_times.get(difficulty), other.best_times[difficulty]
+            if best is None or (theirs is not None and theirs < best):
+                self.best_times[difficulty] = theirs
+            if difficulty in self.time_sketches:
+                self.time_sketches[difficulty].merge(other.time_sketches[difficulty])
+                self.histograms[difficulty] = [
+                    a + b for a, b in zip(self.histograms[difficulty], other.histograms[difficulty])
+                ]
+            else:
+                self.time_sketches[difficulty] = copy.deepcopy(other.time_sketches[difficulty])
+                self.histograms[difficulty] = list(other.histograms[difficulty])
+        if self.unique == "exact":
+            self._players |= other._players
+        else:
+            self._players.merge(other._players)
+
+    @property
+    def unique_players(self) -> int:
+        return len(self._players)
+
+    def result(self) -> Dict:
+        """Wynik w kształcie GameStats serwera MCP"""
+        players = self.unique_players
+        return {
+            "total_games": self.total_games,
+            "unique_players": players,
+            "unique_players_method": self.unique,
+            "distribution": dict(self.distribution),
+            "best_times": dict(self.best_times),
+            "avg_games_per_player": self.total_games / players if players else 0.0,
+        }
+
+    def most_popular(self) -> Optional[str]:
+        """Poziom z największą liczbą gier (None, jeśli brak wyników)"""
+        if not any(self.distribution.values()):
+            return None
+        return max(self.distribution, key=self.distribution.get)
+
+    def analytics(self) -> Dict:
+        """Percentyle i histogramy czasów per poziom (kształt LeaderboardAnalytics serwera MCP)"""
+        levels = {}
+        for difficulty, sketch in self.time_sketches.items():
+            values = sketch.quantiles(p / 100 for p in PERCENTILES)
+            bounds = (0,) + HISTOGRAM_EDGES
+            levels[difficulty] = {
+                "count": self.distribution[difficulty],
+                "best_time": self.best_times[difficulty],
+                "percentiles": {f"p{p}": value for p, value in zip(PERCENTILES, values)},
+                "histogram": [
+                    {"from": low, "to": high, "count": count}
+                    for low, high, count in zip(bounds, HISTOGRAM_EDGES + (None,), self.histograms[difficulty])
+                ],
+            }
+        return {
+            "total_games": self.total_games,
+            "most_popular": self.most_popular(),
+            "levels": levels,
+        }
+
+
+# Okna kroczące raportów (period → długość okna); "all" to agregat całej historii
+PERIODS = {
+    "day": timedelta(days=1),
+    "week": timedelta(days=7),
+    "month": timedelta(days=30),
+}
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+
+def parse_played_at(value: Optional[str]) -> Optional[datetime]:
+    """Czas gry z API (ISO 8601, UTC) - None, jeśli brak lub niepoprawny"""
+    if not value:
+        return None
+    try:
+        played_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if played_at.tzinfo is None:
+        return played_at.replace(tzinfo=timezone.utc)
+    return played_at.astimezone(timezone.utc)
+
+
+class TimeBucketedStats:
+    """Rollupy statystyk w kubełkach czasu (UTC): godzinowych i dziennych
+
+    Każdy wynik trafia do kubełka swojej godziny i swojego dnia. Okno kroczące
+    (np. ostatnie 7 dni) to złączenie co najwyżej ~76 kubełków: godziny na
+    brzegach okna i pełne dni w środku - zamiast przeglądu wszystkich wyników.
+    Złączenie zamkniętej części okna (bez bieżącej godziny) jest cache'owane;
+    wpis jest ważny, dopóki liczności kubełków się nie zmieniły, więc kolejne
+    raporty za ten sam okres sprowadzają się do jednego złączenia z bieżącą godziną.
+    """
+
+    def __init__(self, unique: str = "exact", hourly_retention: timedelta = timedelta(days=32)):
+        self.unique = unique
+        self.hourly_retention = hourly_retention
+        self.hours: Dict[datetime, GameStatsAccumulator] = {}
+        self.days: Dict[datetime, GameStatsAccumulator] = {}
+        self.latest_hour: Optional[datetime] = None
+        # Wpisy weryfikowane sygnaturą - rollupy rosną przyrostowo, więc cache nie jest czyszczony
+        self.window_cache = TTLCache(max_entries=64, ttl=24 * 3600)
+
+    def _bucket(self, buckets: Dict[datetime, GameStatsAccumulator], start: datetime) -> GameStatsAccumulator:
+        accumulator = buckets.get(start)
+        if accumulator is None:
+            accumulator = buckets[start] = GameStatsAccumulator(unique=self.unique)
+        return accumulator
+
+    def add(self, player_name: str, difficulty: str, time_seconds: int, played_at: datetime) -> None:
+        hour = played_at.replace(minute=0, second=0, microsecond=0)
+        self._bucket(self.days, hour.replace(hour=0)).add(player_name, difficulty, time_seconds)
+        
+        if self.latest_hour is None or hour > self.latest_hour:
+            self.latest_hour = hour
+            self._prune()
+        if hour > self.latest_hour - self.hourly_retention:
+            self._bucket(self.hours, hour).add(player_name, difficulty, time_seconds)
+
+    def _prune(self) -> None:
+        cutoff = self.latest_hour - self.hourly_retention
+        for hour in [h for h in self.hours if h <= cutoff]:
+            del self.hours[hour]
+
+    def _closed_buckets(self, start: datetime, end: datetime) -> List[GameStatsAccumulator]:
+        """Kubełki pokrywające [start, end): pełne dni tam, gdzie się da, godziny na brzegach"""
+        buckets = []
+        cursor = start
+        while cursor < end:
+            if cursor.hour == 0 and cursor + DAY <= end:
+                bucket, cursor = self.days.get(cursor), cursor + DAY
+            else:
+                bucket, cursor = self.hours.get(cursor), cursor + HOUR
+            if bucket is not None:
+                buckets.append(bucket)
+        return buckets
+
+    def window(self, length: timedelta, now: Optional[datetime] = None) -> GameStatsAccumulator:
+        """Statystyki okna kroczącego [now - length, now] z dokładnością do godziny"""
+        now = now or datetime.now(timezone.utc)
+        current_hour = now.replace(minute=0, second=0, microsecond=0)
+        start = current_hour - length + HOUR
+        
+        closed = self._closed_buckets(start, current_hour)
+        signature = tuple(bucket.total_games for bucket in closed)
+        key = ("window", start, current_hour)
+        cached = self.window_cache.get(key, accept=lambda entry: entry[0] == signature)
+        if cached is None:
+            merged = GameStatsAccumulator(unique=self.unique)
+            for bucket in closed:
+                merged.merge(bucket)
+            cached = (signature, merged)
+            self.window_cache.set(key, cached)
+        
+        result = GameStatsAccumulator(unique=self.unique)
+        result.merge(cached[1])
+        if current_hour in self.hours:
+            result.merge(self.hours[current_hour])
+        return result
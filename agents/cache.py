@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Cache TTL z wypieraniem LRU - wspólny dla serwera MCP i agentów
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from .upstream import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Ograniczony cache w pamięci: wpisy wygasają po TTL, nadmiar wypierany LRU
+
+    `generation` rośnie przy każdej inwalidacji - wywołujący może przekazać
+    wartość odczytaną przed pobraniem danych do `set()`, aby nie zapisać
+    wyniku, który w międzyczasie został unieważniony przez zapis.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable, default: Any = None,
+            accept: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Zwróć wartość albo `default`; `accept` może odrzucić niepasujący wpis (liczony jako miss)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+            elif accept is None or accept(value):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None,
+            generation: Optional[int] = None) -> None:
+        """Zapisz wartość (pomijane, jeśli od `generation` nastąpiła inwalidacja)"""
+        if not self.enabled or (generation is not None and generation != self.generation):
+            return
+        self._entries[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Usuń wskazane klucze"""
+        self.generation += 1
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class ResultCache:
+    """Cache wyników operacji z TTL per rodzaj operacji i stale-while-revalidate
+
+    Wpis jest świeży przez `ttls[kind]` sekund. Dla rodzajów z `stale[kind]`
+    przeterminowany wpis jest jeszcze przez tyle sekund zwracany od razu,
+    a w tle uruchamiane jest jedno odświeżenie. Rodzaje bez TTL nie są
+    cache'owane. Równoległe chybienia tego samego klucza wykonują `load` raz.
+    Zapisywane są tylko wyniki zaakceptowane przez `cacheable`; wynik pobierany
+    w chwili `invalidate_all()` nie trafia do cache, a chybienia po inwalidacji
+    nie dołączają do pobrań rozpoczętych przed nią.
+    """
+
+    def __init__(self, ttls: Dict[str, float], stale: Optional[Dict[str, float]] = None,
+                 max_entries: int = 1024, cacheable: Callable[[Any], bool] = lambda _: True,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttls = {kind: ttl for kind, ttl in ttls.items() if ttl > 0}
+        self.stale = dict(stale or {})
+        self.cacheable = cacheable
+        self._clock = clock
+        longest = max((ttl + self.stale.get(kind, 0) for kind, ttl in self.ttls.items()), default=0)
+        self._entries = TTLCache(max_entries=max_entries, ttl=longest, clock=clock)
+        self._flights = SingleFlight()
+        self._revalidating: Dict[Hashable, asyncio.Task] = {}
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.revalidations = 0
+        self.revalidation_errors = 0
+
+    def enabled_for(self, kind: str) -> bool:
+        return kind in self.ttls
+
+    async def get_or_load(self, kind: str, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled_for(kind):
+            return await load()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            fresh_until, value = entry
+            if self._clock() < fresh_until:
+                self.fresh_hits += 1
+                return value
+            self.stale_hits += 1
+            self._revalidate(kind, key, load)
+            return value
+
+        return await self._flight(kind, key, load)
+
+    def _flight(self, kind: str, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Awaitable[Any]:
+        # Pobrania współdzielone tylko w obrębie jednej generacji cache. Czysty kontekst:
+        # wspólne pobranie nie dziedziczy terminu żądania, które je rozpoczęło - termin
+        # każdego wywołującego przerywa tylko jego własne oczekiwanie
+        generation = self._entries.generation
+        return self._flights.do((key, generation), lambda: self._load(kind, key, load, generation),
+                                context=contextvars.Context())
+
+    async def _load(self, kind: str, key: Hashable, load: Callable[[], Awaitable[Any]],
+                    generation: int) -> Any:
+        value = await load()
+        if self.cacheable(value):
+            ttl = self.ttls[kind]
+            self._entries.set(key, (self._clock() + ttl, value), ttl=ttl + self.stale.get(kind, 0),
+                              generation=generation)
+        return value
+
+    def _revalidate(self, kind: str, key: Hashable, load: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._revalidating:
+            return
+        self.revalidations += 1
+
+        async def refresh():
+            try:
+                await self._flight(kind, key, load)
+            except Exception as e:
+                self.revalidation_errors += 1
+                logger.warning("⚠️  Background refresh failed for %s: %s", key, e)
+            finally:
+                self._revalidating.pop(key, None)
+
+        # Czysty kontekst: odświeżenie nie dziedziczy terminu żądania, które je wywołało
+        self._revalidating[key] = asyncio.create_task(refresh(), context=contextvars.Context())
+
+    def invalidate_all(self) -> None:
+        """Unieważnij wszystkie wpisy"""
+        self._entries.clear()
+
+    async def close(self) -> None:
+        tasks: Set[asyncio.Task] = set(self._revalidating.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries.stats()
+        lookups = self.fresh_hits + self.stale_hits + entries["misses"]
+        return {
+            "size": entries["size"],
+            "max_entries": entries["max_entries"],
+            "ttl_seconds": dict(self.ttls),
+            "stale_seconds": {kind: self.stale[kind] for kind in self.ttls if kind in self.stale},
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": entries["misses"],
+            "hit_ratio": (self.fresh_hits + self.stale_hits) / lookups if lookups else 0.0,
+            "revalidations": self.revalidations,
+            "revalidation_errors": self.revalidation_errors,
+            "coalesced": self._flights.shared,
+            "evictions": entries["evictions"],
+            "invalidations": entries["invalidations"],
+        }
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Kolumnowy magazyn wyników w pamięci - zwarta reprezentacja do analiz
+
+Zamiast listy słowników JSON (~1 KB na wynik) każda kolumna to tablica
+`array.array` o stałym typie: Id i czas jako int32, poziom jako int8,
+gracz jako int32 (indeks do tablicy internowanych nazw), czas gry jako
+int64 (ms od epoki). Z NumPy operacje są wektorowe (widoki bez kopiowania
+buforów); bez NumPy statystyki całości pochodzą z agregatu aktualizowanego
+przy każdym wyniku, a zapytania z filtrami wykonywane są w pętli Pythona.
+"""
+
+import bisect
+import heapq
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from .aggregates import DIFFICULTIES, HISTOGRAM_EDGES, PERCENTILES, GameStatsAccumulator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Brak czasu gry w danych z API
+NO_TIMESTAMP = -(2 ** 63)
+
+
+def to_epoch_ms(played_at: Optional[datetime]) -> int:
+    return NO_TIMESTAMP if played_at is None else int(played_at.timestamp() * 1000)
+
+
+class ScoreStore:
+    """Wyniki w kolumnach (struktura tablic) z internowanymi nazwami graczy
+
+    Filtry (`difficulty`, `since`, `until`, `player`) są wspólne dla wszystkich
+    zapytań; `since`/`until` to datetime, zakres [since, until).
+    Widoki NumPy tworzone są tylko na czas zapytania - tablice można dalej rozszerzać.
+    """
+
+    def __init__(self, difficulties: Optional[List[str]] = None):
+        self.difficulties = list(difficulties or DIFFICULTIES)
+        self._codes = {difficulty: code for code, difficulty in enumerate(self.difficulties)}
+        self.names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        self.ids = array("i")
+        self.players = array("i")
+        self.levels = array("b")
+        self.times = array("i")
+        self.played_at = array("q")
+        # Bez NumPy: agregat całości aktualizowany przy każdym wyniku - stats()/analytics() bez przeglądu
+        self._totals = GameStatsAccumulator(difficulties=self.difficulties) if np is None else None
+
+    @property
+    def vectorized(self) -> bool:
+        return np is not None
+
+    def intern(self, player_name: str) -> int:
+        """Id gracza (kolejne liczby od 0); nowa nazwa dostaje kolejne Id"""
+        player_id = self._name_ids.get(player_name)
+        if player_id is None:
+            player_id = self._name_ids[player_name] = len(self.names)
+            self.names.append(player_name)
+        return player_id
+
+    def player_id(self, player_name: str) -> Optional[int]:
+        return self._name_ids.get(player_name)
+
+    def append(self, score_id: Optional[int], player_name: str, difficulty: str, time_seconds: int,
+               played_at: Optional[datetime] = None) -> int:
+        """Dodaj wynik; zwraca numer wiersza. Nieznany poziom ma kod -1 (liczony tylko w sumie)"""
+        self.ids.append(score_id if score_id is not None else -1)
+        self.players.append(self.intern(player_name))
+        self.levels.append(self._codes.get(difficulty, -1))
+        self.times.append(time_seconds)
+        self.played_at.append(to_epoch_ms(played_at))
+        if self._totals is not None:
+            self._totals.add(self.players[-1], difficulty if difficulty in self._codes else "", time_seconds)
+        return len(self.times) - 1
+
+    def append_score(self, score: Dict, played_at: Optional[datetime] = None) -> int:
+        """Dodaj wynik w formacie API (id, playerName, difficulty, timeSeconds)"""
+        return self.append(score.get("id"), score["playerName"], score["difficulty"], score["timeSeconds"], played_at)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def nbytes(self) -> int:
+        """Rozmiar kolumn w bajtach (bez tablicy nazw)"""
+        return sum(column.itemsize * len(column)
+                   for column in (self.ids, self.players, self.levels, self.times, self.played_at))
+
+    # Filtry
+
+    def _rows(self, difficulty: Optional[str] = None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None, player: Optional[str] = None) -> Iterable[int]:
+        """Numery wierszy spełniających filtry (ścieżka bez NumPy)"""
+        code = self._codes.get(difficulty, -2) if difficulty else None
+        player_id = self._name_ids.get(player, -2) if player else None
+        since_ms = to_epoch_ms(since) if since else None
+        until_ms = to_epoch_ms(until) if until else None
+        for row in range(len(self.times)):
+            if code is not None and self.levels[row] != code:
+                continue
+            if player_id is not None and self.players[row] != player_id:
+                continue
+            if since_ms is not None and self.played_at[row] < since_ms:
+                continue
+            if until_ms is not None and self.played_at[row] >= until_ms:
+                continue
+            yield row
+
+    def _mask(self, difficulty: Optional[str] = None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None, player: Optional[str] = None):
+        """Maska boolowska NumPy (None = wszystkie wiersze)"""
+        mask = None
+
+        def both(condition):
+            return condition if mask is None else mask & condition
+
+        if difficulty:
+            mask = both(np.frombuffer(self.levels, dtype=np.int8) == self._codes.get(difficulty, -2))
+        if player:
+            mask = both(np.frombuffer(self.players, dtype=np.int32) == self._name_ids.get(player, -2))
+        if since or until:
+            played_at = np.frombuffer(self.played_at, dtype=np.int64)
+            if since:
+                mask = both(played_at >= to_epoch_ms(since))
+            if until:
+                mask = both(played_at < to_epoch_ms(until))
+        return mask
+
+    def _column(self, column: array, dtype, mask):
+        values = np.frombuffer(column, dtype=dtype)
+        return values if mask is None else values[mask]
+
+    # Agregaty
+
+    def accumulate(self, **filters) -> GameStatsAccumulator:
+        """Agregat strumieniowy z wybranych wierszy (ścieżka bez NumPy)"""
+        accumulator = GameStatsAccumulator(difficulties=self.difficulties)
+        for row in self._rows(**filters):
+            code = self.levels[row]
+            accumulator.add(self.players[row], self.difficulties[code] if code >= 0 else "",
+                            self.times[row])
+        return accumulator
+
+    def _aggregate(self, **filters) -> GameStatsAccumulator:
+        """Agregat bieżący dla zapytań bez filtrów, w przeciwnym razie przegląd wierszy"""
+        if self._totals is not None and not any(filters.values()):
+            return self._totals
+        return self.accumulate(**filters)
+
+    def stats(self, **filters) -> Dict:
+        """Statystyki w kształcie GameStats (unikalni gracze liczeni dokładnie)"""
+        if np is None:
+            return self._aggregate(**filters).result()
+
+        mask = self._mask(**filters)
+        levels = self._column(self.levels, np.int8, mask)
+        times = self._column(self.times, np.int32, mask)
+        players = self._column(self.players, np.int32, mask)
+
+        total = int(levels.size)
+        known = levels >= 0
+        counts = np.bincount(levels[known], minlength=len(self.difficulties))
+        best_times = {}
+        for code, difficulty in enumerate(self.difficulties):
+            level_times = times[levels == code]
+            best_times[difficulty] = int(level_times.min()) if level_times.size else None
+        unique = int(np.count_nonzero(np.bincount(players, minlength=len(self.names)))) if total else 0
+
+        return {
+            "total_games": total,
+            "unique_players": unique,
+            "unique_players_method": "exact",
+            "distribution": {d: int(counts[code]) for code, d in enumerate(self.difficulties)},
+            "best_times": best_times,
+            "avg_games_per_player": total / unique if unique else 0.0,
+        }
+
+    def analytics(self, **filters) -> Dict:
+        """Percentyle (dokładne) i histogramy czasów per poziom - kształt LeaderboardAnalytics"""
+        if np is None:
+            return self._aggregate(**filters).analytics()
+
+        mask = self._mask(**filters)
+        levels = self._column(self.levels, np.int8, mask)
+        times = self._column(self.times, np.int32, mask)
+        edges = np.array(HISTOGRAM_EDGES)
+        bounds = (0,) + HISTOGRAM_EDGES
+
+        result_levels = {}
+        counts = {}
+        for code, difficulty in enumerate(self.difficulties):
+            level_times = times[levels == code]
+            counts[difficulty] = int(level_times.size)
+            if level_times.size:
+                values = np.percentile(level_times, PERCENTILES, method="inverted_cdf")
+                percentiles = {f"p{p}": int(v) for p, v in zip(PERCENTILES, values)}
+                best = int(level_times.min())
+            else:
+                percentiles = {f"p{p}": None for p in PERCENTILES}
+                best = None
+            histogram = np.bincount(np.searchsorted(edges, level_times, side="right"),
+                                    minlength=len(HISTOGRAM_EDGES) + 1)
+            result_levels[difficulty] = {
+                "count": counts[difficulty],
+                "best_time": best,
+                "percentiles": percentiles,
+                "histogram": [
+                    {"from": low, "to": high, "count": int(count)}
+                    for low, high, count in zip(bounds, HISTOGRAM_EDGES + (None,), histogram)
+                ],
+            }
+
+        return {
+            "total_games": int(levels.size),
+            "most_popular": max(counts, key=counts.get) if any(counts.values()) else None,
+            "levels": result_levels,
+        }
+
+    def percentile_rank(self, difficulty: str, time_seconds: int, **filters) -> Optional[float]:
+        """Odsetek wyników poziomu z czasem gorszym (dłuższym) niż `time_seconds` (0-100)"""
+        if np is None:
+            times = sorted(self.times[row] for row in self._rows(difficulty=difficulty, **filters))
+            if not times:
+                return None
+            return (len(times) - bisect.bisect_right(times, time_seconds)) / len(times) * 100
+
+        times = self._column(self.times, np.int32, self._mask(difficulty=difficulty, **filters))
+        if not times.size:
+            return None
+        return float(np.count_nonzero(times > time_seconds)) / times.size * 100
+
+    # Wiersze
+
+    def score(self, row: int) -> Dict:
+        """Wiersz w formacie API (id, playerName, difficulty, timeSeconds, playedAt)"""
+        code = self.levels[row]
+        played_at = self.played_at[row]
+        return {
+            "id": self.ids[row] if self.ids[row] >= 0 else None,
+            "playerName": self.names[self.players[row]],
+            "difficulty": self.difficulties[code] if code >= 0 else "",
+            "timeSeconds": self.times[row],
+            "playedAt": (datetime.fromtimestamp(played_at / 1000, timezone.utc).isoformat()
+                         if played_at != NO_TIMESTAMP else None),
+        }
+
+    def top(self, limit: int, **filters) -> List[Dict]:
+        """Najlepsze wyniki (czas rosnąco, przy remisie Id) w formacie API - jak GET /scores"""
+        if np is None:
+            rows = heapq.nsmallest(limit, self._rows(**filters), key=lambda row: (self.times[row], self.ids[row]))
+        else:
+            mask = self._mask(**filters)
+            rows = np.arange(len(self.times)) if mask is None else np.flatnonzero(mask)
+            times = self._column(self.times, np.int32, mask)
+            if limit < times.size:
+                # Kandydaci: czasy nie gorsze od `limit`-tego (z remisami na granicy) - O(n) zamiast sortowania
+                cutoff = np.partition(times, limit - 1)[limit - 1]
+                candidates = np.flatnonzero(times <= cutoff)
+                rows, times = rows[candidates], times[candidates]
+            ids = self._column(self.ids, np.int32, None)[rows]
+            rows = rows[np.lexsort((ids, times))[:limit]].tolist()
+        return [self.score(row) for row in rows]
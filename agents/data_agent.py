@@ -4,22 +4,23 @@ Data Agent - analiza danych i statystyk
 """
 
 import asyncio
-from typing import Dict
+import json
+from typing import Dict, List, Optional
 import logging
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+
+from agents.mcp_agent import MCPAgent
 
 logger = logging.getLogger(__name__)
 
+LEVEL_NAMES = {"easy": "🟢 Łatwy", "medium": "🟡 Średni", "hard": "🔴 Trudny"}
+
 
 class DataAgent:
     """Agent do analizy danych i generowania raportów"""
     
-    def __init__(self):
-        self.mcp_server = StdioServerParameters(
-            command="python3",
-            args=["mcp_server_minesweeper.py"]
-        )
+    def __init__(self, mcp_agent: Optional[MCPAgent] = None):
+        # Sesje MCP wypożyczane z puli MCPAgent (współdzielonej przez orchestrator)
+        self.mcp_agent = mcp_agent or MCPAgent()
         logger.info("📊 DataAgent initialized")
     
     async def analyze(self) -> Dict:
@@ -27,22 +28,19 @@ class DataAgent:
         logger.info("🔍 Analyzing game statistics")
         
         try:
-            async with stdio_client(self.mcp_server) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    # Pobierz statystyki
-                    stats = await session.read_resource("mcp://game-stats")
-                    
-                    # Parsuj statystyki
-                    parsed = self._parse_stats(stats.contents[0].text)
-                    
-                    return {
-                        "status": "success",
-                        "agent": "data",
-                        "raw_stats": stats.contents[0].text,
-                        "parsed": parsed
-                    }
+            async with self.mcp_agent.session() as session:
+                # Statystyki w formie strukturalnej (GameStats) - bez parsowania tekstu
+                stats = await session.read_resource("mcp://game-stats/json")
+                parsed = json.loads(stats.contents[0].text)
+                
+                if "error" in parsed:
+                    raise RuntimeError(parsed["error"])
+                
+                return {
+                    "status": "success",
+                    "agent": "data",
+                    "parsed": parsed
+                }
         except Exception as e:
             logger.error("❌ Error analyzing stats: %s", e)
             return {
@@ -51,77 +49,127 @@ class DataAgent:
                 "error": str(e)
             }
     
-    def _parse_stats(self, stats_text: str) -> Dict:
-        """Parsuj tekst statystyk na strukturę JSON"""
-        lines = stats_text.split('\n')
+    async def leaderboard_analytics(self) -> Dict:
+        """Percentyle (p50/p90/p99) i histogramy czasów per poziom"""
+        logger.info("⏱️  Fetching leaderboard analytics")
         
-        parsed = {
-            "total_games": 0,
-            "unique_players": 0,
-            "distribution": {},
-            "best_times": {}
-        }
+        try:
+            async with self.mcp_agent.session() as session:
+                result = await session.read_resource("mcp://leaderboard-analytics/json")
+                analytics = json.loads(result.contents[0].text)
+                
+                if "error" in analytics:
+                    raise RuntimeError(analytics["error"])
+                
+                return {
+                    "status": "success",
+                    "agent": "data",
+                    "analytics": analytics
+                }
+        except Exception as e:
+            logger.error("❌ Error fetching leaderboard analytics: %s", e)
+            return {
+                "status": "error",
+                "agent": "data",
+                "error": str(e)
+            }
+    
+    async def overview(self, limit: int = 5) -> Dict:
+        """
+        Najlepsze wyniki i statystyki gry - jedno wywołanie MCP, jeden przegląd wyników
         
-        for line in lines:
-            # Parsowanie (uproszczone regex można ulepszyć)
-            if "Rozegranych gier:" in line:
-                try:
-                    parsed["total_games"] = int(line.split(':')[1].strip())
-                except:
-                    pass
-            
-            elif "Unikalnych graczy:" in line:
-                try:
-                    parsed["unique_players"] = int(line.split(':')[1].strip())
-                except:
-                    pass
-            
-            elif "Łatwy:" in line and "s" in line:
-                try:
-                    time_str = line.split(':')[-1].strip().replace('s', '')
-                    parsed["best_times"]["easy"] = int(time_str)
-                except:
-                    pass
-            
-            elif "Średni:" in line and "s" in line:
-                try:
-                    time_str = line.split(':')[-1].strip().replace('s', '')
-                    parsed["best_times"]["medium"] = int(time_str)
-                except:
-                    pass
-            
-            elif "Trudny:" in line and "s" in line:
-                try:
-                    time_str = line.split(':')[-1].strip().replace('s', '')
-                    parsed["best_times"]["hard"] = int(time_str)
-                except:
-                    pass
+        Args:
+            limit: liczba najlepszych wyników
         
-        return parsed
+        Returns:
+            "scores": ScoresResult, "scores_text": ranking jak z get_scores, "stats": GameStats
+        """
+        logger.info("🧭 Fetching game overview: limit=%d", limit)
+        
+        try:
+            async with self.mcp_agent.session() as session:
+                result = await session.call_tool(
+                    "get_game_overview",
+                    arguments={"limit": limit, "output_format": "json"}
+                )
+                overview = json.loads(result.content[0].text)
+                
+                if "error" in overview:
+                    raise RuntimeError(overview["error"])
+                
+                return {
+                    "status": "success",
+                    "agent": "data",
+                    "scores": overview["scores"],
+                    "scores_text": overview["scores_text"],
+                    "stats": overview["stats"]
+                }
+        except Exception as e:
+            logger.error("❌ Error fetching game overview: %s", e)
+            return {
+                "status": "error",
+                "agent": "data",
+                "error": str(e)
+            }
+    
+    async def period_stats(self, period: str = "all") -> Dict:
+        """
+        Statystyki i analiza czasów za okres (złączenie kubełków czasu na serwerze MCP)
+        
+        Args:
+            period: day, week, month (okna kroczące) lub all
+        """
+        try:
+            async with self.mcp_agent.session() as session:
+                result = await session.read_resource(f"mcp://report/{period}")
+                report = json.loads(result.contents[0].text)
+                
+                if "error" in report:
+                    raise RuntimeError(report["error"])
+                
+                return {
+                    "status": "success",
+                    "agent": "data",
+                    "period": period,
+                    "since": report["since"],
+                    "parsed": report["stats"],
+                    "analytics": report["analytics"]
+                }
+        except Exception as e:
+            logger.error("❌ Error fetching stats for period %s: %s", period, e)
+            return {
+                "status": "error",
+                "agent": "data",
+                "error": str(e)
+            }
     
     async def generate_report(self, period: str = "week") -> Dict:
         """
         Generuj raport za okres
         
         Args:
-            period: day, week, month, all
+            period: day, week, month (okna kroczące: ostatnie 24h / 7 / 30 dni), all
         """
         logger.info("📝 Generating report for period: %s", period)
         
-        stats = await self.analyze()
+        stats = await self.period_stats(period)
         
         if stats["status"] != "success":
             return stats
         
         parsed = stats["parsed"]
-        
-        # Oblicz metryki
-        avg_games_per_player = (
-            parsed["total_games"] / max(parsed["unique_players"], 1)
-        )
+        levels = stats["analytics"]["levels"]
+        percentiles = {
+            difficulty: level["percentiles"] for difficulty, level in levels.items() if level["count"]
+        }
+        most_popular = stats["analytics"]["most_popular"]
+        best_times = {
+            difficulty: time for difficulty, time in parsed["best_times"].items() if time is not None
+        }
+        avg_games_per_player = parsed["avg_games_per_player"]
         
         report = f"""
-📊 Raport za okres: {period}
+📊 Raport za okres: {period}{f" (od {stats['since']})" if stats['since'] else ""}
 
 🎮 **Podstawowe statystyki:**
 - Rozegranych gier: {parsed['total_games']}
@@ -129,51 +177,95 @@ class DataAgent:
 - Średnia gier/gracz: {avg_games_per_player:.1f}
 
 🏆 **Najlepsze czasy:**
-- 🟢 Łatwy: {parsed['best_times'].get('easy', 'N/A')}s
-- 🟡 Średni: {parsed['best_times'].get('medium', 'N/A')}s
-- 🔴 Trudny: {parsed['best_times'].get('hard', 'N/A')}s
+- 🟢 Łatwy: {best_times.get('easy', 'N/A')}s
+- 🟡 Średni: {best_times.get('medium', 'N/A')}s
+- 🔴 Trudny: {best_times.get('hard', 'N/A')}s
+
+⏱️ **Czasy ukończenia (p50 / p90 / p99):**
+{self._format_percentiles(percentiles)}
 
 📈 **Wnioski:**
 - Aktywność graczy: {'wysoka' if avg_games_per_player > 3 else 'średnia' if avg_games_per_player > 1 else 'niska'}
-- Najpopularniejszy poziom: (do implementacji)
+- Najpopularniejszy poziom: {LEVEL_NAMES.get(most_popular, most_popular or 'brak danych')}
 """
         
         return {
             "status": "success",
             "agent": "data",
             "period": period,
+            "since": stats["since"],
             "report": report,
             "metrics": {
                 "total_games": parsed["total_games"],
                 "unique_players": parsed["unique_players"],
                 "avg_games_per_player": avg_games_per_player,
-                "best_times": parsed["best_times"]
+                "distribution": parsed["distribution"],
+                "best_times": best_times,
+                "percentiles": percentiles,
+                "histograms": {difficulty: level["histogram"] for difficulty, level in levels.items()},
+                "most_popular": most_popular
             }
         }
     
+    @staticmethod
+    def _format_percentiles(percentiles: Dict) -> str:
+        if not percentiles:
+            return "- brak danych"
+        return "\n".join(
+            f"- {LEVEL_NAMES.get(difficulty, difficulty)}: "
+            f"{values['p50']}s / {values['p90']}s / {values['p99']}s"
+            for difficulty, values in percentiles.items()
+        )
+    
     async def compare_players(self, player1: str, player2: str) -> Dict:
-        """Porównaj dwóch graczy (do implementacji)"""
+        """Porównaj dwóch graczy (najlepsze czasy, próby, trend, percentyl per poziom)"""
         logger.info("⚖️  Comparing players: %s vs %s", player1, player2)
         
-        # TODO: Implement player comparison
-        return {
-            "status": "not_implemented",
-            "agent": "data",
-            "message": "Player comparison coming soon"
-        }
+        return await self.compare_team([player1, player2])
+    
+    async def compare_team(self, player_names: List[str]) -> Dict:
+        """
+        Porównaj N graczy jednym wywołaniem MCP - jedno wyszukanie w indeksie na gracza
+        
+        Returns:
+            "data": PlayersComparison - profile graczy i lider każdego poziomu
+        """
+        logger.info("⚖️  Comparing %d players", len(player_names))
+        
+        try:
+            async with self.mcp_agent.session() as session:
+                result = await session.call_tool(
+                    "compare_players",
+                    arguments={"player_names": player_names, "output_format": "json"}
+                )
+                
+                data = json.loads(result.content[0].text)
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+                
+                return {
+                    "status": "success",
+                    "agent": "data",
+                    "data": data
+                }
+        except Exception as e:
+            logger.error("❌ Error comparing players: %s", e)
+            return {
+                "status": "error",
+                "agent": "data",
+                "error": str(e)
+            }
     
     async def health_check(self) -> Dict:
         """Sprawdź czy resources są dostępne"""
         try:
-            async with stdio_client(self.mcp_server) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    resources = await session.list_resources()
-                    
-                    return {
-                        "status": "ok",
-                        "resources_count": len(resources.resources)
-                    }
+            async with self.mcp_agent.session() as session:
+                resources = await session.list_resources()
+                
+                return {
+                    "status": "ok",
+                    "resources_count": len(resources.resources)
+                }
         except Exception as e:
             return {
                 "status": "error",
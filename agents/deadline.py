@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Terminy (deadline) żądań przekazywane od orchestratora do wywołań HTTP
+
+Termin to czas pętli asyncio zapisany w zmiennej kontekstowej - widzą go
+wszystkie korutyny i taski uruchomione w ramach żądania. Zagnieżdżony
+`deadline()` może termin tylko skrócić. Po przekroczeniu terminu praca w toku
+jest anulowana (`asyncio.timeout`), a blok zgłasza TimeoutError.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Sekundy do terminu bieżącego żądania (None = bez terminu, 0 = termin minął)"""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return max(0.0, expires_at - asyncio.get_running_loop().time())
+
+
+@asynccontextmanager
+async def deadline(seconds: Optional[float]) -> AsyncIterator[Optional[float]]:
+    """Wykonaj blok z terminem za `seconds` sekund (None = bez nowego terminu)
+
+    Zwraca pozostały czas; wewnątrz istniejącego terminu obowiązuje wcześniejszy z nich.
+    """
+    expires_at = _deadline.get()
+    if seconds is not None:
+        requested = asyncio.get_running_loop().time() + seconds
+        expires_at = requested if expires_at is None else min(expires_at, requested)
+
+    token = _deadline.set(expires_at)
+    try:
+        async with asyncio.timeout_at(expires_at):
+            yield remaining()
+    finally:
+        _deadline.reset(token)
@@ -4,10 +4,11 @@ Game Agent - zarządza operacjami gry przez MCP
 """
 
 import asyncio
-from typing import Dict, Optional
+import json
+from typing import AsyncIterator, Dict, List, Optional
 import logging
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+
+from agents.mcp_agent import MCPAgent
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +16,9 @@ logger = logging.getLogger(__name__)
 class GameAgent:
     """Agent do operacji związanych z grą Saper"""
     
-    def __init__(self):
-        self.mcp_server = StdioServerParameters(
-            command="python3",
-            args=["mcp_server_minesweeper.py"]
-        )
+    def __init__(self, mcp_agent: Optional[MCPAgent] = None):
+        # Sesje MCP wypożyczane z puli MCPAgent (współdzielonej przez orchestrator)
+        self.mcp_agent = mcp_agent or MCPAgent()
         logger.info("🎮 GameAgent initialized")
     
     async def get_scores(self, difficulty: Optional[str] = None, limit: int = 10) -> Dict:
@@ -33,23 +32,20 @@ class GameAgent:
         logger.info("📊 Getting scores: difficulty=%s, limit=%d", difficulty, limit)
         
         try:
-            async with stdio_client(self.mcp_server) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    result = await session.call_tool(
-                        "get_scores",
-                        arguments={
-                            "difficulty": difficulty or "",
-                            "limit": limit
-                        }
-                    )
-                    
-                    return {
-                        "status": "success",
-                        "agent": "game",
-                        "data": result.content[0].text
+            async with self.mcp_agent.session() as session:
+                result = await session.call_tool(
+                    "get_scores",
+                    arguments={
+                        "difficulty": difficulty or "",
+                        "limit": limit
                     }
+                )
+                
+                return {
+                    "status": "success",
+                    "agent": "game",
+                    "data": result.content[0].text
+                }
         except Exception as e:
             logger.error("❌ Error getting scores: %s", e)
             return {
@@ -58,6 +54,73 @@ class GameAgent:
                 "error": str(e)
             }
     
+    async def get_scores_page(self, difficulty: Optional[str] = None, limit: int = 100,
+                              cursor: Optional[str] = None) -> Dict:
+        """
+        Pobierz stronę pełnej tablicy wyników
+        
+        Args:
+            difficulty: easy, medium, hard (opcjonalne)
+            limit: rozmiar strony (1-1000)
+            cursor: next_cursor z poprzedniej strony (brak = pierwsza strona)
+        
+        Returns:
+            "data": ScoresPage - wyniki strony i next_cursor
+        """
+        try:
+            async with self.mcp_agent.session() as session:
+                result = await session.call_tool(
+                    "get_scores_page",
+                    arguments={
+                        "difficulty": difficulty or "",
+                        "limit": limit,
+                        "cursor": cursor or "",
+                        "output_format": "json"
+                    }
+                )
+                
+                data = json.loads(result.content[0].text)
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+                
+                return {
+                    "status": "success",
+                    "agent": "game",
+                    "data": data
+                }
+        except Exception as e:
+            logger.error("❌ Error getting scores page: %s", e)
+            return {
+                "status": "error",
+                "agent": "game",
+                "error": str(e)
+            }
+    
+    async def iter_scores(self, difficulty: Optional[str] = None, page_size: int = 500) -> AsyncIterator[Dict]:
+        """
+        Przejdź po całej tablicy wyników (ScoreEntry), pobierając strony leniwie
+        
+        W pamięci jest co najwyżej jedna strona; kolejna jest pobierana dopiero
+        po skonsumowaniu poprzedniej. Błąd pobierania strony przerywa iterację
+        wyjątkiem RuntimeError.
+        
+        Przykład:
+            async for score in game_agent.iter_scores("hard"):
+                ...
+        """
+        cursor = None
+        while True:
+            page = await self.get_scores_page(difficulty, page_size, cursor)
+            if page["status"] != "success":
+                raise RuntimeError(page["error"])
+            
+            for score in page["data"]["scores"]:
+                yield score
+            
+            cursor = page["data"]["next_cursor"]
+            if cursor is None:
+                return
+    
     async def submit_score(self, player_name: str, difficulty: str, time_seconds: int) -> Dict:
         """
         Zapisz wynik gry
@@ -70,24 +133,24 @@ class GameAgent:
         logger.info("💾 Submitting score: %s, %s, %ds", player_name, difficulty, time_seconds)
         
         try:
-            async with stdio_client(self.mcp_server) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    result = await session.call_tool(
-                        "submit_score",
-                        arguments={
-                            "player_name": player_name,
-                            "difficulty": difficulty,
-                            "time_seconds": time_seconds
-                        }
-                    )
-                    
-                    return {
-                        "status": "success",
-                        "agent": "game",
-                        "message": result.content[0].text
+            async with self.mcp_agent.session() as session:
+                result = await session.call_tool(
+                    "submit_score",
+                    arguments={
+                        "player_name": player_name,
+                        "difficulty": difficulty,
+                        "time_seconds": time_seconds
                     }
+                )
+            
+            # Zapis obsłużył jeden worker - pozostałe muszą porzucić odczyty sprzed zapisu
+            await self.mcp_agent.invalidate([difficulty], [player_name])
+            
+            return {
+                "status": "success",
+                "agent": "game",
+                "message": result.content[0].text
+            }
         except Exception as e:
             logger.error("❌ Error submitting score: %s", e)
             return {
@@ -96,25 +159,70 @@ class GameAgent:
                 "error": str(e)
             }
     
+    async def submit_scores(self, scores: List[Dict], max_concurrency: int = 10) -> Dict:
+        """
+        Zapisz wiele wyników jednym wywołaniem MCP
+        
+        Args:
+            scores: rekordy {"player_name", "difficulty", "time_seconds"}
+            max_concurrency: maksymalna liczba równoległych zapisów do API
+        
+        Returns:
+            "data": BulkSubmitResult - ID zapisu albo błąd osobno dla każdego rekordu
+        """
+        logger.info("📦 Submitting %d scores", len(scores))
+        
+        try:
+            async with self.mcp_agent.session() as session:
+                result = await session.call_tool(
+                    "submit_scores",
+                    arguments={
+                        "scores": scores,
+                        "max_concurrency": max_concurrency,
+                        "output_format": "json"
+                    }
+                )
+                
+                data = json.loads(result.content[0].text)
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+            
+            written = [scores[item["index"]] for item in data["results"] if item["status"] == "success"]
+            if written:
+                await self.mcp_agent.invalidate(
+                    sorted({record["difficulty"] for record in written}),
+                    sorted({record["player_name"] for record in written})
+                )
+            
+            return {
+                "status": "success",
+                "agent": "game",
+                "data": data
+            }
+        except Exception as e:
+            logger.error("❌ Error submitting scores: %s", e)
+            return {
+                "status": "error",
+                "agent": "game",
+                "error": str(e)
+            }
+    
     async def get_player_progress(self, player_name: str) -> Dict:
         """Pobierz postęp gracza"""
         logger.info("🎯 Getting progress for: %s", player_name)
         
         try:
-            async with stdio_client(self.mcp_server) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    result = await session.call_tool(
-                        "get_player_progress",
-                        arguments={"player_name": player_name}
-                    )
-                    
-                    return {
-                        "status": "success",
-                        "agent": "game",
-                        "data": result.content[0].text
-                    }
+            async with self.mcp_agent.session() as session:
+                result = await session.call_tool(
+                    "get_player_progress",
+                    arguments={"player_name": player_name}
+                )
+                
+                return {
+                    "status": "success",
+                    "agent": "game",
+                    "data": result.content[0].text
+                }
         except Exception as e:
             logger.error("❌ Error getting progress: %s", e)
             return {
@@ -123,6 +231,121 @@ class GameAgent:
                 "error": str(e)
             }
     
+    async def get_players_progress(self, player_names: List[str], max_concurrency: int = 10) -> Dict:
+        """
+        Pobierz postęp wielu graczy jednym wywołaniem MCP
+        
+        Returns:
+            "data": PlayersProgressResult - wynik lub błąd osobno dla każdego gracza
+        """
+        logger.info("👥 Getting progress for %d players", len(player_names))
+        
+        try:
+            async with self.mcp_agent.session() as session:
+                result = await session.call_tool(
+                    "get_players_progress",
+                    arguments={
+                        "player_names": player_names,
+                        "max_concurrency": max_concurrency,
+                        "output_format": "json"
+                    }
+                )
+                
+                data = json.loads(result.content[0].text)
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+                
+                return {
+                    "status": "success",
+                    "agent": "game",
+                    "data": data
+                }
+        except Exception as e:
+            logger.error("❌ Error getting players progress: %s", e)
+            return {
+                "status": "error",
+                "agent": "game",
+                "error": str(e)
+            }
+    
+    async def get_player_rank(self, player_name: str, difficulty: str, neighbours: int = 2) -> Dict:
+        """
+        Pobierz miejsce gracza w rankingu poziomu
+        
+        Returns:
+            "data": PlayerRankResult - ranga, percentyl i sąsiedzi w rankingu
+        """
+        logger.info("🏅 Getting rank of %s on %s", player_name, difficulty)
+        
+        try:
+            async with self.mcp_agent.session() as session:
+                result = await session.call_tool(
+                    "get_player_rank",
+                    arguments={
+                        "player_name": player_name,
+                        "difficulty": difficulty,
+                        "neighbours": neighbours,
+                        "output_format": "json"
+                    }
+                )
+                
+                data = json.loads(result.content[0].text)
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+                
+                return {
+                    "status": "success",
+                    "agent": "game",
+                    "data": data
+                }
+        except Exception as e:
+            logger.error("❌ Error getting player rank: %s", e)
+            return {
+                "status": "error",
+                "agent": "game",
+                "error": str(e)
+            }
+    
+    async def search_players(self, prefix: str, limit: int = 10, rank_by: str = "activity",
+                             difficulty: str = "") -> Dict:
+        """
+        Podpowiedz nazwy graczy po prefiksie (np. przed get_player_progress)
+        
+        Returns:
+            "data": PlayerSearchResult - pasujący gracze z liczbą prób i najlepszym czasem
+        """
+        logger.info("🔍 Searching players: %s", prefix)
+        
+        try:
+            async with self.mcp_agent.session() as session:
+                result = await session.call_tool(
+                    "search_players",
+                    arguments={
+                        "prefix": prefix,
+                        "limit": limit,
+                        "rank_by": rank_by,
+                        "difficulty": difficulty,
+                        "output_format": "json"
+                    }
+                )
+                
+                data = json.loads(result.content[0].text)
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+                
+                return {
+                    "status": "success",
+                    "agent": "game",
+                    "data": data
+                }
+        except Exception as e:
+            logger.error("❌ Error searching players: %s", e)
+            return {
+                "status": "error",
+                "agent": "game",
+                "error": str(e)
+            }
+    
     async def validate_score(self, time_seconds: int, difficulty: str) -> bool:
         """
         Waliduj czy wynik jest realistyczny
@@ -157,15 +380,13 @@ class GameAgent:
     async def health_check(self) -> Dict:
         """Sprawdź czy MCP server działa"""
         try:
-            async with stdio_client(self.mcp_server) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools = await session.list_tools()
-                    
-                    return {
-                        "status": "ok",
-                        "tools_count": len(tools.tools)
-                    }
+            async with self.mcp_agent.session() as session:
+                tools = await session.list_tools()
+                
+                return {
+                    "status": "ok",
+                    "tools_count": len(tools.tools)
+                }
         except Exception as e:
             return {
                 "status": "error",
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Indeksy pomocnicze nad wynikami - zapytania per gracz bez przeglądania wszystkich wyników
+"""
+
+import bisect
+import heapq
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from .aggregates import DIFFICULTIES
+
+# Zakres czasów gry (walidacja API: 1-9999 s); dłuższe czasy trafiają do ostatniego kubełka
+MAX_TIME_SECONDS = 9999
+
+# Trend: zmiana średniego czasu o co najmniej 2% tygodniowo
+TREND_THRESHOLD_PER_WEEK = 0.02
+
+_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+class FenwickTree:
+    """Drzewo Fenwicka (BIT) nad licznikami 0..size-1 - aktualizacja i suma prefiksu w O(log n)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._tree = [0] * (size + 1)
+        self.total = 0
+
+    def add(self, index: int, delta: int = 1) -> None:
+        self.total += delta
+        index += 1
+        while index <= self.size:
+            self._tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index: int) -> int:
+        """Suma liczników 0..index (włącznie); index < 0 → 0"""
+        result = 0
+        index = min(index, self.size - 1) + 1
+        while index > 0:
+            result += self._tree[index]
+            index -= index & -index
+        return result
+
+    def find(self, k: int) -> int:
+        """Najmniejszy indeks, dla którego suma prefiksu >= k (k liczone od 1)"""
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self.size and self._tree[nxt] < k:
+                position = nxt
+                k -= self._tree[nxt]
+            step >>= 1
+        return position
+
+
+class Leaderboard:
+    """Ranking graczy po najlepszym czasie (struktura order-statistic)
+
+    Drzewo Fenwicka liczy graczy w kubełkach po sekundach, a kubełek trzyma
+    posortowaną listę nazw (remisy). Ranga, percentyl, k-ty gracz i sąsiedzi
+    w O(log T + log b), gdzie T to liczba kubełków, b - liczba graczy w kubełku.
+    Ranga jest "sportowa": gracze z tym samym czasem mają tę samą rangę.
+    """
+
+    def __init__(self, max_time: int = MAX_TIME_SECONDS):
+        self.max_time = max_time
+        self.counts = FenwickTree(max_time + 1)
+        self.members: Dict[int, List[str]] = {}
+
+    def _bucket(self, time_seconds: int) -> int:
+        return max(0, min(time_seconds, self.max_time))
+
+    def update(self, player_name: str, old_best: Optional[int], new_best: int) -> None:
+        if old_best is not None:
+            bucket = self._bucket(old_best)
+            members = self.members[bucket]
+            del members[bisect.bisect_left(members, player_name)]
+            self.counts.add(bucket, -1)
+        bucket = self._bucket(new_best)
+        bisect.insort(self.members.setdefault(bucket, []), player_name)
+        self.counts.add(bucket, 1)
+
+    def __len__(self) -> int:
+        return self.counts.total
+
+    def rank(self, best_time: int) -> int:
+        """1 + liczba graczy z lepszym (krótszym) czasem"""
+        return self.counts.prefix_sum(self._bucket(best_time) - 1) + 1
+
+    def percentile_rank(self, best_time: int) -> float:
+        """Odsetek graczy z gorszym (dłuższym) najlepszym czasem (0-100)"""
+        if not self.counts.total:
+            return 0.0
+        worse = self.counts.total - self.counts.prefix_sum(self._bucket(best_time))
+        return worse / self.counts.total * 100
+
+    def position(self, player_name: str, best_time: int) -> int:
+        """Pozycja gracza (1..n) w pełnej kolejności: czas, potem nazwa"""
+        bucket = self._bucket(best_time)
+        return self.counts.prefix_sum(bucket - 1) + bisect.bisect_left(self.members[bucket], player_name) + 1
+
+    def entry_at(self, position: int) -> Tuple[str, int]:
+        """Gracz na pozycji `position` (1..n) i jego kubełek czasu"""
+        bucket = self.counts.find(position)
+        offset = position - self.counts.prefix_sum(bucket - 1) - 1
+        return self.members[bucket][offset], bucket
+
+
+class PlayerLevelStats:
+    """Statystyki gracza na jednym poziomie - O(1) pamięci, aktualizowane wynik po wyniku
+
+    Trend to nachylenie prostej regresji czasu gry względem daty (s/dzień),
+    liczone z sum bieżących - niezależne od kolejności napływu wyników.
+    """
+
+    __slots__ = ("attempts", "best_time", "total_time", "_n", "_sx", "_sy", "_sxy", "_sxx")
+
+    def __init__(self):
+        self.attempts = 0
+        self.best_time: Optional[int] = None
+        self.total_time = 0
+        self._n = self._sx = self._sy = self._sxy = self._sxx = 0.0
+
+    def add(self, time_seconds: int, played_at: Optional[datetime]) -> None:
+        self.attempts += 1
+        self.total_time += time_seconds
+        if self.best_time is None or time_seconds < self.best_time:
+            self.best_time = time_seconds
+        if played_at is not None:
+            x = (played_at - _EPOCH).total_seconds() / 86400
+            self._n += 1
+            self._sx += x
+            self._sy += time_seconds
+            self._sxy += x * time_seconds
+            self._sxx += x * x
+
+    @property
+    def avg_time(self) -> Optional[float]:
+        return self.total_time / self.attempts if self.attempts else None
+
+    def slope_per_day(self) -> Optional[float]:
+        """Zmiana czasu gry w sekundach na dzień (ujemna = gracz jest coraz szybszy)"""
+        if self._n < 3:
+            return None
+        denominator = self._n * self._sxx - self._sx * self._sx
+        if denominator <= 1e-9 * self._n * self._n:
+            return None
+        return (self._n * self._sxy - self._sx * self._sy) / denominator
+
+    def trend(self) -> str:
+        slope = self.slope_per_day()
+        if slope is None:
+            return "n/a"
+        weekly = slope * 7 / (self._sy / self._n)
+        if weekly <= -TREND_THRESHOLD_PER_WEEK:
+            return "improving"
+        if weekly >= TREND_THRESHOLD_PER_WEEK:
+            return "declining"
+        return "stable"
+
+
+class PlayerIndex:
+    """Indeks wyników po graczu: statystyki per poziom i ranking najlepszych czasów
+
+    Najlepsze czasy graczy na każdym poziomie trzymane są w `Leaderboard` - ranga
+    i percentyl gracza to suma prefiksu drzewa Fenwicka, O(log T).
+    """
+
+    def __init__(self, difficulties: Optional[List[str]] = None):
+        self.difficulties = list(difficulties or DIFFICULTIES)
+        self.players: Dict[str, Dict[str, PlayerLevelStats]] = {}
+        self.leaderboards = {d: Leaderboard() for d in self.difficulties}
+        self.search = PlayerSearchIndex(self)
+
+    def add(self, player_name: str, difficulty: str, time_seconds: int,
+            played_at: Optional[datetime] = None) -> None:
+        if difficulty not in self.leaderboards:
+            return
+        levels = self.players.get(player_name)
+        if levels is None:
+            levels = self.players[player_name] = {}
+            self.search.insert(player_name)
+        stats = levels.get(difficulty)
+        if stats is None:
+            stats = levels[difficulty] = PlayerLevelStats()
+        previous_best = stats.best_time
+        stats.add(time_seconds, played_at)
+        if stats.best_time != previous_best:
+            self.leaderboards[difficulty].update(player_name, previous_best, stats.best_time)
+        self.search.update(player_name)
+
+    def best_time(self, player_name: str, difficulty: str) -> Optional[int]:
+        stats = self.players.get(player_name, {}).get(difficulty)
+        return stats.best_time if stats is not None else None
+
+    def rank(self, player_name: str, difficulty: str, neighbours: int = 2) -> Optional[Dict]:
+        """Ranga, percentyl i sąsiedzi gracza na poziomie (kształt PlayerRankResult serwera MCP)"""
+        best_time = self.best_time(player_name, difficulty)
+        if best_time is None:
+            return None
+        board = self.leaderboards[difficulty]
+        position = board.position(player_name, best_time)
+        entries = []
+        for neighbour_position in range(max(1, position - neighbours), min(len(board), position + neighbours) + 1):
+            name, _ = board.entry_at(neighbour_position)
+            neighbour_best = self.best_time(name, difficulty)
+            entries.append({
+                "position": neighbour_position,
+                "rank": board.rank(neighbour_best),
+                "player_name": name,
+                "best_time": neighbour_best,
+                "is_player": name == player_name,
+            })
+        return {
+            "player_name": player_name,
+            "difficulty": difficulty,
+            "best_time": best_time,
+            "rank": board.rank(best_time),
+            "position": position,
+            "players": len(board),
+            "percentile_rank": board.percentile_rank(best_time),
+            "neighbours": entries,
+        }
+
+    def __contains__(self, player_name: str) -> bool:
+        return player_name in self.players
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def summary(self, player_name: str) -> Optional[Dict]:
+        """Profil gracza (kształt PlayerSummary serwera MCP) albo None, jeśli gracz nie ma wyników"""
+        levels = self.players.get(player_name)
+        if levels is None:
+            return None
+        result = {}
+        for difficulty in self.difficulties:
+            stats = levels.get(difficulty)
+            if stats is None:
+                result[difficulty] = None
+                continue
+            slope = stats.slope_per_day()
+            result[difficulty] = {
+                "attempts": stats.attempts,
+                "best_time": stats.best_time,
+                "avg_time": stats.avg_time,
+                "trend": stats.trend(),
+                "trend_seconds_per_day": slope,
+                "percentile_rank": self.leaderboards[difficulty].percentile_rank(stats.best_time),
+                "players_on_level": len(self.leaderboards[difficulty]),
+            }
+        return {
+            "player_name": player_name,
+            "total_attempts": sum(stats.attempts for stats in levels.values()),
+            "levels": result,
+        }
+
+
+# Kryteria rankingu podpowiedzi nazw
+SEARCH_RANKINGS = ("activity", "best_time")
+
+
+class PlayerSearchIndex:
+    """Wyszukiwanie graczy po prefiksie nazwy (bez rozróżniania wielkości liter)
+
+    Nazwy trzymane są w posortowanej liście kluczy (casefold, nazwa), zakres
+    pasujący do prefiksu wyznacza `bisect`. Top-k dla prefiksu (wg aktywności
+    lub najlepszego czasu) jest liczone raz i potem aktualizowane przy każdym
+    wyniku - oba kryteria tylko się poprawiają (przybywa prób, czas maleje),
+    więc gracz może jedynie awansować albo wejść do top-k. Aktualizacja kosztuje
+    O(długość nazwy) wyszukań w słowniku, odczyt z cache - O(k).
+    """
+
+    def __init__(self, players: "PlayerIndex", top_k: int = 50, max_cached_prefixes: int = 1024):
+        self.players = players
+        self.top_k = top_k
+        self.max_cached_prefixes = max_cached_prefixes
+        self._keys: List[Tuple[str, str]] = []
+        self._pending: List[Tuple[str, str]] = []
+        # prefiks → {(rank_by, difficulty): lista top-k nazw}, kolejność LRU
+        self._top: "OrderedDict[str, Dict[Tuple[str, str], List[str]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._pending)
+
+    def insert(self, player_name: str) -> None:
+        """Nowa nazwa gracza (wywoływane raz na gracza)"""
+        self._pending.append((player_name.casefold(), player_name))
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        if len(self._pending) < 64:
+            for key in self._pending:
+                bisect.insort(self._keys, key)
+        else:
+            self._keys.extend(self._pending)
+            self._keys.sort()
+        self._pending.clear()
+
+    def _sort_key(self, player_name: str, rank_by: str, difficulty: str) -> Tuple:
+        levels = self.players.players[player_name]
+        if difficulty:
+            stats = levels.get(difficulty)
+            attempts = stats.attempts if stats else 0
+            best = stats.best_time if stats and stats.best_time is not None else float("inf")
+        else:
+            attempts = sum(stats.attempts for stats in levels.values())
+            best = min((stats.best_time for stats in levels.values()), default=float("inf"))
+        primary = -attempts if rank_by == "activity" else best
+        return primary, player_name.casefold(), player_name
+
+    def _matching(self, prefix: str) -> List[str]:
+        self._flush()
+        low = bisect.bisect_left(self._keys, (prefix,))
+        high = bisect.bisect_left(self._keys, (prefix + "\U0010ffff",))
+        return [name for _, name in self._keys[low:high]]
+
+    def update(self, player_name: str) -> None:
+        """Wynik gracza się zmienił - popraw top-k w zapamiętanych prefiksach jego nazwy"""
+        if not self._top:
+            return
+        folded = player_name.casefold()
+        for length in range(len(folded) + 1):
+            rankings = self._top.get(folded[:length])
+            if rankings is None:
+                continue
+            for (rank_by, difficulty), top in rankings.items():
+                if difficulty and difficulty not in self.players.players[player_name]:
+                    continue
+                if player_name not in top:
+                    if len(top) >= self.top_k and (
+                        self._sort_key(player_name, rank_by, difficulty) >= self._sort_key(top[-1], rank_by, difficulty)
+                    ):
+                        continue
+                    top.append(player_name)
+                top.sort(key=lambda name: self._sort_key(name, rank_by, difficulty))
+                del top[self.top_k:]
+
+    def search(self, prefix: str, limit: int = 10, rank_by: str = "activity",
+               difficulty: str = "") -> List[str]:
+        """Nazwy graczy zaczynające się od `prefix`, najlepsze wg `rank_by`"""
+        if rank_by not in SEARCH_RANKINGS:
+            raise ValueError(f"rank_by musi być jednym z: {', '.join(SEARCH_RANKINGS)}")
+        folded = prefix.casefold()
+        rankings = self._top.get(folded)
+        top = rankings.get((rank_by, difficulty)) if rankings is not None else None
+        if top is None:
+            matches = self._matching(folded)
+            if difficulty:
+                matches = [name for name in matches if difficulty in self.players.players[name]]
+            top = heapq.nsmallest(self.top_k, matches, key=lambda name: self._sort_key(name, rank_by, difficulty))
+            self._top.setdefault(folded, {})[(rank_by, difficulty)] = top
+        self._top.move_to_end(folded)
+        while len(self._top) > self.max_cached_prefixes:
+            self._top.popitem(last=False)
+        return top[:limit]
@@ -4,50 +4,564 @@ MCP Agent - zarządza połączeniami MCP
 """
 
 import asyncio
-from typing import Dict, List
+import os
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
 import logging
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from mcp import ClientSession, StdioServerParameters, types
+from mcp.client.stdio import get_default_environment, stdio_client
+from mcp.server.lowlevel import NotificationOptions
+from mcp.shared.exceptions import McpError
+
+from agents.deadline import remaining
 
 logger = logging.getLogger(__name__)
 
 
+def _server_environment() -> Dict[str, str]:
+    """Środowisko podprocesu serwera: bezpieczne zmienne domyślne + konfiguracja MINESWEEPER_*"""
+    env = get_default_environment()
+    env.update({k: v for k, v in os.environ.items() if k.startswith("MINESWEEPER_")})
+    return env
+
+
+class DeadlineClientSession(ClientSession):
+    """ClientSession przekazująca termin żądania do serwera MCP
+
+    Wywołania narzędzi i odczyty zasobów niosą w `_meta.timeoutSeconds` czas
+    pozostały do terminu - serwer przerywa po nim pracę, także żądania HTTP.
+    Anulowane wywołanie (np. po przekroczeniu terminu) wysyła do serwera
+    `notifications/cancelled`, więc serwer nie kończy niepotrzebnej pracy.
+    """
+
+    async def send_request(self, request, result_type, request_read_timeout_seconds=None,
+                           metadata=None, progress_callback=None):
+        budget = remaining()
+        params = getattr(request.root, "params", None)
+        if budget is not None and isinstance(request.root, (types.CallToolRequest, types.ReadResourceRequest)):
+            meta = params.meta.model_dump() if params.meta else {}
+            params = params.model_copy(update={"meta": types.RequestParams.Meta(**meta, timeoutSeconds=budget)})
+            request = types.ClientRequest(request.root.model_copy(update={"params": params}))
+        
+        request_id = self._request_id
+        try:
+            return await super().send_request(request, result_type, request_read_timeout_seconds,
+                                              metadata, progress_callback)
+        except asyncio.CancelledError:
+            await self._notify_cancelled(request_id)
+            raise
+
+    async def _notify_cancelled(self, request_id: int) -> None:
+        notification = types.ClientNotification(types.CancelledNotification(
+            method="notifications/cancelled",
+            params=types.CancelledNotificationParams(requestId=request_id, reason="deadline exceeded"),
+        ))
+        try:
+            # Wysłanie nie może zostać przerwane przez trwające anulowanie
+            await asyncio.shield(self.send_notification(notification))
+        except Exception as e:
+            logger.warning("⚠️  Could not cancel MCP request %d: %s", request_id, e)
+
+
+class MCPWorker:
+    """Proces serwera MCP z długo żyjącą sesją
+
+    Konteksty `stdio_client` i `ClientSession` muszą zostać otwarte i zamknięte
+    w tym samym tasku, dlatego sesja żyje w dedykowanym tasku w tle.
+    Jedna sesja obsługuje wiele równoległych wywołań (multipleksowanie JSON-RPC).
+    """
+
+    def __init__(self, server: StdioServerParameters, index: int):
+        self.server = server
+        self.index = index
+        self.session: Optional[ClientSession] = None
+        self.init_result = None
+        self.outstanding = 0
+        self.dispatched = 0
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+    async def start(self) -> None:
+        """Uruchom podproces serwera i wykonaj handshake MCP"""
+        self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        if self.session is None:
+            raise ConnectionError(f"MCP server failed to start: {self._error}") from self._error
+
+    async def _run(self) -> None:
+        try:
+            async with stdio_client(self.server) as (read, write):
+                async with DeadlineClientSession(read, write) as session:
+                    self.init_result = await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except Exception as e:
+            self._error = e
+            logger.warning("⚠️  MCP worker %d terminated: %s", self.index, e)
+        finally:
+            self.session = None
+            self._ready.set()
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def ping(self, timeout: float) -> bool:
+        """Sprawdź czy serwer odpowiada (wykrywa martwy lub zawieszony podproces)"""
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+            return True
+        except Exception:
+            return False
+
+    async def close(self) -> None:
+        """Zamknij sesję i zakończ podproces serwera"""
+        self._closing.set()
+        if self._task is not None and not self._task.done():
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+
+    def status(self) -> Dict:
+        return {
+            "worker": self.index,
+            "alive": self.alive,
+            "queue_depth": self.outstanding,
+            "dispatched": self.dispatched,
+        }
+
+
+class MCPWorkerPool:
+    """Flota ciepłych procesów serwera MCP współdzielona przez agentów
+
+    Każde wywołanie trafia do workera z najmniejszą liczbą niezakończonych
+    wywołań (least-outstanding). Gdy wszystkie workery są wysycone, chętni
+    czekają w kolejce FIFO. Nadzorca w tle pinguje workery i restartuje
+    martwe lub zawieszone procesy.
+
+    Na starcie działa `min_workers` procesów; kolejne (do `max_workers`,
+    domyślnie liczba rdzeni) uruchamiane są dopiero, gdy wszystkie są wysycone.
+    Każdy worker ma własną pulę HTTP, cache odczytów i migawkę statystyk, dlatego
+    flota rośnie tylko pod obciążeniem, a zapisy są rozgłaszane do wszystkich
+    workerów (`broadcast`).
+    `workers` ustala stały rozmiar floty (min = max).
+    """
+
+    def __init__(
+        self,
+        server: StdioServerParameters,
+        workers: Optional[int] = None,
+        max_in_flight_per_worker: int = 8,
+        health_check_interval: float = 10.0,
+        health_check_timeout: float = 5.0,
+        auto_reconnect: bool = True,
+        min_workers: int = 1,
+        max_workers: Optional[int] = None,
+    ):
+        self.server = server
+        if workers:
+            min_workers = max_workers = workers
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.min_workers = max(1, min(min_workers, self.max_workers))
+        self.max_in_flight_per_worker = max_in_flight_per_worker
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.auto_reconnect = auto_reconnect
+        self.init_result = None
+        self._workers: List[MCPWorker] = []
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._restarting: set = set()
+        self._starting: Optional[asyncio.Task] = None
+        self._growing: Optional[asyncio.Task] = None
+        self._monitor: Optional[asyncio.Task] = None
+        self._closed = False
+        self.stats = {"dispatched": 0, "waits": 0, "restarts": 0, "scale_ups": 0, "broadcasts": 0}
+
+    async def start(self) -> None:
+        """Uruchom `min_workers` workerów (równolegle) i nadzorcę"""
+        if self._starting is None:
+            self._starting = asyncio.create_task(self._start_workers())
+        try:
+            await asyncio.shield(self._starting)
+        except Exception:
+            self._starting = None
+            raise
+
+    async def _start_workers(self) -> None:
+        self._workers = [MCPWorker(self.server, i) for i in range(self.min_workers)]
+        results = await asyncio.gather(
+            *(worker.start() for worker in self._workers), return_exceptions=True
+        )
+        for worker, result in zip(self._workers, results):
+            if isinstance(result, BaseException):
+                logger.error("❌ Failed to start MCP worker %d: %s", worker.index, result)
+                self._schedule_restart(worker)
+            elif self.init_result is None:
+                self.init_result = worker.init_result
+        if not any(worker.alive for worker in self._workers) and not self.auto_reconnect:
+            raise ConnectionError("No MCP worker could be started")
+        self._monitor = asyncio.create_task(self._supervise())
+        logger.info("🔧 MCP worker pool started: %d workers (max %d)", self.min_workers, self.max_workers)
+
+    def _grow(self) -> None:
+        """Dołóż workera w tle, jeśli flota jest wysycona i nie osiągnęła `max_workers`"""
+        if self._closed or self._growing is not None or len(self._workers) >= self.max_workers:
+            return
+        self._growing = asyncio.create_task(self._add_worker())
+
+    async def _add_worker(self) -> None:
+        worker = MCPWorker(self.server, len(self._workers))
+        self._workers.append(worker)
+        self.stats["scale_ups"] += 1
+        try:
+            await worker.start()
+            logger.info("📈 MCP worker %d started (%d/%d)", worker.index, len(self._workers), self.max_workers)
+        except Exception as e:
+            logger.error("❌ Failed to start MCP worker %d: %s", worker.index, e)
+            self._schedule_restart(worker)
+        finally:
+            self._growing = None
+            self._dispatch_waiters()
+
+    def _pick(self) -> Optional[MCPWorker]:
+        candidates = [
+            w for w in self._workers
+            if w.alive and w.index not in self._restarting
+            and w.outstanding < self.max_in_flight_per_worker
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda w: (w.outstanding, w.dispatched))
+
+    def _assign(self, worker: MCPWorker) -> MCPWorker:
+        worker.outstanding += 1
+        worker.dispatched += 1
+        self.stats["dispatched"] += 1
+        return worker
+
+    async def _acquire(self) -> MCPWorker:
+        if self._closed:
+            raise RuntimeError("MCP worker pool is closed")
+        await self.start()
+
+        worker = None if self._waiters else self._pick()
+        if worker is not None:
+            return self._assign(worker)
+        if not any(w.alive for w in self._workers):
+            raise ConnectionError("No live MCP workers")
+        self._grow()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats["waits"] += 1
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(waiter.result())
+            raise
+
+    def _release(self, worker: MCPWorker) -> None:
+        worker.outstanding -= 1
+        self._dispatch_waiters()
+
+    def _dispatch_waiters(self) -> None:
+        while self._waiters:
+            worker = self._pick()
+            if worker is None:
+                return
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(self._assign(worker))
+
+    def _schedule_restart(self, worker: MCPWorker) -> None:
+        if self._closed or not self.auto_reconnect or worker.index in self._restarting:
+            return
+        self._restarting.add(worker.index)
+        asyncio.create_task(self._restart(worker))
+
+    async def _restart(self, worker: MCPWorker) -> None:
+        logger.warning("♻️  Restarting MCP worker %d", worker.index)
+        self.stats["restarts"] += 1
+        await worker.close()
+        delay = 0.5
+        try:
+            while not self._closed:
+                replacement = MCPWorker(self.server, worker.index)
+                try:
+                    await replacement.start()
+                except Exception as e:
+                    logger.error("❌ MCP worker %d restart failed: %s", worker.index, e)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 30)
+                    continue
+                if self._closed:
+                    await replacement.close()
+                    return
+                self._workers[worker.index] = replacement
+                self.init_result = replacement.init_result
+                return
+        finally:
+            self._restarting.discard(worker.index)
+            self._dispatch_waiters()
+
+    async def _supervise(self) -> None:
+        """Okresowo pinguj workery i restartuj te, które nie odpowiadają"""
+        while not self._closed:
+            await asyncio.sleep(self.health_check_interval)
+            workers = [w for w in self._workers if w.index not in self._restarting]
+            healthy = await asyncio.gather(
+                *(w.ping(self.health_check_timeout) for w in workers)
+            )
+            for worker, ok in zip(workers, healthy):
+                if not ok:
+                    self._schedule_restart(worker)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[ClientSession]:
+        """Wypożycz sesję najmniej obciążonego workera na czas bloku `async with`"""
+        worker = await self._acquire()
+        try:
+            yield worker.session
+        except asyncio.CancelledError:
+            # Anulowanie (termin żądania) nie świadczy o awarii workera
+            raise
+        except BaseException:
+            # Błąd mógł wynikać ze śmierci podprocesu - zrestartuj workera
+            if not await worker.ping(self.health_check_timeout):
+                self._schedule_restart(worker)
+            raise
+        finally:
+            self._release(worker)
+
+    async def broadcast(self, name: str, arguments: Dict[str, Any]) -> int:
+        """Wywołaj narzędzie na każdym żywym workerze (poza limitem slotów); zwraca liczbę udanych wywołań
+
+        Służy do unieważniania stanu trzymanego osobno przez każdy worker (cache odczytów,
+        migawka statystyk). Błąd pojedynczego workera jest tylko logowany.
+        """
+        workers = [w for w in self._workers if w.alive and w.index not in self._restarting]
+        results = await asyncio.gather(
+            *(w.session.call_tool(name, arguments) for w in workers), return_exceptions=True
+        )
+        for worker, result in zip(workers, results):
+            if isinstance(result, BaseException):
+                logger.warning("⚠️  Broadcast %s to MCP worker %d failed: %s", name, worker.index, result)
+        self.stats["broadcasts"] += 1
+        return sum(1 for result in results if not isinstance(result, BaseException))
+
+    def status(self) -> Dict:
+        """Stan floty do monitoringu (głębokość kolejki per worker)"""
+        return {
+            "workers": [w.status() for w in self._workers],
+            "waiting": len(self._waiters),
+            "restarting": sorted(self._restarting),
+            "max_in_flight_per_worker": self.max_in_flight_per_worker,
+            "min_workers": self.min_workers,
+            "max_workers": self.max_workers,
+            **self.stats,
+        }
+
+    async def close(self) -> None:
+        """Zatrzymaj nadzorcę i wszystkie workery"""
+        self._closed = True
+        if self._monitor is not None:
+            self._monitor.cancel()
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(RuntimeError("MCP worker pool is closed"))
+        await asyncio.gather(*(worker.close() for worker in self._workers))
+
+
+class InProcessSession:
+    """Sesja MCP wywołująca handlery serwera FastMCP w tym samym procesie
+
+    Udostępnia podzbiór API `ClientSession` używany przez agentów. Żądania
+    przechodzą przez te same handlery co przy stdio (walidacja argumentów,
+    wyniki `isError`), ale bez serializacji JSON-RPC i komunikacji przez pipe.
+    """
+
+    def __init__(self, server):
+        self._server = server._mcp_server
+        self.init_result = types.InitializeResult(
+            protocolVersion=types.LATEST_PROTOCOL_VERSION,
+            capabilities=self._server.get_capabilities(NotificationOptions(), {}),
+            serverInfo=types.Implementation(name=self._server.name, version=self._server.version or "in-process"),
+        )
+
+    async def _request(self, request) -> Any:
+        handler = self._server.request_handlers[type(request)]
+        try:
+            result = await handler(request)
+        except McpError:
+            raise
+        except Exception as e:
+            # Tak jak serwer stdio: wyjątek handlera staje się błędem JSON-RPC
+            raise McpError(types.ErrorData(code=0, message=str(e))) from e
+        return result.root
+
+    async def initialize(self) -> types.InitializeResult:
+        return self.init_result
+
+    async def send_ping(self) -> types.EmptyResult:
+        return types.EmptyResult()
+
+    async def list_tools(self) -> types.ListToolsResult:
+        return await self._request(types.ListToolsRequest(method="tools/list"))
+
+    async def list_resources(self) -> types.ListResourcesResult:
+        return await self._request(types.ListResourcesRequest(method="resources/list"))
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None,
+                        read_timeout_seconds=None, progress_callback=None, *, meta=None) -> types.CallToolResult:
+        return await self._request(types.CallToolRequest(
+            method="tools/call",
+            params=types.CallToolRequestParams(name=name, arguments=arguments or {}),
+        ))
+
+    async def read_resource(self, uri) -> types.ReadResourceResult:
+        return await self._request(types.ReadResourceRequest(
+            method="resources/read",
+            params=types.ReadResourceRequestParams(uri=uri),
+        ))
+
+
+class InProcessPool:
+    """Transport "inprocess": narzędzia z `mcp_server_minesweeper` wykonywane lokalnie
+
+    Ten sam interfejs co `MCPWorkerPool`, ale bez podprocesów - przeznaczony
+    dla wdrożeń, w których agenci i narzędzia działają na tym samym hoście.
+    """
+
+    def __init__(self):
+        self._session: Optional[InProcessSession] = None
+        self._lifespan = None
+        self._starting: Optional[asyncio.Task] = None
+        self.init_result = None
+        self.stats = {"dispatched": 0}
+
+    async def start(self) -> None:
+        """Wejdź w lifespan serwera raz - równoległe pierwsze wywołania czekają na ten sam start"""
+        if self._session is not None:
+            return
+        if self._starting is None:
+            self._starting = asyncio.create_task(self._start())
+        try:
+            await asyncio.shield(self._starting)
+        except Exception:
+            self._starting = None
+            raise
+
+    async def _start(self) -> None:
+        import mcp_server_minesweeper as server_module
+
+        lifespan = server_module.server_lifespan(server_module.mcp)
+        await lifespan.__aenter__()
+        self._lifespan = lifespan
+        self._session = InProcessSession(server_module.mcp)
+        self.init_result = self._session.init_result
+        logger.info("🔧 MCP in-process transport ready")
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[InProcessSession]:
+        await self.start()
+        self.stats["dispatched"] += 1
+        yield self._session
+
+    async def broadcast(self, name: str, arguments: Dict[str, Any]) -> int:
+        # Jeden serwer w procesie - zapis już unieważnił jego cache
+        return 0
+
+    def status(self) -> Dict:
+        return {"transport": "inprocess", **self.stats}
+
+    async def close(self) -> None:
+        if self._lifespan is not None:
+            await self._lifespan.__aexit__(None, None, None)
+            self._lifespan = None
+        self._session = None
+        self._starting = None
+
+
 class MCPAgent:
     """Agent do zarządzania połączeniami i komunikacją MCP"""
-    
-    def __init__(self):
+
+    def __init__(self, config: Optional[Dict] = None):
+        config = config or {}
         self.mcp_server = StdioServerParameters(
             command="python3",
-            args=["mcp_server_minesweeper.py"]
+            args=["mcp_server_minesweeper.py"],
+            env=_server_environment()
         )
-        self.connection_pool = []
-        logger.info("🔧 MCPAgent initialized")
-    
+        self.transport = config.get("transport", "stdio")
+        if self.transport == "inprocess":
+            self.connection_pool = InProcessPool()
+        else:
+            self.connection_pool = MCPWorkerPool(
+                self.mcp_server,
+                workers=config.get("workers"),
+                min_workers=config.get("min_workers", 1),
+                max_workers=config.get("max_workers"),
+                max_in_flight_per_worker=config.get("max_in_flight_per_worker", 8),
+                health_check_interval=config.get("health_check_interval_seconds", 10),
+                health_check_timeout=config.get("health_check_timeout_seconds", 5),
+                auto_reconnect=config.get("auto_reconnect", True),
+            )
+        logger.info("🔧 MCPAgent initialized (transport=%s)", self.transport)
+
+    def session(self):
+        """Wypożycz sesję najmniej obciążonego workera (używane też przez GameAgent i DataAgent)"""
+        return self.connection_pool.session()
+
+    async def start(self) -> None:
+        """Uruchom flotę workerów serwera MCP"""
+        await self.connection_pool.start()
+
+    async def close(self) -> None:
+        """Zatrzymaj flotę workerów serwera MCP"""
+        await self.connection_pool.close()
+
+    async def invalidate(self, difficulties: List[str], player_names: List[str]) -> None:
+        """Po zapisie: unieważnij tablice wyników i postęp graczy w cache wszystkich workerów"""
+        await self.connection_pool.broadcast(
+            "invalidate_cache", {"difficulties": difficulties, "player_names": player_names}
+        )
+
+    def worker_stats(self) -> Dict:
+        """Głębokość kolejki i stan każdego workera (monitoring)"""
+        return self.connection_pool.status()
+
     async def list_tools(self) -> Dict:
         """Lista dostępnych narzędzi MCP"""
         logger.info("🔍 Listing MCP tools")
-        
+
         try:
-            async with stdio_client(self.mcp_server) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools = await session.list_tools()
-                    
-                    tools_list = [
-                        {
-                            "name": tool.name,
-                            "description": tool.description,
-                            "input_schema": tool.inputSchema
-                        }
-                        for tool in tools.tools
-                    ]
-                    
-                    return {
-                        "status": "success",
-                        "agent": "mcp",
-                        "tools": tools_list,
-                        "count": len(tools_list)
+            async with self.session() as session:
+                tools = await session.list_tools()
+
+                tools_list = [
+                    {
+                        "name": tool.name,
+                        "description": tool.description,
+                        "input_schema": tool.inputSchema
                     }
+                    for tool in tools.tools
+                ]
+
+                return {
+                    "status": "success",
+                    "agent": "mcp",
+                    "tools": tools_list,
+                    "count": len(tools_list)
+                }
         except Exception as e:
             logger.error("❌ Error listing tools: %s", e)
             return {
@@ -55,32 +569,30 @@ class MCPAgent:
                 "agent": "mcp",
                 "error": str(e)
             }
-    
+
     async def list_resources(self) -> Dict:
         """Lista dostępnych zasobów MCP"""
         logger.info("📚 Listing MCP resources")
-        
+
         try:
-            async with stdio_client(self.mcp_server) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    resources = await session.list_resources()
-                    
-                    resources_list = [
-                        {
-                            "uri": resource.uri,
-                            "name": resource.name,
-                            "description": getattr(resource, 'description', None)
-                        }
-                        for resource in resources.resources
-                    ]
-                    
-                    return {
-                        "status": "success",
-                        "agent": "mcp",
-                        "resources": resources_list,
-                        "count": len(resources_list)
+            async with self.session() as session:
+                resources = await session.list_resources()
+
+                resources_list = [
+                    {
+                        "uri": resource.uri,
+                        "name": resource.name,
+                        "description": getattr(resource, 'description', None)
                     }
+                    for resource in resources.resources
+                ]
+
+                return {
+                    "status": "success",
+                    "agent": "mcp",
+                    "resources": resources_list,
+                    "count": len(resources_list)
+                }
         except Exception as e:
             logger.error("❌ Error listing resources: %s", e)
             return {
@@ -88,29 +600,28 @@ class MCPAgent:
                 "agent": "mcp",
                 "error": str(e)
             }
-    
+
     async def get_server_info(self) -> Dict:
         """Pobierz informacje o serwerze MCP"""
         logger.info("ℹ️  Getting MCP server info")
-        
+
         try:
-            async with stdio_client(self.mcp_server) as (read, write):
-                async with ClientSession(read, write) as session:
-                    init_result = await session.initialize()
-                    
-                    tools = await session.list_tools()
-                    resources = await session.list_resources()
-                    
-                    return {
-                        "status": "success",
-                        "agent": "mcp",
-                        "server_info": {
-                            "protocol_version": init_result.protocolVersion,
-                            "capabilities": init_result.capabilities,
-                            "tools_count": len(tools.tools),
-                            "resources_count": len(resources.resources)
-                        }
+            async with self.session() as session:
+                init_result = self.connection_pool.init_result
+
+                tools = await session.list_tools()
+                resources = await session.list_resources()
+
+                return {
+                    "status": "success",
+                    "agent": "mcp",
+                    "server_info": {
+                        "protocol_version": init_result.protocolVersion,
+                        "capabilities": init_result.capabilities,
+                        "tools_count": len(tools.tools),
+                        "resources_count": len(resources.resources)
                     }
+                }
         except Exception as e:
             logger.error("❌ Error getting server info: %s", e)
             return {
@@ -118,16 +629,17 @@ class MCPAgent:
                 "agent": "mcp",
                 "error": str(e)
             }
-    
+
     async def health_check(self) -> Dict:
         """Sprawdź health MCP servera"""
         try:
             result = await self.get_server_info()
-            
+
             if result["status"] == "success":
                 return {
                     "status": "ok",
-                    "protocol_version": result["server_info"]["protocol_version"]
+                    "protocol_version": result["server_info"]["protocol_version"],
+                    "pool": self.connection_pool.status()
                 }
             else:
                 return {
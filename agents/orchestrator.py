@@ -4,7 +4,7 @@ Main Orchestrator Agent - koordynuje wszystkie agenty
 """
 
 import asyncio
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
 import json
 import logging
 
@@ -12,20 +12,54 @@ import logging
 from agents.game_agent import GameAgent
 from agents.data_agent import DataAgent
 from agents.mcp_agent import MCPAgent
+from agents.cache import ResultCache
+from agents.deadline import deadline
+from agents.scheduler import PriorityScheduler
+from agents.router import IntentRequest, IntentRouter, ScoreRecord
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Klasa priorytetu schedulera dla intencji (zapisy interaktywne > odczyty > analizy)
+INTENT_PRIORITIES = {
+    'submit_score': 'write',
+    'get_scores': 'read',
+    'analytics': 'analytics',
+    'complex': 'analytics',
+}
+
+# Cache wyników: TTL per intencja (s); analizy po TTL są jeszcze przez `stale_seconds`
+# zwracane od razu i odświeżane w tle. Każdy zapis przez orchestrator czyści cache.
+DEFAULT_RESULT_CACHE = {
+    "ttl_seconds": {"get_scores": 5, "analytics": 30, "complex": 30},
+    "stale_seconds": {"analytics": 120, "complex": 120},
+    "max_entries": 1024,
+}
+
 
 class OrchestratorAgent:
     """Główny orchestrator - koordynuje wszystkie agenty"""
     
     def __init__(self, config_path: str = "agents/config/agents.json"):
         self.config = self._load_config(config_path)
+        settings = self.config.get('orchestrator', {})
+        # Termin całego żądania (s) i limit równoległych wywołań agentów
+        self.timeout = settings.get('timeout_seconds', settings.get('timeout', 30))
+        self.max_concurrent_agents = settings.get('max_concurrent_agents', 5)
+        # Sloty agentów przydzielane według klas priorytetu (waga i limit per klasa)
+        self.scheduler = PriorityScheduler(self.max_concurrent_agents, settings.get('priority_classes'))
+        # Jedna pula sesji MCP współdzielona przez wszystkich agentów
+        mcp_agent = MCPAgent(self.config.get('mcp_agent'))
+        # Intencja i parametry requestu w jednym przebiegu, z cache LRU
+        self.router = IntentRouter()
+        # Wyniki powtarzanych operacji (klucz: intencja + parametry, nie surowy tekst)
+        cache_settings = {**DEFAULT_RESULT_CACHE, **settings.get('result_cache', {})}
+        self.result_cache = ResultCache(cache_settings['ttl_seconds'], cache_settings['stale_seconds'],
+                                        max_entries=cache_settings['max_entries'], cacheable=self._cacheable)
         self.agents = {
-            'game': GameAgent(),
-            'data': DataAgent(),
-            'mcp': MCPAgent(),
+            'game': GameAgent(mcp_agent),
+            'data': DataAgent(mcp_agent),
+            'mcp': mcp_agent,
         }
         logger.info("🎯 Orchestrator initialized with agents: %s", list(self.agents.keys()))
     
@@ -39,39 +73,79 @@ class OrchestratorAgent:
             return {
                 "orchestrator": {
                     "max_concurrent_agents": 5,
-                    "timeout": 30
+                    "timeout_seconds": 30
                 }
             }
     
-    async def process_request(self, request: str) -> Dict[str, Any]:
+    async def process_request(self, request: str, timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Przetwarza request użytkownika i deleguje do odpowiednich agentów
         
         Args:
             request: Request od użytkownika (naturalny język)
+            timeout: Termin w sekundach (domyślnie `timeout_seconds` z konfiguracji)
             
         Returns:
             Wynik przetworzenia przez agenty
         """
         logger.info("📥 Processing request: %s", request)
+        timeout = self.timeout if timeout is None else timeout
         
+        # Termin obejmuje oczekiwanie na slot agenta, wywołania MCP i żądania HTTP;
+        # po jego upływie praca w toku jest anulowana
         try:
-            # Analiza intencji
-            intent = self._analyze_intent(request)
+            async with deadline(timeout):
+                return await self._cached_dispatch(request)
+        except TimeoutError:
+            logger.error("⏱️ Request timed out after %ss: %s", timeout, request)
+            return {
+                "status": "error",
+                "error": f"Request timed out after {timeout}s"
+            }
+    
+    async def _cached_dispatch(self, request: str) -> Dict[str, Any]:
+        """Wynik z cache dla powtarzanej operacji, w przeciwnym razie `_dispatch`"""
+        key = self._operation_key(request)
+        if key is None:
+            return await self._dispatch(request)
+        
+        async def load() -> Dict[str, Any]:
+            # Własny termin - wspólne pobranie i odświeżenie w tle działają poza
+            # terminem żądania, które je rozpoczęło
+            async with deadline(self.timeout):
+                return await self._dispatch(request)
+        
+        return dict(await self.result_cache.get_or_load(key[0], key, load))
+    
+    @staticmethod
+    def _cacheable(result: Dict[str, Any]) -> bool:
+        """Cache'owane są tylko pełne sukcesy (także wszystkich części wyniku złożonego)"""
+        return result.get("status") == "success" and not any(
+            isinstance(part, dict) and part.get("status") == "error" for part in result.values())
+    
+    async def _dispatch(self, request: str) -> Dict[str, Any]:
+        try:
+            # Analiza intencji i ekstrakcja parametrów
+            routed = self.router.route(request)
+            intent = routed.intent
             logger.info("🧠 Detected intent: %s", intent)
             
             # Routing do agentów
             if intent == 'get_scores':
-                return await self._handle_get_scores(request)
+                return await self._handle_get_scores(routed)
                 
             elif intent == 'submit_score':
-                return await self._handle_submit_score(request)
+                try:
+                    return await self._handle_submit_score(routed)
+                finally:
+                    # Zapis (także częściowy lub przerwany) zmienia rankingi i statystyki
+                    self.result_cache.invalidate_all()
                 
             elif intent == 'analytics':
-                return await self._handle_analytics(request)
+                return await self._handle_analytics(routed)
                 
             elif intent == 'complex':
-                return await self._handle_complex(request)
+                return await self._handle_complex(routed)
                 
             else:
                 return {
@@ -87,65 +161,98 @@ class OrchestratorAgent:
                 "error": str(e)
             }
     
-    def _analyze_intent(self, request: str) -> str:
+    async def process_batch(self, requests: List[str], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
         """
-        Analizuje intencję użytkownika
-        W produkcji można użyć LLM do lepszej analizy
+        Przetwarza wiele requestów naraz (np. odtwarzanie logu)
+        
+        Intencje wszystkich requestów analizowane są z góry; requesty o tej samej
+        znormalizowanej operacji (np. dziesięć "Pokaż top 5 easy") wykonywane są
+        raz. Unikalne operacje działają równolegle - najwyżej `max_concurrent_agents`
+        naraz, każda z własnym terminem liczonym od jej startu; zapisy startują
+        przed odczytami, a odczyty przed analizami.
+        
+        Args:
+            requests: Requesty od użytkownika (naturalny język)
+            timeout: Termin pojedynczej operacji (domyślnie `timeout_seconds`)
+            
+        Returns:
+            Wyniki w kolejności requestów
         """
-        request_lower = request.lower()
+        groups: Dict[Any, List[int]] = {}
+        for index, request in enumerate(requests):
+            key = self._operation_key(request)
+            groups.setdefault(index if key is None else key, []).append(index)
+        logger.info("📦 Processing batch: %d requests, %d unique operations", len(requests), len(groups))
         
-        # Keywords mapping
-        if any(word in request_lower for word in ['wyniki', 'scores', 'top', 'ranking', 'najlepsi', 'pokaż']):
-            return 'get_scores'
+        slots = asyncio.Semaphore(self.max_concurrent_agents)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
         
-        if any(word in request_lower for word in ['dodaj', 'zapisz', 'submit', 'nowy wynik']):
-            return 'submit_score'
+        async def run(indexes: List[int]) -> None:
+            async with slots:
+                result = await self.process_request(requests[indexes[0]], timeout)
+            for index in indexes:
+                results[index] = dict(result)
         
-        if any(word in request_lower for word in ['analiza', 'statystyki', 'raport', 'stats']):
-            return 'analytics'
+        def weight(indexes: List[int]) -> float:
+            priority = INTENT_PRIORITIES.get(self._analyze_intent(requests[indexes[0]]))
+            return self.scheduler.classes[priority].weight if priority else 0
         
-        if any(word in request_lower for word in ['wszystko', 'pełny', 'kompletny']):
-            return 'complex'
+        await asyncio.gather(*(run(indexes) for indexes in sorted(groups.values(), key=weight, reverse=True)))
+        return results
+    
+    async def _call_agent(self, priority: str, operation: Callable[..., Awaitable[Dict]], *args, **kwargs) -> Dict:
+        """Wywołaj operację agenta w slocie klasy `priority` (łącznie `max_concurrent_agents`)"""
+        async with self.scheduler.slot(priority):
+            return await operation(*args, **kwargs)
+    
+    def _analyze_intent(self, request: str) -> str:
+        """
+        Analizuje intencję użytkownika
+        W produkcji można użyć LLM do lepszej analizy
+        """
+        try:
+            return self.router.route(request).intent
+        except Exception:
+            # Błąd parsowania zgłasza `_dispatch` jako {"status": "error", ...}
+            return 'unknown'
+    
+    def _operation_key(self, request: str) -> Optional[tuple]:
+        """
+        Znormalizowana operacja requestu - identyczne klucze dają identyczny wynik
         
-        return 'unknown'
+        Zapisy zwracają None: każdy z nich jest osobną operacją i nie jest łączony.
+        None także dla requestu, którego nie da się sparsować - błąd zgłasza `_dispatch`.
+        """
+        try:
+            routed = self.router.route(request)
+        except Exception:
+            return None
+        if routed.intent == 'get_scores':
+            return (routed.intent, routed.difficulty, routed.limit)
+        if routed.intent == 'submit_score':
+            return None
+        return (routed.intent,)
     
-    async def _handle_get_scores(self, request: str) -> Dict:
+    async def _handle_get_scores(self, request: IntentRequest) -> Dict:
         """Obsługa pobierania wyników"""
-        # Ekstrakcja parametrów (uproszczone)
-        difficulty = None
-        if 'easy' in request.lower():
-            difficulty = 'easy'
-        elif 'medium' in request.lower():
-            difficulty = 'medium'
-        elif 'hard' in request.lower():
-            difficulty = 'hard'
-        
-        # Limit
-        limit = 10
-        for word in request.split():
-            if word.isdigit():
-                limit = int(word)
-                break
-        
         # Deleguj do GameAgent
-        result = await self.agents['game'].get_scores(difficulty, limit)
+        result = await self._call_agent('read', self.agents['game'].get_scores, request.difficulty, request.limit)
         return result
     
-    async def _handle_submit_score(self, request: str) -> Dict:
+    async def _handle_submit_score(self, request: IntentRequest) -> Dict:
         """Obsługa zapisywania wyniku"""
-        # Parsowanie (uproszczone - w produkcji użyj LLM)
-        # Format: "Dodaj wynik Jan, easy, 120"
-        parts = request.split(',')
+        # Wiele wyników naraz: "Dodaj wynik Jan, easy, 120; Ola, hard, 300"
+        if request.batch:
+            return await self._handle_submit_scores(request.records)
         
-        if len(parts) < 3:
+        # Format: "Dodaj wynik Jan, easy, 120" (sparsowany przez router)
+        if request.records[0] is None:
             return {
                 "status": "error",
                 "error": "Invalid format. Use: 'Dodaj wynik [name], [difficulty], [time]'"
             }
         
-        player_name = parts[0].split()[-1].strip()
-        difficulty = parts[1].strip()
-        time_seconds = int(''.join(filter(str.isdigit, parts[2])))
+        player_name, difficulty, time_seconds = request.records[0]
         
         # Walidacja
         if not await self.agents['game'].validate_score(time_seconds, difficulty):
@@ -155,30 +262,80 @@ class OrchestratorAgent:
             }
         
         # Zapisz
-        result = await self.agents['game'].submit_score(player_name, difficulty, time_seconds)
+        result = await self._call_agent('write', self.agents['game'].submit_score, player_name, difficulty, time_seconds)
         return result
     
-    async def _handle_analytics(self, request: str) -> Dict:
+    async def _handle_submit_scores(self, segments: Tuple[Optional[ScoreRecord], ...]) -> Dict:
+        """Obsługa zapisu wielu wyników - jedno wywołanie submit_scores zamiast N"""
+        records = []
+        record_indexes = []
+        rejected = []
+        
+        for index, segment in enumerate(segments):
+            if segment is None:
+                rejected.append({"index": index, "status": "error",
+                                 "error": "Invalid format. Use: '[name], [difficulty], [time]'"})
+                continue
+            
+            player_name, difficulty, time_seconds = segment
+            
+            if not await self.agents['game'].validate_score(time_seconds, difficulty):
+                rejected.append({"index": index, "status": "error",
+                                 "error": "Invalid score - time too low for difficulty"})
+                continue
+            
+            records.append({"player_name": player_name, "difficulty": difficulty, "time_seconds": time_seconds})
+            record_indexes.append(index)
+        
+        results = list(rejected)
+        if records:
+            result = await self._call_agent('write', self.agents['game'].submit_scores, records)
+            if result["status"] != "success":
+                return result
+            for item in result["data"]["results"]:
+                results.append({**item, "index": record_indexes[item["index"]]})
+        
+        results.sort(key=lambda item: item["index"])
+        succeeded = sum(1 for item in results if item["status"] == "success")
+        return {
+            "status": "success",
+            "agent": "game",
+            "data": {
+                "requested": len(segments),
+                "succeeded": succeeded,
+                "failed": len(segments) - succeeded,
+                "results": results
+            }
+        }
+    
+    async def _handle_analytics(self, request: IntentRequest) -> Dict:
         """Obsługa analiz"""
-        result = await self.agents['data'].analyze()
+        result = await self._call_agent('analytics', self.agents['data'].analyze)
         return result
     
-    async def _handle_complex(self, request: str) -> Dict:
-        """Obsługa złożonych requestów - wiele agentów równolegle"""
+    async def _handle_complex(self, request: IntentRequest) -> Dict:
+        """Obsługa złożonych requestów - najlepsze wyniki i statystyki naraz"""
         logger.info("🔄 Running multi-agent collaboration")
         
-        # Uruchom równolegle
-        tasks = [
-            self.agents['game'].get_scores(limit=5),
-            self.agents['data'].analyze(),
-        ]
+        # Jedno wywołanie MCP (get_game_overview): ranking i statystyki z tego samego
+        # przeglądu wyników - koszt jak sama analiza, bez osobnego pobrania top 5
+        try:
+            overview = await self._call_agent('analytics', self.agents['data'].overview, limit=5)
+        except Exception as e:
+            return {"status": "success", "scores": str(e), "analytics": str(e)}
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Kształt jak z get_scores i analyze - każda część ma własny status
+        if overview["status"] != "success":
+            return {
+                "status": "success",
+                "scores": {**overview, "agent": "game"},
+                "analytics": overview
+            }
         
         return {
             "status": "success",
-            "scores": results[0] if not isinstance(results[0], Exception) else str(results[0]),
-            "analytics": results[1] if not isinstance(results[1], Exception) else str(results[1])
+            "scores": {"status": "success", "agent": "game", "data": overview["scores_text"]},
+            "analytics": {"status": "success", "agent": "data", "parsed": overview["stats"]}
         }
     
     async def health_check(self) -> Dict:
@@ -197,8 +354,16 @@ class OrchestratorAgent:
         
         return {
             "status": "ok" if all(h.get("status") != "error" for h in health.values()) else "degraded",
-            "agents": health
+            "agents": health,
+            "scheduler": self.scheduler.stats(),
+            "router_cache": self.router.cache_info(),
+            "result_cache": self.result_cache.stats()
         }
+    
+    async def close(self):
+        """Zamknij pulę sesji MCP (kończy podprocesy serwera)"""
+        await self.result_cache.close()
+        await self.agents['mcp'].close()
 
 
 async def main():
@@ -224,6 +389,8 @@ async def main():
     print("Test 3: Health check")
     health = await orchestrator.health_check()
     print(json.dumps(health, indent=2, ensure_ascii=False))
+    
+    await orchestrator.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Router intencji orchestratora - jeden przebieg skompilowanego wyrażenia po tekście
+
+Intencja i parametry (poziom, limit, gracz, czas) wyznaczane są w jednym
+skanie zamiast osobnych przeszukań list słów kluczowych i ponownego
+parsowania tekstu w handlerach. Semantyka jak w dotychczasowym
+`_analyze_intent`: słowo kluczowe może wystąpić w dowolnym miejscu tekstu
+(także wewnątrz innego słowa), a kolejność intencji rozstrzyga remisy.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Słowa kluczowe w kolejności pierwszeństwa intencji
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    'get_scores': ['wyniki', 'scores', 'top', 'ranking', 'najlepsi', 'pokaż'],
+    'submit_score': ['dodaj', 'zapisz', 'submit', 'nowy wynik'],
+    'analytics': ['analiza', 'statystyki', 'raport', 'stats'],
+    'complex': ['wszystko', 'pełny', 'kompletny'],
+}
+
+# Pierwszeństwo poziomów jak w `if 'easy' ... elif 'medium' ... elif 'hard'`
+DIFFICULTY_ORDER = ('easy', 'medium', 'hard')
+
+DEFAULT_LIMIT = 10
+
+
+class ScoreRecord(NamedTuple):
+    player_name: str
+    difficulty: str
+    time_seconds: int
+
+
+class IntentRequest(NamedTuple):
+    """Sparsowany request: intencja i jej parametry
+
+    - get_scores: `difficulty` (None = wszystkie) i `limit`
+    - submit_score: `records` - jeden rekord albo segmenty rozdzielone ';'
+      (None w miejscu segmentu o niepoprawnym formacie)
+    """
+    intent: str
+    difficulty: Optional[str] = None
+    limit: int = DEFAULT_LIMIT
+    records: Tuple[Optional[ScoreRecord], ...] = ()
+    batch: bool = False
+
+
+# Ranga tokenu: (pierwszeństwo intencji, pierwszeństwo poziomu) - mniejsza wygrywa
+_NONE = 99
+
+
+def _token_ranks() -> Dict[str, Tuple[int, int]]:
+    """Rangi słów kluczowych i poziomów - uzupełnione o złączenia nakładających się słów
+
+    Skan konsumuje dopasowanie, więc słowo zaczynające się wewnątrz innego
+    (np. 'wyniki' w 'nowy wyniki') nie zostałoby znalezione. Dlatego ranga
+    tokenu uwzględnia słowa w nim zawarte, a dla pary nakładającej się
+    (koniec jednego = początek drugiego) dodawane jest złączenie - tylko
+    wtedy, gdy ukryte słowo poprawia rangę (np. 'nowy wyniki', ale nie 'scorestats').
+    """
+    base: Dict[str, Tuple[int, int]] = {}
+    for rank, words in enumerate(INTENT_KEYWORDS.values()):
+        for word in words:
+            base[word] = (min(rank, base.get(word, (_NONE, _NONE))[0]), _NONE)
+    for rank, word in enumerate(DIFFICULTY_ORDER):
+        base[word] = (base.get(word, (_NONE, _NONE))[0], rank)
+
+    def ranks(text: str) -> Tuple[int, int]:
+        found = [r for word, r in base.items() if word in text]
+        return min(r[0] for r in found), min(r[1] for r in found)
+
+    tokens = {word: ranks(word) for word in base}
+    pending = list(tokens)
+    while pending:
+        token = pending.pop()
+        for word in base:
+            for offset in range(1, len(token)):
+                tail = token[offset:]
+                if len(tail) < len(word) and word.startswith(tail):
+                    joined = token[:offset] + word
+                    if joined not in tokens and ranks(joined) != tokens[token]:
+                        tokens[joined] = ranks(joined)
+                        pending.append(joined)
+    return tokens
+
+
+def _trie_pattern(words) -> str:
+    """Alternatywa słów jako drzewo prefiksów - silnik regex nie porównuje wspólnych początków wielokrotnie"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def pattern(node: Dict) -> str:
+        # Dłuższe dopasowanie najpierw: koniec słowa ('') jako ostatnia alternatywa
+        branches = [re.escape(char) + pattern(child) for char, child in sorted(node.items()) if char]
+        if '' in node:
+            branches.append('')
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return pattern(trie)
+
+
+def _compile_scanner(tokens) -> re.Pattern:
+    """Jedno wyrażenie: token (najdłuższy możliwy) albo liczba jako osobne słowo"""
+    return re.compile(f'({_trie_pattern(tokens)})' + r'|(?<!\S)(\d+)(?!\S)')
+
+
+# Rekord zapisu: "<...> gracz, poziom, czas" - pola jak przy split(',')
+_RECORD = re.compile(r'^(?P<head>[^,]*),(?P<difficulty>[^,]*),(?P<time>[^,]*)')
+
+
+class IntentRouter:
+    """Klasyfikacja intencji i ekstrakcja parametrów z cache LRU dla powtarzanych requestów"""
+
+    def __init__(self, cache_size: int = 4096):
+        self._ranks = _token_ranks()
+        self._scanner = _compile_scanner(self._ranks)
+        self._intents = list(INTENT_KEYWORDS)
+        self.route = lru_cache(maxsize=cache_size)(self._route)
+
+    def _route(self, request: str) -> IntentRequest:
+        intent_rank = difficulty_rank = _NONE
+        limit = None
+
+        token_ranks = self._ranks
+        for token, number in self._scanner.findall(request.lower()):
+            if token:
+                token_intent, token_difficulty = token_ranks[token]
+                if token_intent < intent_rank:
+                    intent_rank = token_intent
+                if token_difficulty < difficulty_rank:
+                    difficulty_rank = token_difficulty
+            elif limit is None:
+                limit = int(number)
+
+        intent = self._intents[intent_rank] if intent_rank < _NONE else 'unknown'
+        if intent == 'submit_score':
+            segments = request.split(';')
+            return IntentRequest(intent, records=tuple(self._record(s) for s in segments),
+                                 batch=len(segments) > 1)
+        difficulty = DIFFICULTY_ORDER[difficulty_rank] if difficulty_rank < _NONE else None
+        return IntentRequest(intent, difficulty, DEFAULT_LIMIT if limit is None else limit)
+
+    @staticmethod
+    def _record(segment: str) -> Optional[ScoreRecord]:
+        """Rekord z "[...] gracz, poziom, czas" (None, jeśli brak gracza lub poprawnych cyfr czasu)"""
+        match = _RECORD.match(segment)
+        if match is None:
+            return None
+        head = match.group('head').split()
+        digits = ''.join(filter(str.isdigit, match.group('time')))
+        # Cyfry spoza ASCII ('²', '٣') odrzucają rekord - "12²" to nie 12 sekund
+        if not head or not digits or not digits.isascii():
+            return None
+        return ScoreRecord(head[-1], match.group('difficulty').strip(), int(digits))
+
+    def cache_info(self) -> Dict[str, int]:
+        info = self.route.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
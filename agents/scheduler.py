@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Priorytetowy przydział slotów agentów - szybkie zapisy nie czekają za ciężkimi analizami
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from .upstream import LatencyTracker
+
+# Klasy priorytetu: waga (udział w zwalnianych slotach) i limit równoległych wywołań klasy
+DEFAULT_CLASSES = {
+    "write": {"weight": 8, "max_concurrent": 5},
+    "read": {"weight": 4, "max_concurrent": 4},
+    "analytics": {"weight": 1, "max_concurrent": 2},
+}
+
+
+class _PriorityClass:
+    def __init__(self, name: str, weight: float, max_concurrent: int):
+        self.name = name
+        self.weight = weight
+        self.max_concurrent = max_concurrent
+        self.running = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.virtual_time = 0.0
+        self.wait = LatencyTracker()
+        self.admitted = 0
+        self.max_wait = 0.0
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self.waiters if not waiter.done())
+
+
+class PriorityScheduler:
+    """Sloty wywołań agentów (łącznie `capacity`) przydzielane klasom priorytetu
+
+    Zwolniony slot dostaje czekający z klasy o najmniejszym czasie wirtualnym
+    (ważone sprawiedliwe kolejkowanie): każde przyjęcie przesuwa czas klasy
+    o 1/waga, więc przy stałym obciążeniu klasy dostają sloty w proporcji wag.
+    Klasa wracająca po bezczynności startuje od bieżącego czasu wirtualnego -
+    nie zbiera kredytu. Limit `max_concurrent` klasy niższej niż `capacity`
+    rezerwuje sloty dla pozostałych, np. analizy nie zajmą wszystkich.
+    Klasy pominięte w `classes` mają ustawienia z `DEFAULT_CLASSES`.
+    """
+
+    def __init__(self, capacity: int, classes: Optional[Dict[str, Dict]] = None):
+        self.capacity = max(1, capacity)
+        self.classes = {
+            name: _PriorityClass(name, float(spec.get("weight", 1)),
+                                 min(self.capacity, int(spec.get("max_concurrent", self.capacity))))
+            for name, spec in {**DEFAULT_CLASSES, **(classes or {})}.items()
+        }
+        self.running = 0
+        self._virtual_time = 0.0
+
+    def _admit(self, cls: _PriorityClass) -> None:
+        cls.virtual_time = max(cls.virtual_time, self._virtual_time)
+        self._virtual_time = cls.virtual_time
+        cls.virtual_time += 1 / cls.weight
+        cls.running += 1
+        cls.admitted += 1
+        self.running += 1
+
+    def _eligible(self, cls: _PriorityClass) -> bool:
+        return self.running < self.capacity and cls.running < cls.max_concurrent
+
+    def _dispatch(self) -> None:
+        while self.running < self.capacity:
+            candidates = [cls for cls in self.classes.values() if cls.queued and self._eligible(cls)]
+            if not candidates:
+                return
+            cls = min(candidates, key=lambda c: max(c.virtual_time, self._virtual_time))
+            waiter = cls.waiters.popleft()
+            if not waiter.done():
+                self._admit(cls)
+                waiter.set_result(None)
+
+    def _release(self, cls: _PriorityClass) -> None:
+        cls.running -= 1
+        self.running -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: str) -> AsyncIterator[None]:
+        """Zajmij slot klasy `priority` na czas bloku `async with`"""
+        cls = self.classes[priority]
+        started = time.monotonic()
+        if not cls.queued and self._eligible(cls):
+            self._admit(cls)
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            cls.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Anulowanie w chwili przydzielenia slotu - oddaj go następnemu
+                if waiter.done() and not waiter.cancelled():
+                    self._release(cls)
+                raise
+
+        waited = time.monotonic() - started
+        cls.wait.add(waited)
+        cls.max_wait = max(cls.max_wait, waited)
+        try:
+            yield
+        finally:
+            self._release(cls)
+
+    def stats(self) -> Dict:
+        """Zajętość, kolejki i czasy oczekiwania na slot per klasa (ms, ostatnie 512 przyjęć)"""
+        def ms(seconds: Optional[float]) -> Optional[float]:
+            return round(seconds * 1000, 2) if seconds is not None else None
+
+        return {
+            "capacity": self.capacity,
+            "running": self.running,
+            "classes": {
+                name: {
+                    "weight": cls.weight,
+                    "max_concurrent": cls.max_concurrent,
+                    "running": cls.running,
+                    "queued": cls.queued,
+                    "admitted": cls.admitted,
+                    "wait_p50_ms": ms(cls.wait.percentile(50)),
+                    "wait_p95_ms": ms(cls.wait.percentile(95)),
+                    "wait_max_ms": ms(cls.max_wait) if cls.admitted else None,
+                }
+                for name, cls in self.classes.items()
+            },
+        }
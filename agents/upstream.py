@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Warstwa wywołań do MinesweeperAPI - współdzielenie identycznych żądań,
+ponowienia z backoffem, żądania zabezpieczające (hedging), circuit breaker
+i adaptacyjny limit równoległych żądań
+"""
+
+import asyncio
+import bisect
+import contextvars
+import random
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from . import deadline
+
+
+class SingleFlight:
+    """Łączy równoległe identyczne wywołania w jedno (single-flight)
+
+    Pierwszy wywołujący uruchamia `fn` jako osobny task; kolejni z tym samym
+    kluczem czekają na ten sam wynik. Anulowanie jednego z oczekujących nie
+    przerywa wywołania współdzielonego przez pozostałych - dopiero gdy anulowani
+    zostaną wszyscy (np. po przekroczeniu terminu), anulowane jest też wywołanie.
+    Task startuje w kontekście pierwszego wywołującego (także z jego terminem),
+    chyba że podano `context`.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._waiting: Dict[asyncio.Task, int] = {}
+        self.calls = 0
+        self.shared = 0
+        self.abandoned = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]],
+                 context: Optional[contextvars.Context] = None) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(fn(), context=context)
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.calls += 1
+        else:
+            self.shared += 1
+
+        self._waiting[task] = self._waiting.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiting[task] == 1 and not task.done():
+                task.cancel()
+                self.abandoned += 1
+            raise
+        finally:
+            self._waiting[task] -= 1
+            if not self._waiting[task]:
+                del self._waiting[task]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "upstream_calls": self.calls,
+            "coalesced": self.shared,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._calls),
+        }
+
+
+class CircuitOpenError(Exception):
+    """API uznane za niedostępne - wywołanie odrzucone bez wysyłania żądania"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"API niedostępne (circuit breaker otwarty), ponów za {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Circuit breaker: closed → open po `failure_threshold` kolejnych błędach
+
+    W stanie open wywołania od razu kończą się CircuitOpenError. Po
+    `reset_timeout` sekundach breaker przechodzi w half_open i przepuszcza
+    jedno żądanie próbne: sukces zamyka obwód, błąd otwiera go ponownie.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def before_call(self) -> None:
+        """Zgłasza CircuitOpenError, jeśli żądanie nie może zostać wysłane"""
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(max(0.0, self.reset_timeout - (self._clock() - self._opened_at)))
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """Żądanie próbne przerwane bez wyniku (anulowanie) - kolejne może spróbować ponownie"""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.opened += 1
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class LatencyTracker:
+    """Percentyl czasów ostatnich `window` udanych żądań (posortowane okno przesuwne)"""
+
+    def __init__(self, window: int = 512):
+        self._samples: deque = deque(maxlen=window)
+        self._sorted: list = []
+
+    def add(self, seconds: float) -> None:
+        if len(self._samples) == self._samples.maxlen:
+            oldest = self._samples[0]
+            del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+        self._samples.append(seconds)
+        bisect.insort(self._sorted, seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._sorted:
+            return None
+        return self._sorted[min(len(self._sorted) - 1, int(len(self._sorted) * p / 100))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class LimiterRejectedError(Exception):
+    """Żądanie odrzucone przez limiter - kolejka pełna albo zbyt długie oczekiwanie"""
+
+    def __init__(self, reason: str, limit: int, queued: int):
+        super().__init__(f"API przeciążone: {reason} (limit {limit}, w kolejce {queued})")
+        self.limit = limit
+        self.queued = queued
+
+
+class AdaptiveLimiter:
+    """Adaptacyjny limit równoległych żądań do API (AIMD)
+
+    Żądanie ponad limit czeka w kolejce FIFO (maks. `max_queue`, najwyżej
+    `queue_timeout` sekund), potem jest odrzucane LimiterRejectedError - zamiast
+    dokładać pracy przeciążonemu API. Limit rośnie addytywnie (+1 na pełne
+    okno udanych żądań, gdy jest wykorzystywany) i maleje multiplikatywnie
+    (x`backoff`) przy przeciążeniu: błędzie z `is_overload(exc)` albo czasie
+    odpowiedzi powyżej `tolerance` x czas bazowy (nie mniej niż `latency_floor`).
+    Czas bazowy to minimum czasów odpowiedzi, które powoli (`baseline_drift`)
+    podąża w górę - API, które trwale zwolniło, nie dusi limitu w nieskończoność.
+    Jedno przeciążenie zmniejsza limit raz - żądania rozpoczęte przed
+    poprzednim zmniejszeniem go już nie obniżają.
+    """
+
+    def __init__(self, initial_limit: int = 20, min_limit: int = 1, max_limit: int = 100,
+                 max_queue: int = 1000, queue_timeout: float = 5.0, backoff: float = 0.9,
+                 tolerance: float = 2.0, latency_floor: float = 0.05, baseline_drift: float = 0.0001,
+                 is_overload: Optional[Callable[[BaseException], bool]] = None):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.latency_floor = latency_floor
+        self.is_overload = is_overload or (lambda _: False)
+        self.baseline_drift = baseline_drift
+        self.baseline: Optional[float] = None
+        self.samples = 0
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._last_decrease = 0.0
+        self.rejected = 0
+        self.timed_out = 0
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def latency_threshold(self) -> float:
+        if self.samples < 20:
+            return float("inf")
+        return max(self.latency_floor, self.tolerance * self.baseline)
+
+    async def acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self.queue_depth:
+            self.in_flight += 1
+            return
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise LimiterRejectedError("kolejka pełna", int(self.limit), self.queue_depth)
+
+        # Slot przekazywany jest przez release() - in_flight zwiększa _grant()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._return_granted(waiter)
+            self.timed_out += 1
+            raise LimiterRejectedError(f"brak miejsca po {self.queue_timeout:g}s oczekiwania",
+                                       int(self.limit), self.queue_depth) from None
+        except BaseException:
+            self._return_granted(waiter)
+            raise
+
+    def _return_granted(self, waiter: asyncio.Future) -> None:
+        # Timeout lub anulowanie w chwili przydzielenia slotu - oddaj go następnemu
+        if waiter.done() and not waiter.cancelled():
+            self.in_flight -= 1
+            self._grant()
+
+    def release(self, started: float, overloaded: bool = False, sample: bool = True,
+                busy: bool = True) -> None:
+        """Zwolnij slot; `sample=False` - wynik bez znaczenia dla limitu (np. anulowanie)
+
+        `busy=False` - żądanie wysłane przy mało wykorzystanym limicie: jego
+        powolność nie wynika z równoległości, więc nie obniża limitu.
+        """
+        self.in_flight -= 1
+        if sample:
+            self._adjust(started, time.monotonic() - started, overloaded, busy)
+        self._grant()
+
+    def _adjust(self, started: float, latency: float, overloaded: bool, busy: bool) -> None:
+        if not overloaded:
+            self.samples += 1
+            if self.baseline is None or latency < self.baseline:
+                self.baseline = latency
+            else:
+                self.baseline += (latency - self.baseline) * self.baseline_drift
+
+        if overloaded or (busy and latency > self.latency_threshold()):
+            if started >= self._last_decrease and self.limit > self.min_limit:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = time.monotonic()
+                self.decreases += 1
+            return
+
+        # Limit rośnie tylko, gdy jest wykorzystywany (są oczekujący lub zajęta połowa slotów)
+        if self.limit < self.max_limit and (self.queue_depth or self.in_flight + 1 >= self.limit / 2):
+            before = int(self.limit)
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            if int(self.limit) > before:
+                self.increases += 1
+
+    def _grant(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Wykonaj `fn` w ramach limitu"""
+        await self.acquire()
+        started = time.monotonic()
+        busy = self.in_flight >= self.limit / 2
+        try:
+            result = await fn()
+        except Exception as e:
+            self.release(started, overloaded=self.is_overload(e), busy=busy)
+            raise
+        except BaseException:
+            self.release(started, sample=False)
+            raise
+        self.release(started, busy=busy)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        threshold = self.latency_threshold()
+        return {
+            "limit": int(self.limit),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "queue_timeouts": self.timed_out,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "latency_threshold_ms": round(threshold * 1000, 1) if threshold != float("inf") else None,
+        }
+
+
+class ResilientCaller:
+    """Wywołania idempotentne z ponowieniami, hedgingiem i circuit breakerem
+
+    - ponowienia: do `max_attempts` prób, między nimi losowe opóźnienie z
+      przedziału [0, min(max_delay, base_delay * 2^n)] ("full jitter") - klienci
+      nie ponawiają jednocześnie, więc awaria nie wywołuje fali ponowień
+    - hedging (`hedge=True`): jeśli odpowiedź nie nadeszła po p95 czasów
+      ostatnich żądań, wysyłane jest drugie, identyczne żądanie; wygrywa
+      szybsze, drugie jest anulowane
+    - circuit breaker: przy niedostępnym API wywołania kończą się od razu
+      CircuitOpenError zamiast czekać na timeouty
+    - `limiter` (AdaptiveLimiter): każde żądanie HTTP, także zabezpieczające,
+      zajmuje slot limitu; odrzucenie przez limiter nie jest ponawiane
+
+    `retryable(exc)` decyduje, czy błąd jest przejściowy (ponowienie i błąd
+    breakera); pozostałe wyjątki (np. 404) są przekazywane od razu.
+    """
+
+    def __init__(self, retryable: Callable[[BaseException], bool], max_attempts: int = 3,
+                 base_delay: float = 0.1, max_delay: float = 2.0, hedge: bool = False,
+                 hedge_percentile: float = 95, min_hedge_delay: float = 0.01,
+                 breaker: Optional[CircuitBreaker] = None, limiter: Optional[AdaptiveLimiter] = None):
+        self.retryable = retryable
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter
+        self.latency = LatencyTracker()
+        self._rng = random.Random()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Opóźnienie przed ponowieniem numer `attempt` (od 1) - full jitter"""
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def hedge_delay(self) -> Optional[float]:
+        """Po ilu sekundach wysłać żądanie zabezpieczające (None = za mało pomiarów)"""
+        if not self.hedge or len(self.latency) < 20:
+            return None
+        if self.limiter is not None and self.limiter.queue_depth:
+            # Przy kolejce do API dodatkowe żądanie tylko pogłębia przeciążenie
+            return None
+        return max(self.min_hedge_delay, self.latency.percentile(self.hedge_percentile))
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], idempotent: bool = True) -> Any:
+        """Wywołaj `fn`; nieidempotentne (zapisy) - jedna próba bez hedgingu, tylko przez breaker"""
+        self.calls += 1
+        max_attempts = self.max_attempts if idempotent else 1
+        attempt = 1
+        while True:
+            try:
+                return await self._attempt(fn, hedge=idempotent)
+            except CircuitOpenError:
+                self.failures += 1
+                raise
+            except Exception as e:
+                if not self.retryable(e) or attempt >= max_attempts:
+                    self.failures += 1
+                    raise
+                delay = self.backoff(attempt)
+                budget = deadline.remaining()
+                if budget is not None and delay >= budget:
+                    # Ponowienie nie zdąży przed terminem żądania
+                    self.failures += 1
+                    raise
+            self.retries += 1
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _attempt(self, fn: Callable[[], Awaitable[Any]], hedge: bool) -> Any:
+        self.breaker.before_call()
+        if self.limiter is not None:
+            fn = partial(self.limiter.run, fn)
+        started = time.monotonic()
+        try:
+            result = await (self._hedged(fn) if hedge else fn())
+        except LimiterRejectedError:
+            # Żądanie nie zostało wysłane - bez wpływu na stan breakera
+            self.breaker.release_probe()
+            raise
+        except Exception as e:
+            if self.retryable(e):
+                self.breaker.record_failure()
+            else:
+                # API odpowiedziało (np. 404) - to nie jest awaria
+                self.breaker.record_success()
+            raise
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success()
+        if hedge:
+            self.latency.add(time.monotonic() - started)
+        return result
+
+    async def _hedged(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        delay = self.hedge_delay()
+        if delay is None:
+            return await fn()
+
+        primary = asyncio.ensure_future(fn())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.hedges += 1
+            hedge = asyncio.ensure_future(fn())
+            tasks.add(hedge)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Przegrane (albo porzucone przy anulowaniu wywołującego) żądanie jest anulowane
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.latency.percentile(95)
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "hedging": self.hedge,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "circuit_breaker": self.breaker.stats(),
+            "limiter": self.limiter.stats() if self.limiter is not None else None,
+        }
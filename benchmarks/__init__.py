@@ -0,0 +1 @@
+"""Benchmarki wydajności serwera MCP i agentów"""
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pełny przegląd wyników dla mcp://game-stats (rollupy z dokładnym zbiorem graczy vs HyperLogLog)
+i odświeżenie przyrostowe po dopisaniu nowych wyników
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python3 -m benchmarks.benchmark_game_stats --scores 1000000 --players 100000
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks import common  # noqa: F401 - wycisza logi httpx
+from benchmarks.stub_api import StubApiServer, StubState
+
+
+async def run(state: StubState, scores: int, new_scores: int) -> None:
+    import mcp_server_minesweeper as server
+
+    print(f"\nPełny przegląd {scores} wyników (strona={server.SCAN_PAGE_SIZE}), potem +{new_scores} nowych")
+    print(f"{'rollupy':<12}{'czas [s]':>12}{'wyniki/s':>14}{'kolumny [KiB]':>16}{'kubełki':>10}{'odśw. [ms]':>12}")
+    for method in ("exact", "hll"):
+        server.UNIQUE_PLAYERS_METHOD = method
+        server.stats_snapshot = snapshot = server._StatsSnapshot()
+        started = time.perf_counter()
+        await snapshot.refresh()
+        elapsed = time.perf_counter() - started
+        
+        # Wyniki zapisane przez "inne workery" - odświeżenie pobiera tylko je
+        for i in range(new_scores):
+            state.add_score(f"NewPlayer{i}", "easy", 100 + i % 500)
+        started = time.perf_counter()
+        await snapshot.refresh()
+        refreshed = time.perf_counter() - started
+        
+        store, rollups = snapshot.store, snapshot.rollups
+        print(f"{method:<12}{elapsed:>12.2f}{scores / elapsed:>14.0f}"
+              f"{store.nbytes() / 1024:>16.1f}{len(rollups.hours) + len(rollups.days):>10}{refreshed * 1000:>12.1f}")
+    await server.close_http_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scores", type=int, default=100000)
+    parser.add_argument("--players", type=int, default=10000)
+    parser.add_argument("--new-scores", type=int, default=1000)
+    args = parser.parse_args()
+
+    state = StubState(scores_count=args.scores, players_count=args.players)
+    with StubApiServer(state) as stub:
+        os.environ["MINESWEEPER_API_BASE"] = stub.api_base
+        asyncio.run(run(state, args.scores, args.new_scores))
+
+
+if __name__ == "__main__":
+    main()
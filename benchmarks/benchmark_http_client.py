@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark: klient HTTP tworzony per wywołanie vs współdzielona pula połączeń
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python3 -m benchmarks.benchmark_http_client --requests 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+
+import httpx
+
+from benchmarks.common import measure, print_results
+from benchmarks.stub_api import StubApiServer
+
+
+async def run(requests: int, concurrency: int) -> None:
+    import mcp_server_minesweeper as server
+
+    async def per_call_client():
+        # Poprzednie zachowanie narzędzi: nowy klient (i połączenie TCP) przy każdym wywołaniu
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{server.API_BASE}/scores", params={"limit": 10})
+            response.raise_for_status()
+
+    async def pooled_client():
+        result = await server.get_scores(limit=10)
+        assert not result.startswith("❌"), result
+
+    results = {
+        "per-call AsyncClient": await measure(per_call_client, requests, concurrency),
+        "pooled get_scores": await measure(pooled_client, requests, concurrency),
+    }
+    await server.close_http_client()
+    print_results(f"GET /api/scores x{requests} (concurrency={concurrency})", results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    with StubApiServer() as stub:
+        os.environ["MINESWEEPER_API_BASE"] = stub.api_base
+        asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: routing intencji orchestratora - listy słów kluczowych vs IntentRouter
+
+Porównuje dotychczasowy sposób (`any(word in ...)` dla każdej listy, potem
+ponowne lowercase/split w handlerze) z jednym przebiegiem skompilowanego
+wyrażenia - bez cache i z cache LRU dla powtarzanych requestów.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python3 -m benchmarks.benchmark_intent_router --requests 200000
+    python3 -m benchmarks.benchmark_intent_router --corpus requests.jsonl
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Callable, List, Optional
+
+from agents.router import INTENT_KEYWORDS, IntentRouter
+
+TEMPLATES = [
+    "Pokaż top {limit} {difficulty}",
+    "Pokaż top {limit} wyników {difficulty}",
+    "Pokaż ranking {difficulty}",
+    "Najlepsi gracze {difficulty} top {limit}",
+    "Pokaż statystyki",
+    "Raport tygodniowy - analiza czasów",
+    "Dodaj wynik {name}, {difficulty}, {time}",
+    "Zapisz nowy wynik {name}, {difficulty}, {time}s",
+    "Dodaj wynik {name}, {difficulty}, {time}; {name2}, {difficulty}, {time}",
+    "Daj mi wszystko - kompletny przegląd",
+    "Co słychać?",
+]
+
+
+def generate(count: int, seed: int = 42) -> List[str]:
+    """Korpus z powtórzeniami: popularne frazy występują często (rozkład Zipfa)"""
+    rng = random.Random(seed)
+    phrasings = [
+        template.format(limit=rng.randint(1, 20), difficulty=rng.choice(["easy", "medium", "hard", ""]),
+                        name=f"Gracz{rng.randint(1, 500)}", name2=f"Gracz{rng.randint(1, 500)}",
+                        time=rng.randint(10, 900))
+        for template in TEMPLATES
+        for _ in range(200)
+    ]
+    weights = [1 / rank for rank in range(1, len(phrasings) + 1)]
+    return rng.choices(phrasings, weights=weights, k=count)
+
+
+def load_corpus(path: str, count: int) -> List[str]:
+    """Requesty z pliku JSONL (pole "request", "title" lub "body"), powielone do `count`"""
+    texts = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                texts.append(record.get("request") or record.get("title") or record.get("body") or "")
+    return (texts * (count // max(1, len(texts)) + 1))[:count]
+
+
+def legacy_route(request: str) -> tuple:
+    """Dotychczasowa ścieżka: analiza intencji i osobne parsowanie parametrów w handlerze"""
+    request_lower = request.lower()
+    intent = 'unknown'
+    for name, words in INTENT_KEYWORDS.items():
+        if any(word in request_lower for word in words):
+            intent = name
+            break
+
+    if intent == 'get_scores':
+        difficulty: Optional[str] = None
+        if 'easy' in request.lower():
+            difficulty = 'easy'
+        elif 'medium' in request.lower():
+            difficulty = 'medium'
+        elif 'hard' in request.lower():
+            difficulty = 'hard'
+        limit = 10
+        for word in request.split():
+            if word.isdigit():
+                limit = int(word)
+                break
+        return intent, difficulty, limit
+    if intent == 'submit_score':
+        records = []
+        for segment in request.split(';'):
+            parts = segment.split(',')
+            digits = ''.join(filter(str.isdigit, parts[2])) if len(parts) >= 3 else ''
+            if digits and parts[0].split():
+                records.append((parts[0].split()[-1].strip(), parts[1].strip(), int(digits)))
+        return intent, records
+    return (intent,)
+
+
+def timed(route: Callable[[str], object], corpus: List[str]) -> float:
+    started = time.perf_counter()
+    for request in corpus:
+        route(request)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--corpus", help="Plik JSONL z requestami (domyślnie korpus syntetyczny)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.requests) if args.corpus else generate(args.requests)
+    print(f"Korpus: {len(corpus)} requestów, {len(set(corpus))} unikalnych")
+
+    cold = IntentRouter(cache_size=0)
+    cached = IntentRouter()
+    results = {
+        "słowa kluczowe": timed(legacy_route, corpus),
+        "IntentRouter": timed(cold.route, corpus),
+        "IntentRouter + LRU": timed(cached.route, corpus),
+    }
+
+    baseline = results["słowa kluczowe"]
+    print(f"\n{'wariant':<22}{'µs/request':>12}{'przyspieszenie':>16}")
+    for name, seconds in results.items():
+        print(f"{name:<22}{seconds / len(corpus) * 1e6:>12.2f}{baseline / seconds:>15.1f}x")
+    print(f"\nCache LRU: {cached.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: lista słowników JSON vs kolumnowy ScoreStore (pamięć i czas agregacji)
+
+Agregacja = statystyki GameStats + percentyle/histogramy per poziom, jak w
+mcp://game-stats i mcp://leaderboard-analytics.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python3 -m benchmarks.benchmark_score_store --scores 1000000 --players 100000
+"""
+
+import argparse
+import bisect
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from agents.aggregates import DIFFICULTIES, HISTOGRAM_EDGES, PERCENTILES, parse_played_at
+from agents.columnar import ScoreStore
+
+
+def generate(scores: int, players: int) -> List[Dict]:
+    """Wyniki w formacie odpowiedzi API (jak strony GET /api/scores/page)"""
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": index + 2,
+            "playerName": f"Player{rng.randint(1, players)}",
+            "difficulty": rng.choice(DIFFICULTIES),
+            "timeSeconds": rng.randint(10, 3000),
+            "playedAt": (now - timedelta(seconds=rng.uniform(0, 60 * 86400))).isoformat(),
+        }
+        for index in range(scores)
+    ]
+
+
+def aggregate_dicts(scores: List[Dict]) -> Dict:
+    """Agregacja po liście słowników - pętla Pythona i sortowanie czasów per poziom"""
+    players = set()
+    times: Dict[str, List[int]] = {d: [] for d in DIFFICULTIES}
+    for score in scores:
+        players.add(score["playerName"])
+        if score["difficulty"] in times:
+            times[score["difficulty"]].append(score["timeSeconds"])
+
+    levels = {}
+    for difficulty, values in times.items():
+        values.sort()
+        histogram = [0] * (len(HISTOGRAM_EDGES) + 1)
+        for value in values:
+            histogram[bisect.bisect_right(HISTOGRAM_EDGES, value)] += 1
+        levels[difficulty] = {
+            "count": len(values),
+            "best_time": values[0] if values else None,
+            "percentiles": {f"p{p}": values[max(0, -(-len(values) * p // 100) - 1)] for p in PERCENTILES},
+            "histogram": histogram,
+        }
+    return {"total_games": len(scores), "unique_players": len(players), "levels": levels}
+
+
+def aggregate_store(store: ScoreStore) -> Dict:
+    return {"stats": store.stats(), "analytics": store.analytics()}
+
+
+def build_store(scores: List[Dict]) -> ScoreStore:
+    store = ScoreStore()
+    for score in scores:
+        store.append_score(score, parse_played_at(score["playedAt"]))
+    return store
+
+
+def traced(build):
+    """Zbuduj obiekt i zwróć go z liczbą zaalokowanych bajtów"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, allocated
+
+
+def timed(call, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scores", type=int, default=1000000)
+    parser.add_argument("--players", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"Generuję {args.scores} wyników ({args.players} graczy)...")
+    scores, dicts_bytes = traced(lambda: generate(args.scores, args.players))
+    store, store_bytes = traced(lambda: build_store(scores))
+
+    dicts_seconds = timed(lambda: aggregate_dicts(scores))
+    store_seconds = timed(lambda: aggregate_store(store))
+
+    print(f"\n{'wariant':<20}{'pamięć [MiB]':>14}{'agregacja [ms]':>16}")
+    print(f"{'lista słowników':<20}{dicts_bytes / 2**20:>14.1f}{dicts_seconds * 1000:>16.1f}")
+    print(f"{'ScoreStore':<20}{store_bytes / 2**20:>14.1f}{store_seconds * 1000:>16.1f}")
+    print(f"\nPamięć: {dicts_bytes / store_bytes:.1f}x mniej, agregacja: {dicts_seconds / store_seconds:.1f}x szybciej"
+          f" ({'NumPy' if store.vectorized else 'bez NumPy - pętla Pythona'})")
+
+
+if __name__ == "__main__":
+    main()
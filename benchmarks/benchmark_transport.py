@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark: transport stdio (podproces + JSON-RPC) vs transport in-process
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python3 -m benchmarks.benchmark_transport --requests 1000 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+
+from benchmarks.common import measure, print_results
+from benchmarks.stub_api import StubApiServer
+
+
+async def run_transport(transport: str, requests: int, concurrency: int):
+    from agents import GameAgent, MCPAgent
+
+    mcp_agent = MCPAgent({"transport": transport, "workers": 1})
+    game = GameAgent(mcp_agent)
+    await mcp_agent.start()
+
+    async def call():
+        result = await game.get_scores(difficulty="easy", limit=10)
+        assert result["status"] == "success", result
+
+    stats = await measure(call, requests, concurrency)
+    await mcp_agent.close()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with StubApiServer() as stub:
+        os.environ["MINESWEEPER_API_BASE"] = stub.api_base
+        results = {
+            transport: asyncio.run(run_transport(transport, args.requests, args.concurrency))
+            for transport in ("stdio", "inprocess")
+        }
+    print_results(f"GameAgent.get_scores x{args.requests} (concurrency={args.concurrency})", results)
+
+
+if __name__ == "__main__":
+    main()
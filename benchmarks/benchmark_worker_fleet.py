@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark: przepustowość OrchestratorAgent przy 1 workerze MCP vs flocie N workerów
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python3 -m benchmarks.benchmark_worker_fleet --requests 400 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+
+from benchmarks.common import measure, print_results
+from benchmarks.stub_api import StubApiServer
+
+
+async def run_with_workers(workers: int, requests: int, concurrency: int):
+    from agents import OrchestratorAgent
+
+    orchestrator = OrchestratorAgent()
+    pool = orchestrator.agents['mcp'].connection_pool
+    pool.min_workers = pool.max_workers = workers
+    # Każdy request ma trafić do workera, a nie do cache wyników orchestratora
+    orchestrator.result_cache.ttls.clear()
+    await orchestrator.agents['mcp'].start()
+
+    async def call():
+        result = await orchestrator.process_request("Pokaż top 5 wyników easy")
+        assert result["status"] == "success", result
+
+    stats = await measure(call, requests, concurrency)
+    print(f"workers={workers}: {orchestrator.agents['mcp'].worker_stats()['workers']}")
+    await orchestrator.close()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with StubApiServer() as stub:
+        os.environ["MINESWEEPER_API_BASE"] = stub.api_base
+        results = {}
+        for workers in sorted({1, args.workers}):
+            results[f"{workers} worker(s)"] = asyncio.run(
+                run_with_workers(workers, args.requests, args.concurrency)
+            )
+    print_results(f"process_request x{args.requests} (concurrency={args.concurrency})", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Pomocnicze funkcje pomiarowe dla benchmarków"""
+
+import asyncio
+import logging
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+# FastMCP ustawia logowanie na INFO - logi każdego żądania httpx zaciemniałyby wyniki
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Percentyl (metoda najbliższej rangi) z listy próbek"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def measure(call: Callable[[], Awaitable], requests: int, concurrency: int) -> Dict[str, float]:
+    """Wykonaj `requests` wywołań z zadaną współbieżnością i zwróć statystyki latencji (ms)"""
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": statistics.fmean(latencies),
+        "throughput_rps": requests / elapsed,
+    }
+
+
+def print_results(title: str, results: Dict[str, Dict[str, float]]) -> None:
+    """Wypisz tabelę wyników benchmarku"""
+    print(f"\n{title}")
+    print(f"{'wariant':<24}{'p50 [ms]':>12}{'p99 [ms]':>12}{'mean [ms]':>12}{'req/s':>12}")
+    for name, stats in results.items():
+        print(f"{name:<24}{stats['p50_ms']:>12.2f}{stats['p99_ms']:>12.2f}"
+              f"{stats['mean_ms']:>12.2f}{stats['throughput_rps']:>12.0f}")
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Lokalny zamiennik MinesweeperAPI do benchmarków
+
+Odwzorowuje endpointy /api/scores (w tym /api/scores/page i /api/scores/since) i /api/progress z kontrolerów .NET
+na danych w pamięci, z opcjonalnym sztucznym opóźnieniem odpowiedzi.
+"""
+
+import asyncio
+import bisect
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+class StubState:
+    """Dane w pamięci odpowiadające GameService"""
+
+    def __init__(self, scores_count: int = 500, players_count: int = 50, latency_ms: float = 0.0,
+                 history_days: float = 60.0):
+        self.latency_ms = latency_ms
+        self.scores: List[Dict] = []
+        self.progress: Dict[str, Dict] = {}
+        # Wyniki posortowane po (timeSeconds, id) - odpowiednik SortedSet w GameService
+        self.ranked: List[Dict] = []
+        self.ranked_keys: List[tuple] = []
+        rng = random.Random(42)
+        now = datetime.now(timezone.utc)
+        for _ in range(scores_count):
+            self.add_score(
+                f"Player{rng.randint(1, players_count)}",
+                rng.choice(DIFFICULTIES),
+                rng.randint(10, 3000),
+                ranked=False,
+                # Wyniki wygenerowane rozłożone na ostatnie `history_days` dni (dla raportów okresowych)
+                played_at=now - timedelta(seconds=rng.uniform(0, history_days * 86400)),
+            )
+        self.ranked = sorted(self.scores, key=self._rank_key)
+        self.ranked_keys = [self._rank_key(s) for s in self.ranked]
+
+    @staticmethod
+    def _rank_key(score: Dict) -> tuple:
+        return score["timeSeconds"], score["id"]
+
+    def add_score(self, player_name: str, difficulty: str, time_seconds: int, ranked: bool = True,
+                  played_at: Optional[datetime] = None) -> Dict:
+        score = {
+            "id": len(self.scores) + 2,
+            "playerName": player_name,
+            "difficulty": difficulty,
+            "timeSeconds": time_seconds,
+            "playedAt": (played_at or datetime.now(timezone.utc)).isoformat(),
+        }
+        self.scores.append(score)
+        if ranked:
+            position = bisect.bisect(self.ranked_keys, self._rank_key(score))
+            self.ranked_keys.insert(position, self._rank_key(score))
+            self.ranked.insert(position, score)
+        progress = self.get_progress(player_name)
+        progress[f"{difficulty}Completed"] = True
+        return score
+
+    def get_progress(self, player_name: str) -> Dict:
+        return self.progress.setdefault(player_name, {
+            "id": len(self.progress) + 1,
+            "playerName": player_name,
+            "easyCompleted": False,
+            "mediumCompleted": False,
+            "hardCompleted": False,
+            "currentTexture": "default",
+        })
+
+
+def create_app(state: StubState) -> Starlette:
+    """Zbuduj aplikację ASGI z endpointami MinesweeperAPI"""
+
+    async def delay():
+        if state.latency_ms:
+            await asyncio.sleep(state.latency_ms / 1000)
+
+    async def scores(request: Request):
+        await delay()
+        if request.method == "POST":
+            body = await request.json()
+            score = state.add_score(body["playerName"], body["difficulty"], body["timeSeconds"])
+            return JSONResponse(score, status_code=201)
+
+        limit = int(request.query_params.get("limit", 10))
+        if limit < 1 or limit > 100:
+            return PlainTextResponse("Limit musi być między 1 a 100", status_code=400)
+        difficulty = request.query_params.get("difficulty")
+        items = [s for s in state.scores if not difficulty or s["difficulty"] == difficulty]
+        items.sort(key=lambda s: s["timeSeconds"])
+        return JSONResponse(items[:limit])
+
+    async def scores_page(request: Request):
+        await delay()
+        query = request.query_params
+        limit = int(query.get("limit", 100))
+        if limit < 1 or limit > 1000:
+            return PlainTextResponse("Limit musi być między 1 a 1000", status_code=400)
+        if ("afterTime" in query) != ("afterId" in query):
+            return PlainTextResponse("afterTime i afterId muszą być podane razem", status_code=400)
+
+        start = 0
+        if "afterTime" in query:
+            start = bisect.bisect_right(state.ranked_keys, (int(query["afterTime"]), int(query["afterId"])))
+        difficulty = query.get("difficulty")
+        page = []
+        for index in range(start, len(state.ranked)):
+            score = state.ranked[index]
+            if not difficulty or score["difficulty"] == difficulty:
+                page.append(score)
+                if len(page) == limit:
+                    break
+        return JSONResponse(page)
+
+    async def scores_since(request: Request):
+        await delay()
+        query = request.query_params
+        limit = int(query.get("limit", 1000))
+        if limit < 1 or limit > 1000:
+            return PlainTextResponse("Limit musi być między 1 a 1000", status_code=400)
+        # Id nadawane kolejno: indeks w `scores` to id - 2
+        start = max(0, int(query.get("afterId", 0)) - 1)
+        return JSONResponse(state.scores[start:start + limit])
+
+    async def progress(request: Request):
+        await delay()
+        return JSONResponse(state.get_progress(request.path_params["player"]))
+
+    async def rewards(request: Request):
+        await delay()
+        progress = state.get_progress(request.path_params["player"])
+        return JSONResponse([
+            {"name": "Brązowa tekstura", "texture": "bronze", "requiredDifficulty": "easy",
+             "isUnlocked": progress["easyCompleted"]},
+            {"name": "Srebrna tekstura", "texture": "silver", "requiredDifficulty": "medium",
+             "isUnlocked": progress["mediumCompleted"]},
+            {"name": "Złota tekstura", "texture": "gold", "requiredDifficulty": "hard",
+             "isUnlocked": progress["hardCompleted"]},
+        ])
+
+    return Starlette(routes=[
+        Route("/api/scores", scores, methods=["GET", "POST"]),
+        Route("/api/scores/page", scores_page),
+        Route("/api/scores/since", scores_since),
+        Route("/api/progress/{player}", progress),
+        Route("/api/progress/{player}/rewards", rewards),
+    ])
+
+
+class StubApiServer:
+    """Uruchamia zamiennik API w osobnym wątku (uvicorn na wolnym porcie)"""
+
+    def __init__(self, state: StubState = None):
+        self.state = state or StubState()
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        config = uvicorn.Config(create_app(self.state), host="127.0.0.1", port=self.port,
+                                log_level="warning", access_log=False)
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def api_base(self) -> str:
+        return f"http://127.0.0.1:{self.port}/api"
+
+    def __enter__(self) -> "StubApiServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    with StubApiServer() as server:
+        print(f"🧪 Stub API: {server.api_base} (Ctrl+C aby zakończyć)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
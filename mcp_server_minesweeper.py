@@ -4,145 +4,1081 @@ MCP Server dla MinesweeperAPI
 Udostępnia narzędzia do zarządzania grą Saper przez API
 """
 
+import asyncio
+import base64
+import binascii
+import contextvars
 import json
+import logging
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable, Dict, List, Optional, TypedDict
+
 import httpx
+from mcp import types
 from mcp.server import FastMCP
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.exceptions import McpError
 
-# Inicjalizacja FastMCP server
-mcp = FastMCP("minesweeper-api")
+from agents.aggregates import PERIODS, TimeBucketedStats, parse_played_at
+from agents.cache import TTLCache
+from agents.columnar import ScoreStore
+from agents.deadline import deadline
+from agents.indexes import PlayerIndex
+from agents.upstream import AdaptiveLimiter, CircuitBreaker, ResilientCaller, SingleFlight
+
+logger = logging.getLogger(__name__)
 
 # Konfiguracja API
-API_BASE = "http://localhost:5022/api"
+API_BASE = os.environ.get("MINESWEEPER_API_BASE", "http://localhost:5022/api")
+
+# Konfiguracja klienta HTTP (pula połączeń keep-alive współdzielona przez narzędzia)
+HTTP_MAX_CONNECTIONS = int(os.environ.get("MINESWEEPER_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("MINESWEEPER_HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("MINESWEEPER_HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.environ.get("MINESWEEPER_HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("MINESWEEPER_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP2_ENABLED = os.environ.get("MINESWEEPER_HTTP2", "0") == "1"
+
+# Cache odczytów (get_scores, get_player_progress); TTL=0 wyłącza cache
+CACHE_TTL = float(os.environ.get("MINESWEEPER_CACHE_TTL", "5"))
+CACHE_MAX_ENTRIES = int(os.environ.get("MINESWEEPER_CACHE_MAX_ENTRIES", "1024"))
+
+read_cache = TTLCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+
+# Statystyki gry: jeden przegląd wyników stronami, potem co STATS_TTL sekund dociągane tylko nowe wyniki
+SCAN_PAGE_SIZE = int(os.environ.get("MINESWEEPER_SCAN_PAGE_SIZE", "1000"))
+STATS_TTL = float(os.environ.get("MINESWEEPER_STATS_TTL", "30"))
+UNIQUE_PLAYERS_METHOD = os.environ.get("MINESWEEPER_UNIQUE_PLAYERS", "exact")
+
+# Odporność na awarie API: ponowienia GET (backoff z jitterem), hedging, circuit breaker
+RETRY_ATTEMPTS = int(os.environ.get("MINESWEEPER_RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.environ.get("MINESWEEPER_RETRY_BASE_DELAY", "0.1"))
+RETRY_MAX_DELAY = float(os.environ.get("MINESWEEPER_RETRY_MAX_DELAY", "2"))
+HEDGE_ENABLED = os.environ.get("MINESWEEPER_HEDGE", "0") == "1"
+BREAKER_THRESHOLD = int(os.environ.get("MINESWEEPER_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.environ.get("MINESWEEPER_BREAKER_RESET", "10"))
+
+# Adaptacyjny (AIMD) limit równoległych żądań do API; nadmiar czeka w kolejce albo jest odrzucany
+LIMIT_INITIAL = int(os.environ.get("MINESWEEPER_LIMIT_INITIAL", "20"))
+LIMIT_MIN = int(os.environ.get("MINESWEEPER_LIMIT_MIN", "1"))
+LIMIT_MAX = int(os.environ.get("MINESWEEPER_LIMIT_MAX", str(HTTP_MAX_CONNECTIONS)))
+LIMIT_QUEUE = int(os.environ.get("MINESWEEPER_LIMIT_QUEUE", "1000"))
+LIMIT_QUEUE_TIMEOUT = float(os.environ.get("MINESWEEPER_LIMIT_QUEUE_TIMEOUT", "5"))
+
+# Równoległe identyczne GET-y do API współdzielą jedno żądanie HTTP
+get_flights = SingleFlight()
+
+# Błędy przejściowe: brak połączenia/timeout i odpowiedzi 429/5xx
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def _is_transient(error: BaseException) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS
+    return isinstance(error, httpx.TransportError)
+
+
+upstream = ResilientCaller(
+    _is_transient,
+    max_attempts=RETRY_ATTEMPTS,
+    base_delay=RETRY_BASE_DELAY,
+    max_delay=RETRY_MAX_DELAY,
+    hedge=HEDGE_ENABLED,
+    breaker=CircuitBreaker(failure_threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET),
+    limiter=AdaptiveLimiter(
+        initial_limit=LIMIT_INITIAL,
+        min_limit=LIMIT_MIN,
+        max_limit=LIMIT_MAX,
+        max_queue=LIMIT_QUEUE,
+        queue_timeout=LIMIT_QUEUE_TIMEOUT,
+        is_overload=_is_transient,
+    ),
+)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Utwórz klienta HTTP z pulą połączeń według konfiguracji"""
+    http2 = HTTP2_ENABLED
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but 'h2' is not installed, falling back to HTTP/1.1")
+            http2 = False
+
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        http2=http2,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Zwróć współdzielonego klienta HTTP (tworzony leniwie przy pierwszym użyciu)
+
+    Klient żyje przez cały czas działania serwera, dzięki czemu kolejne
+    wywołania narzędzi korzystają z otwartych połączeń keep-alive.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _create_http_client()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Zamknij współdzielonego klienta HTTP i jego pulę połączeń"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def _get_json(path: str, params: Optional[Dict] = None):
+    """GET do API z łączeniem identycznych równoległych żądań (single-flight)
+
+    Wspólne żądanie przechodzi przez `upstream`: błędy przejściowe są ponawiane,
+    a przy niedostępnym API wywołanie kończy się od razu CircuitOpenError.
+    """
+    key = (path, tuple(sorted((params or {}).items())))
+
+    async def request():
+        response = await get_http_client().get(f"{API_BASE}{path}", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    return await get_flights.do(key, lambda: upstream.call(request))
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict]:
+    """Start/stop serwera - otwiera i zamyka pulę połączeń HTTP"""
+    client = get_http_client()
+    logger.info("🔌 HTTP client ready: %s (max_connections=%d)", API_BASE, HTTP_MAX_CONNECTIONS)
+    try:
+        yield {"http_client": client}
+    finally:
+        await stats_snapshot.close()
+        await close_http_client()
+
+
+def _requested_timeout() -> Optional[float]:
+    """Termin z `_meta.timeoutSeconds` bieżącego żądania MCP (None = klient go nie podał)"""
+    context = request_ctx.get(None)
+    meta = context.meta if context is not None else None
+    value = (meta.model_extra or {}).get("timeoutSeconds") if meta is not None else None
+    if value is None:
+        return None
+    try:
+        timeout = float(value) if not isinstance(value, bool) else math.nan
+    except (TypeError, ValueError):
+        timeout = math.nan
+    if math.isnan(timeout):
+        raise McpError(types.ErrorData(code=types.INVALID_PARAMS,
+                                       message=f"_meta.timeoutSeconds musi być liczbą, otrzymano {value!r}"))
+    return timeout
+
+
+@asynccontextmanager
+async def _client_deadline() -> AsyncIterator[None]:
+    """Blok wykonywany w terminie z `_meta.timeoutSeconds` klienta
+
+    Po przekroczeniu terminu praca jest anulowana razem z trwającymi
+    żądaniami HTTP (zwalniają slot limitera i połączenie z puli).
+    """
+    timeout = _requested_timeout()
+    if timeout is None:
+        yield
+        return
+    try:
+        async with deadline(timeout):
+            yield
+    except TimeoutError:
+        raise McpError(types.ErrorData(code=408, message=f"Przekroczono termin żądania ({timeout:.1f}s)")) from None
+
+
+class MinesweeperMCP(FastMCP):
+    """FastMCP, w którym wywołania narzędzi i odczyty zasobów respektują termin klienta
+
+    `call_tool` i `read_resource` to publiczne metody FastMCP, przez które
+    przechodzą wszystkie żądania tools/call i resources/read.
+    """
+
+    async def call_tool(self, name: str, arguments: Dict):
+        async with _client_deadline():
+            return await super().call_tool(name, arguments)
+
+    async def read_resource(self, uri):
+        async with _client_deadline():
+            return await super().read_resource(uri)
+
+
+# Inicjalizacja FastMCP server
+mcp = MinesweeperMCP("minesweeper-api", lifespan=server_lifespan)
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+# Struktury wyników (tryb output_format="json")
+
+class ScoreEntry(TypedDict):
+    id: Optional[int]
+    player_name: str
+    difficulty: str
+    time_seconds: int
+    played_at: Optional[str]
+
+
+class ScoresResult(TypedDict):
+    difficulty: Optional[str]
+    count: int
+    scores: List[ScoreEntry]
+
+
+class ScoresPage(TypedDict):
+    difficulty: Optional[str]
+    count: int
+    scores: List[ScoreEntry]
+    # Kursor następnej strony; None, jeśli to ostatnia strona
+    next_cursor: Optional[str]
+
+
+class SubmitResult(TypedDict):
+    id: Optional[int]
+    player_name: str
+    difficulty: str
+    time_seconds: int
+
+
+class SubmitItem(TypedDict, total=False):
+    index: int
+    status: str
+    id: Optional[int]
+    error: str
+
+
+class BulkSubmitResult(TypedDict):
+    requested: int
+    succeeded: int
+    failed: int
+    results: List[SubmitItem]
+
+
+class RewardEntry(TypedDict):
+    name: str
+    texture: Optional[str]
+    required_difficulty: Optional[str]
+    is_unlocked: bool
+
+
+class PlayerProgressResult(TypedDict):
+    player_name: str
+    easy_completed: bool
+    medium_completed: bool
+    hard_completed: bool
+    current_texture: str
+    rewards: List[RewardEntry]
+
+
+class PlayerProgressItem(TypedDict, total=False):
+    player_name: str
+    status: str
+    progress: PlayerProgressResult
+    error: str
+
+
+class PlayersProgressResult(TypedDict):
+    requested: int
+    succeeded: int
+    failed: int
+    players: List[PlayerProgressItem]
+
+
+class PlayerLevelSummary(TypedDict):
+    attempts: int
+    best_time: int
+    avg_time: float
+    # improving / declining / stable / n/a (za mało wyników z datą)
+    trend: str
+    trend_seconds_per_day: Optional[float]
+    # Odsetek graczy poziomu z gorszym najlepszym czasem
+    percentile_rank: float
+    players_on_level: int
+
+
+class PlayerSummary(TypedDict):
+    player_name: str
+    found: bool
+    total_attempts: int
+    levels: Dict[str, Optional[PlayerLevelSummary]]
+
+
+class PlayersComparison(TypedDict):
+    requested: int
+    found: int
+    players: List[PlayerSummary]
+    # Gracz z najlepszym czasem na poziomie (wśród porównywanych); None, jeśli nikt nie grał
+    leaders: Dict[str, Optional[str]]
+
+
+class RankNeighbour(TypedDict):
+    position: int
+    rank: int
+    player_name: str
+    best_time: int
+    is_player: bool
+
+
+class PlayerRankResult(TypedDict):
+    player_name: str
+    difficulty: str
+    best_time: int
+    # Ranga sportowa (remisy dzielą rangę) i pozycja w pełnej kolejności (czas, nazwa)
+    rank: int
+    position: int
+    players: int
+    percentile_rank: float
+    neighbours: List[RankNeighbour]
+
+
+class PlayerMatch(TypedDict):
+    player_name: str
+    # Próby i najlepszy czas na wybranym poziomie (albo łącznie, gdy difficulty="")
+    attempts: int
+    best_time: Optional[int]
+
+
+class PlayerSearchResult(TypedDict):
+    prefix: str
+    rank_by: str
+    difficulty: Optional[str]
+    count: int
+    players: List[PlayerMatch]
+
+
+class GameStats(TypedDict):
+    total_games: int
+    unique_players: int
+    unique_players_method: str
+    distribution: Dict[str, int]
+    best_times: Dict[str, Optional[int]]
+    avg_games_per_player: float
+
+
+# Przedział [from, to) w sekundach; to=None oznacza przedział otwarty ("from" to słowo kluczowe)
+HistogramBin = TypedDict("HistogramBin", {"from": int, "to": Optional[int], "count": int})
+
+
+class LevelAnalytics(TypedDict):
+    count: int
+    best_time: Optional[int]
+    percentiles: Dict[str, Optional[int]]
+    histogram: List[HistogramBin]
+
+
+class LeaderboardAnalytics(TypedDict):
+    total_games: int
+    most_popular: Optional[str]
+    levels: Dict[str, LevelAnalytics]
+
+
+class PeriodReport(TypedDict):
+    period: str
+    # Początek okna (ISO 8601, UTC); None dla "all"
+    since: Optional[str]
+    stats: GameStats
+    analytics: LeaderboardAnalytics
+
+
+class GameOverview(TypedDict):
+    # Najlepsze wyniki i statystyki z tego samego przeglądu wyników
+    scores: ScoresResult
+    scores_text: str  # ranking w formie tekstowej get_scores
+    stats: GameStats
+
+
+def _respond(data, output_format: str, formatter: Callable) -> str:
+    """Zwróć wynik jako JSON (dla maszyn) albo sformatowany tekst (dla ludzi)"""
+    if output_format == "json":
+        return json.dumps(data, ensure_ascii=False)
+    return formatter(data)
+
+
+def _error(message: str, output_format: str) -> str:
+    """Zwróć błąd w formacie zgodnym z output_format"""
+    if output_format == "json":
+        return json.dumps({"error": message}, ensure_ascii=False)
+    return f"❌ {message}"
+
+
+def _score_entry(score: Dict) -> ScoreEntry:
+    return {
+        "id": score.get("id"),
+        "player_name": score["playerName"],
+        "difficulty": score["difficulty"],
+        "time_seconds": score["timeSeconds"],
+        "played_at": score.get("playedAt"),
+    }
+
+
+def _validate_score(player_name: str, difficulty: str, time_seconds: int) -> Optional[str]:
+    """Walidacja wyniku - zwraca komunikat błędu albo None"""
+    if not (2 <= len(player_name) <= 50):
+        return "Nazwa gracza musi mieć 2-50 znaków"
+    
+    if difficulty not in DIFFICULTIES:
+        return "Poziom musi być: easy, medium lub hard"
+        
+    if not (1 <= time_seconds <= 9999):
+        return "Czas musi być w zakresie 1-9999 sekund"
+    
+    return None
+
+
+async def _fetch_scores(difficulty: str = "", limit: int = 10) -> ScoresResult:
+    limit = min(limit, 100)
+    params = {"limit": limit}
+    if difficulty and difficulty in DIFFICULTIES:
+        params["difficulty"] = difficulty
+    
+    # Wpis z większym limitem (albo kompletną listą) obsługuje też mniejsze limity
+    key = ("scores", params.get("difficulty", ""))
+    cached = read_cache.get(key, accept=lambda e: e[0] >= limit or len(e[1]) < e[0])
+    if cached is not None:
+        scores = cached[1][:limit]
+    else:
+        generation = read_cache.generation
+        scores = [_score_entry(score) for score in await _get_json("/scores", params)]
+        read_cache.set(key, (limit, scores), generation=generation)
+    
+    return {"difficulty": difficulty or None, "count": len(scores), "scores": scores}
+
+
+def _format_scores(result: ScoresResult) -> str:
+    scores = result["scores"]
+    if not scores:
+        return "📊 Brak wyników - nikt jeszcze nie zagrał!"
+    
+    text = f"🏆 Top {len(scores)} wyników"
+    if result["difficulty"]:
+        text += f" ({result['difficulty']})"
+    text += ":\n\n"
+    
+    for i, score in enumerate(scores, 1):
+        text += f"{i}. {score['player_name']} - {score['time_seconds']}s ({score['difficulty']})\n"
+        
+    return text
+
 
 @mcp.tool()
-async def get_scores(difficulty: str = "", limit: int = 10) -> str:
+async def get_scores(difficulty: str = "", limit: int = 10, output_format: str = "text") -> str:
     """🏆 Pobierz najlepsze wyniki z gry Saper
     
     Args:
         difficulty: Poziom trudności (easy, medium, hard) - opcjonalne
-        limit: Maksymalna liczba wyników (1-100)
+        limit: Maksymalna liczba wyników (1-100; więcej - get_scores_page)
+        output_format: "text" (sformatowana lista) lub "json" (ScoresResult)
     
     Returns:
         Sformatowana lista najlepszych wyników
     """
     try:
-        params = {"limit": min(limit, 100)}
-        if difficulty and difficulty in ["easy", "medium", "hard"]:
-            params["difficulty"] = difficulty
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{API_BASE}/scores", params=params)
-            response.raise_for_status()
-            scores = response.json()
-            
-            if not scores:
-                return "📊 Brak wyników - nikt jeszcze nie zagrał!"
-            
-            # Formatowanie wyników
-            result = f"🏆 Top {len(scores)} wyników"
-            if difficulty:
-                result += f" ({difficulty})"
-            result += ":\n\n"
-            
-            for i, score in enumerate(scores, 1):
-                time_str = f"{score['timeSeconds']}s"
-                result += f"{i}. {score['playerName']} - {time_str} ({score['difficulty']})\n"
-                
-            return result
+        return _respond(await _fetch_scores(difficulty, limit), output_format, _format_scores)
             
     except httpx.RequestError as e:
-        return f"❌ Błąd połączenia z API: {e}"
+        return _error(f"Błąd połączenia z API: {e}", output_format)
+    except Exception as e:
+        return _error(f"Błąd: {e}", output_format)
+
+
+MAX_PAGE_SIZE = 1000
+
+
+def _encode_cursor(difficulty: str, time_seconds: int, score_id: int) -> str:
+    """Kursor keyset (czas, Id) ostatniego wyniku strony - nieprzezroczysty dla klienta"""
+    raw = f"v1:{difficulty}:{time_seconds}:{score_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, difficulty: str) -> Dict[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        version, cursor_difficulty, time_seconds, score_id = raw.split(":")
+        if version != "v1":
+            raise ValueError(version)
+        after = {"afterTime": int(time_seconds), "afterId": int(score_id)}
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Niepoprawny kursor") from e
+    if cursor_difficulty != difficulty:
+        raise ValueError("Kursor dotyczy innego poziomu trudności")
+    return after
+
+
+async def _fetch_scores_page(difficulty: str = "", limit: int = 100, cursor: str = "") -> ScoresPage:
+    difficulty = difficulty if difficulty in DIFFICULTIES else ""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    params: Dict = {"limit": limit}
+    if difficulty:
+        params["difficulty"] = difficulty
+    if cursor:
+        params.update(_decode_cursor(cursor, difficulty))
+    
+    page = await _get_json("/scores/page", params)
+    next_cursor = None
+    if len(page) == limit:
+        last = page[-1]
+        next_cursor = _encode_cursor(difficulty, last["timeSeconds"], last["id"])
+    
+    return {
+        "difficulty": difficulty or None,
+        "count": len(page),
+        "scores": [_score_entry(score) for score in page],
+        "next_cursor": next_cursor,
+    }
+
+
+def _format_scores_page(result: ScoresPage) -> str:
+    if not result["scores"]:
+        return "📜 Brak kolejnych wyników"
+    
+    text = f"📜 Strona: {result['count']} wyników"
+    if result["difficulty"]:
+        text += f" ({result['difficulty']})"
+    text += ":\n\n"
+    for score in result["scores"]:
+        text += f"• {score['player_name']} - {score['time_seconds']}s ({score['difficulty']})\n"
+    if result["next_cursor"]:
+        text += f"\n➡️ Następna strona: cursor=\"{result['next_cursor']}\""
+    return text
+
+
+@mcp.tool()
+async def get_scores_page(difficulty: str = "", limit: int = 100, cursor: str = "",
+                          output_format: str = "text") -> str:
+    """📜 Przeglądaj pełną tablicę wyników stronami (kursor)
+    
+    Args:
+        difficulty: Poziom trudności (easy, medium, hard) - opcjonalne
+        limit: Rozmiar strony (1-1000)
+        cursor: Kursor z poprzedniej strony (next_cursor); puste = pierwsza strona
+        output_format: "text" (sformatowana lista) lub "json" (ScoresPage)
+    
+    Returns:
+        Strona wyników posortowanych po czasie i kursor następnej strony
+    """
+    try:
+        return _respond(await _fetch_scores_page(difficulty, limit, cursor), output_format, _format_scores_page)
+    except ValueError as e:
+        return _error(str(e), output_format)
+    except httpx.RequestError as e:
+        return _error(f"Błąd połączenia z API: {e}", output_format)
     except Exception as e:
-        return f"❌ Błąd: {e}"
+        return _error(f"Błąd: {e}", output_format)
+
+
+async def _post_score(player_name: str, difficulty: str, time_seconds: int) -> SubmitResult:
+    payload = {
+        "playerName": player_name,
+        "difficulty": difficulty,
+        "timeSeconds": time_seconds
+    }
+    
+    async def request():
+        response = await get_http_client().post(f"{API_BASE}/scores", json=payload)
+        response.raise_for_status()
+        return response.json()
+    
+    # Zapis nie jest idempotentny - bez ponowień, ale przez circuit breaker
+    result = await upstream.call(request, idempotent=False)
+    
+    # Zapis zmienia tablicę wyników poziomu (i zbiorczą) oraz postęp gracza
+    read_cache.invalidate(("scores", difficulty), ("scores", ""), ("progress", player_name))
+    stats_snapshot.add({**payload, "id": result.get("id"), "playedAt": result.get("playedAt")})
+    
+    return {
+        "id": result.get("id"),
+        "player_name": player_name,
+        "difficulty": difficulty,
+        "time_seconds": time_seconds,
+    }
+
+
+def _format_submit(result: SubmitResult) -> str:
+    return (
+        f"✅ Wynik zapisany!\n🎮 {result['player_name']}: {result['time_seconds']}s "
+        f"({result['difficulty']})\n📊 ID: {result['id'] if result['id'] is not None else 'N/A'}"
+    )
+
 
 @mcp.tool()
-async def submit_score(player_name: str, difficulty: str, time_seconds: int) -> str:
+async def submit_score(player_name: str, difficulty: str, time_seconds: int, output_format: str = "text") -> str:
     """📝 Wyślij nowy wynik do gry Saper
     
     Args:
         player_name: Nazwa gracza (2-50 znaków)
         difficulty: Poziom trudności (easy, medium, hard)
         time_seconds: Czas gry w sekundach (1-9999)
+        output_format: "text" (potwierdzenie) lub "json" (SubmitResult)
     
     Returns:
         Potwierdzenie zapisu lub błąd
     """
     try:
-        # Walidacja
-        if not (2 <= len(player_name) <= 50):
-            return "❌ Nazwa gracza musi mieć 2-50 znaków"
+        error = _validate_score(player_name, difficulty, time_seconds)
+        if error:
+            return _error(error, output_format)
         
-        if difficulty not in ["easy", "medium", "hard"]:
-            return "❌ Poziom musi być: easy, medium lub hard"
-            
-        if not (1 <= time_seconds <= 9999):
-            return "❌ Czas musi być w zakresie 1-9999 sekund"
-        
-        payload = {
-            "playerName": player_name,
-            "difficulty": difficulty,
-            "timeSeconds": time_seconds
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f"{API_BASE}/scores", json=payload)
-            response.raise_for_status()
-            result = response.json()
-            
-            return f"✅ Wynik zapisany!\n🎮 {player_name}: {time_seconds}s ({difficulty})\n📊 ID: {result.get('id', 'N/A')}"
+        return _respond(await _post_score(player_name, difficulty, time_seconds), output_format, _format_submit)
             
     except httpx.HTTPStatusError as e:
-        return f"❌ Błąd HTTP {e.response.status_code}: {e.response.text}"
+        return _error(f"Błąd HTTP {e.response.status_code}: {e.response.text}", output_format)
     except Exception as e:
-        return f"❌ Błąd: {e}"
+        return _error(f"Błąd: {e}", output_format)
+
+
+MAX_BULK_SCORES = 10000
+
+
+def _validate_record(record) -> Optional[str]:
+    """Walidacja pojedynczego rekordu partii - te same reguły co w submit_score"""
+    if not isinstance(record, dict):
+        return "Rekord musi być obiektem {player_name, difficulty, time_seconds}"
+    missing = [field for field in ("player_name", "difficulty", "time_seconds") if field not in record]
+    if missing:
+        return f"Brak pól: {', '.join(missing)}"
+    if not isinstance(record["player_name"], str) or not isinstance(record["difficulty"], str):
+        return "player_name i difficulty muszą być tekstem"
+    if not isinstance(record["time_seconds"], int) or isinstance(record["time_seconds"], bool):
+        return "time_seconds musi być liczbą całkowitą"
+    return _validate_score(record["player_name"], record["difficulty"], record["time_seconds"])
+
+
+async def _post_scores(records: List[Dict], max_concurrency: int) -> BulkSubmitResult:
+    # Walidacja całej partii w jednym przebiegu - niepoprawne rekordy nie trafiają do API
+    results: List[SubmitItem] = []
+    valid = []
+    for index, record in enumerate(records):
+        error = _validate_record(record)
+        if error:
+            results.append({"index": index, "status": "error", "error": error})
+        else:
+            item: SubmitItem = {"index": index, "status": "pending"}
+            results.append(item)
+            valid.append((item, record))
+    
+    semaphore = asyncio.Semaphore(max(1, min(max_concurrency, 50)))
+    
+    async def post_one(item: SubmitItem, record: Dict) -> None:
+        async with semaphore:
+            try:
+                submitted = await _post_score(record["player_name"], record["difficulty"], record["time_seconds"])
+            except httpx.HTTPStatusError as e:
+                item.update(status="error", error=f"Błąd HTTP {e.response.status_code}: {e.response.text}")
+                return
+            except Exception as e:
+                item.update(status="error", error=f"Błąd: {e}")
+                return
+        item.update(status="success", id=submitted["id"])
+    
+    await asyncio.gather(*(post_one(item, record) for item, record in valid))
+    succeeded = sum(1 for item in results if item["status"] == "success")
+    return {
+        "requested": len(records),
+        "succeeded": succeeded,
+        "failed": len(records) - succeeded,
+        "results": results,
+    }
+
+
+def _format_bulk_submit(result: BulkSubmitResult) -> str:
+    text = f"✅ Zapisano {result['succeeded']}/{result['requested']} wyników\n"
+    failures = [item for item in result["results"] if item["status"] != "success"]
+    if failures:
+        text += f"\n❌ Błędy ({len(failures)}):\n"
+        for item in failures:
+            text += f"  #{item['index']}: {item['error']}\n"
+    return text
+
+
+@mcp.tool()
+async def submit_scores(scores: List[Dict], max_concurrency: int = 10, output_format: str = "text") -> str:
+    """📦 Wyślij wiele wyników w jednym wywołaniu (turnieje, import logów)
+    
+    Args:
+        scores: Lista rekordów {"player_name", "difficulty", "time_seconds"} (maks. 10000)
+        max_concurrency: Maksymalna liczba równoległych zapisów do API (1-50)
+        output_format: "text" (podsumowanie) lub "json" (BulkSubmitResult)
+    
+    Returns:
+        Wynik dla każdego rekordu (ID zapisu albo błąd) - błędy nie przerywają partii
+    """
+    if len(scores) > MAX_BULK_SCORES:
+        return _error(f"Maksymalnie {MAX_BULK_SCORES} wyników w jednym wywołaniu", output_format)
+    
+    result = await _post_scores(scores, max_concurrency)
+    return _respond(result, output_format, _format_bulk_submit)
+
 
 @mcp.tool()
-async def get_player_progress(player_name: str) -> str:
+async def invalidate_cache(difficulties: Optional[List[str]] = None, player_names: Optional[List[str]] = None) -> str:
+    """🧹 Unieważnij odczyty zmienione przez zapis obsłużony przez inny serwer floty
+    
+    Wywoływane przez `MCPWorkerPool.broadcast` po każdym zapisie - bez tego pozostałe
+    workery zwracałyby z cache tablice wyników i postęp sprzed zapisu.
+    
+    Args:
+        difficulties: Poziomy, na których zapisano wyniki (tablica zbiorcza - zawsze)
+        player_names: Gracze, których postęp się zmienił
+    
+    Returns:
+        JSON: {"invalidated": liczba kluczy}
+    """
+    keys = [("scores", ""), *(("scores", d) for d in difficulties or []),
+            *(("progress", p) for p in player_names or [])]
+    read_cache.invalidate(*keys)
+    # Nowe wyniki z API trafią do statystyk w tle, bez czekania na STATS_TTL
+    if stats_snapshot.ready:
+        stats_snapshot.refresh()
+    return json.dumps({"invalidated": len(keys)})
+
+
+async def _fetch_player_progress(player_name: str) -> PlayerProgressResult:
+    key = ("progress", player_name)
+    cached = read_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    generation = read_cache.generation
+    # Postęp i nagrody gracza - oba żądania równolegle
+    progress, rewards = await asyncio.gather(
+        _get_json(f"/progress/{player_name}"),
+        _get_json(f"/progress/{player_name}/rewards"),
+    )
+    
+    result: PlayerProgressResult = {
+        "player_name": player_name,
+        "easy_completed": bool(progress.get("easyCompleted")),
+        "medium_completed": bool(progress.get("mediumCompleted")),
+        "hard_completed": bool(progress.get("hardCompleted")),
+        "current_texture": progress.get("currentTexture", "brak"),
+        "rewards": [
+            {
+                "name": reward.get("name", "Nieznana"),
+                "texture": reward.get("texture"),
+                "required_difficulty": reward.get("requiredDifficulty"),
+                "is_unlocked": bool(reward.get("isUnlocked")),
+            }
+            for reward in rewards
+        ],
+    }
+    read_cache.set(key, result, generation=generation)
+    return result
+
+
+def _format_player_progress(result: PlayerProgressResult) -> str:
+    text = f"🎯 Postęp gracza: {result['player_name']}\n\n"
+    text += f"📈 Ukończone poziomy:\n"
+    text += f"  🟢 Łatwy: {'✅' if result['easy_completed'] else '❌'}\n"
+    text += f"  🟡 Średni: {'✅' if result['medium_completed'] else '❌'}\n"
+    text += f"  🔴 Trudny: {'✅' if result['hard_completed'] else '❌'}\n\n"
+    
+    text += f"🎨 Aktualna tekstura: {result['current_texture']}\n\n"
+    
+    text += f"🏆 Odblokowane nagrody:\n"
+    for reward in result["rewards"]:
+        status = "🔓" if reward["is_unlocked"] else "🔒"
+        text += f"  {status} {reward['name']}\n"
+    
+    return text
+
+
+@mcp.tool()
+async def get_player_progress(player_name: str, output_format: str = "text") -> str:
     """🎯 Pobierz postęp gracza i odblokowane nagrody
     
     Args:
         player_name: Nazwa gracza
+        output_format: "text" (opis) lub "json" (PlayerProgressResult)
     
     Returns:
         Szczegółowy postęp gracza i status nagród
     """
     try:
         if not (2 <= len(player_name) <= 50):
-            return "❌ Nazwa gracza musi mieć 2-50 znaków"
+            return _error("Nazwa gracza musi mieć 2-50 znaków", output_format)
         
-        async with httpx.AsyncClient() as client:
-            # Postęp gracza
-            progress_response = await client.get(f"{API_BASE}/progress/{player_name}")
-            progress_response.raise_for_status()
-            progress = progress_response.json()
-            
-            # Nagrody gracza
-            rewards_response = await client.get(f"{API_BASE}/progress/{player_name}/rewards")
-            rewards_response.raise_for_status()
-            rewards = rewards_response.json()
-            
-            # Formatowanie odpowiedzi
-            result = f"🎯 Postęp gracza: {player_name}\n\n"
-            result += f"📈 Ukończone poziomy:\n"
-            result += f"  🟢 Łatwy: {'✅' if progress.get('easyCompleted') else '❌'}\n"
-            result += f"  🟡 Średni: {'✅' if progress.get('mediumCompleted') else '❌'}\n"
-            result += f"  🔴 Trudny: {'✅' if progress.get('hardCompleted') else '❌'}\n\n"
-            
-            result += f"🎨 Aktualna tekstura: {progress.get('currentTexture', 'brak')}\n\n"
-            
-            result += f"🏆 Odblokowane nagrody:\n"
-            for reward in rewards:
-                status = "🔓" if reward.get('isUnlocked') else "🔒"
-                result += f"  {status} {reward.get('name', 'Nieznana')}\n"
-            
-            return result
-            
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 404:
-            return f"❌ Gracz '{player_name}' nie został znaleziony"
-        return f"❌ Błąd HTTP {e.response.status_code}"
+        return _respond(await _fetch_player_progress(player_name), output_format, _format_player_progress)
+        
+    except Exception as e:
+        return _error(_progress_error_message(player_name, e), output_format)
+
+
+def _progress_error_message(player_name: str, error: Exception) -> str:
+    if isinstance(error, httpx.HTTPStatusError):
+        if error.response.status_code == 404:
+            return f"Gracz '{player_name}' nie został znaleziony"
+        return f"Błąd HTTP {error.response.status_code}"
+    return f"Błąd: {error}"
+
+
+MAX_BATCH_PLAYERS = 1000
+
+
+async def _fetch_players_progress(player_names: List[str], max_concurrency: int) -> PlayersProgressResult:
+    semaphore = asyncio.Semaphore(max(1, min(max_concurrency, 50)))
+    
+    async def fetch_one(player_name: str) -> PlayerProgressItem:
+        if not (2 <= len(player_name) <= 50):
+            return {"player_name": player_name, "status": "error", "error": "Nazwa gracza musi mieć 2-50 znaków"}
+        async with semaphore:
+            try:
+                progress = await _fetch_player_progress(player_name)
+            except Exception as e:
+                return {"player_name": player_name, "status": "error",
+                        "error": _progress_error_message(player_name, e)}
+        return {"player_name": player_name, "status": "success", "progress": progress}
+    
+    players = await asyncio.gather(*(fetch_one(name) for name in player_names))
+    succeeded = sum(1 for item in players if item["status"] == "success")
+    return {
+        "requested": len(player_names),
+        "succeeded": succeeded,
+        "failed": len(players) - succeeded,
+        "players": players,
+    }
+
+
+def _format_players_progress(result: PlayersProgressResult) -> str:
+    text = f"🎯 Postęp {result['succeeded']}/{result['requested']} graczy\n\n"
+    for item in result["players"]:
+        if item["status"] != "success":
+            text += f"❌ {item['player_name']}: {item['error']}\n"
+            continue
+        progress = item["progress"]
+        levels = "".join(
+            "✅" if progress[f"{difficulty}_completed"] else "❌" for difficulty in DIFFICULTIES
+        )
+        text += f"🎮 {item['player_name']}: {levels} 🎨 {progress['current_texture']}\n"
+    return text
+
+
+@mcp.tool()
+async def get_players_progress(player_names: List[str], max_concurrency: int = 10,
+                               output_format: str = "text") -> str:
+    """👥 Pobierz postęp wielu graczy w jednym wywołaniu
+    
+    Args:
+        player_names: Lista nazw graczy (maks. 1000)
+        max_concurrency: Maksymalna liczba równoległych zapytań do API (1-50)
+        output_format: "text" (zestawienie) lub "json" (PlayersProgressResult)
+    
+    Returns:
+        Postęp każdego gracza; błędy zwracane per gracz, bez przerywania całej partii
+    """
+    if len(player_names) > MAX_BATCH_PLAYERS:
+        return _error(f"Maksymalnie {MAX_BATCH_PLAYERS} graczy w jednym wywołaniu", output_format)
+    
+    result = await _fetch_players_progress(player_names, max_concurrency)
+    return _respond(result, output_format, _format_players_progress)
+
+
+async def _compare_players(player_names: List[str]) -> PlayersComparison:
+    await _score_store()
+    index = stats_snapshot.players
+    
+    # Jedno wyszukanie w indeksie na gracza - bez przeglądania wyników
+    players: List[PlayerSummary] = []
+    for player_name in dict.fromkeys(player_names):
+        summary = index.summary(player_name)
+        if summary is None:
+            players.append({"player_name": player_name, "found": False, "total_attempts": 0,
+                            "levels": {difficulty: None for difficulty in DIFFICULTIES}})
+        else:
+            players.append({**summary, "found": True})
+    
+    leaders = {}
+    for difficulty in DIFFICULTIES:
+        ranked = [p for p in players if p["levels"][difficulty] is not None]
+        leaders[difficulty] = (
+            min(ranked, key=lambda p: p["levels"][difficulty]["best_time"])["player_name"] if ranked else None
+        )
+    
+    return {
+        "requested": len(players),
+        "found": sum(1 for p in players if p["found"]),
+        "players": players,
+        "leaders": leaders,
+    }
+
+
+TREND_LABELS = {
+    "improving": "📉 coraz szybciej",
+    "declining": "📈 coraz wolniej",
+    "stable": "➡️ stabilnie",
+    "n/a": "—",
+}
+
+
+def _format_players_comparison(result: PlayersComparison) -> str:
+    text = f"⚖️ Porównanie {result['requested']} graczy\n"
+    for difficulty in DIFFICULTIES:
+        text += f"\n{LEVEL_LABELS[difficulty]}\n"
+        for player in result["players"]:
+            level = player["levels"][difficulty]
+            if level is None:
+                text += f"  {player['player_name']}: brak wyników\n"
+                continue
+            crown = " 👑" if result["leaders"][difficulty] == player["player_name"] else ""
+            text += (
+                f"  {player['player_name']}{crown}: najlepszy {level['best_time']}s, "
+                f"średnio {level['avg_time']:.0f}s, prób {level['attempts']}, "
+                f"lepszy od {level['percentile_rank']:.1f}% graczy, {TREND_LABELS[level['trend']]}\n"
+            )
+    missing = [p["player_name"] for p in result["players"] if not p["found"]]
+    if missing:
+        text += f"\n❓ Brak wyników: {', '.join(missing)}\n"
+    return text
+
+
+@mcp.tool()
+async def compare_players(player_names: List[str], output_format: str = "text") -> str:
+    """⚖️ Porównaj graczy: najlepszy czas, liczba prób, trend i percentyl na każdym poziomie
+    
+    Args:
+        player_names: Lista nazw graczy (2-1000), np. cała drużyna
+        output_format: "text" (zestawienie) lub "json" (PlayersComparison)
+    
+    Returns:
+        Profil każdego gracza z indeksu wyników oraz lidera każdego poziomu
+    """
+    if not (2 <= len(player_names) <= MAX_BATCH_PLAYERS):
+        return _error(f"Podaj od 2 do {MAX_BATCH_PLAYERS} graczy", output_format)
+    
+    try:
+        return _respond(await _compare_players(player_names), output_format, _format_players_comparison)
     except Exception as e:
-        return f"❌ Błąd: {e}"
+        return _error(f"Błąd porównania graczy: {e}", output_format)
+
+
+MAX_RANK_NEIGHBOURS = 10
+
+
+async def _fetch_player_rank(player_name: str, difficulty: str, neighbours: int) -> Optional[PlayerRankResult]:
+    await _score_store()
+    neighbours = max(0, min(neighbours, MAX_RANK_NEIGHBOURS))
+    return stats_snapshot.players.rank(player_name, difficulty, neighbours)
+
+
+def _format_player_rank(result: PlayerRankResult) -> str:
+    text = (
+        f"🏅 {result['player_name']} - {LEVEL_LABELS[result['difficulty']]}\n"
+        f"📊 Miejsce {result['rank']} z {result['players']} (najlepszy czas {result['best_time']}s, "
+        f"lepszy od {result['percentile_rank']:.1f}% graczy)\n\n"
+    )
+    for entry in result["neighbours"]:
+        marker = "👉" if entry["is_player"] else "  "
+        text += f"{marker} {entry['rank']:>6}. {entry['player_name']} - {entry['best_time']}s\n"
+    return text
+
+
+@mcp.tool()
+async def get_player_rank(player_name: str, difficulty: str, neighbours: int = 2,
+                          output_format: str = "text") -> str:
+    """🏅 Sprawdź miejsce gracza w rankingu poziomu (po najlepszym czasie)
+    
+    Args:
+        player_name: Nazwa gracza
+        difficulty: Poziom trudności (easy, medium, hard)
+        neighbours: Liczba sąsiednich graczy powyżej i poniżej (0-10)
+        output_format: "text" (opis) lub "json" (PlayerRankResult)
+    
+    Returns:
+        Ranga, percentyl i sąsiedzi w rankingu - z indeksu, w O(log n)
+    """
+    if difficulty not in DIFFICULTIES:
+        return _error("Poziom musi być: easy, medium lub hard", output_format)
+    
+    try:
+        result = await _fetch_player_rank(player_name, difficulty, neighbours)
+    except Exception as e:
+        return _error(f"Błąd pobierania rankingu: {e}", output_format)
+    
+    if result is None:
+        return _error(f"Gracz {player_name} nie ma wyników na poziomie {difficulty}", output_format)
+    return _respond(result, output_format, _format_player_rank)
+
+
+MAX_SEARCH_RESULTS = 50
+
+
+def _player_match(index, player_name: str, difficulty: str) -> PlayerMatch:
+    levels = index.players[player_name]
+    stats = [levels[difficulty]] if difficulty else list(levels.values())
+    return {
+        "player_name": player_name,
+        "attempts": sum(s.attempts for s in stats),
+        "best_time": min((s.best_time for s in stats), default=None),
+    }
+
+
+async def _search_players(prefix: str, limit: int, rank_by: str, difficulty: str) -> PlayerSearchResult:
+    await _score_store()
+    index = stats_snapshot.players
+    names = index.search.search(prefix, max(1, min(limit, MAX_SEARCH_RESULTS)), rank_by, difficulty)
+    return {
+        "prefix": prefix,
+        "rank_by": rank_by,
+        "difficulty": difficulty or None,
+        "count": len(names),
+        "players": [_player_match(index, name, difficulty) for name in names],
+    }
+
+
+def _format_player_search(result: PlayerSearchResult) -> str:
+    if not result["count"]:
+        return f"🔍 Brak graczy pasujących do '{result['prefix']}'"
+    
+    text = f"🔍 Gracze pasujący do '{result['prefix']}':\n\n"
+    for match in result["players"]:
+        text += f"🎮 {match['player_name']} - prób: {match['attempts']}, najlepszy czas: {match['best_time']}s\n"
+    return text
+
+
+@mcp.tool()
+async def search_players(prefix: str, limit: int = 10, rank_by: str = "activity", difficulty: str = "",
+                         output_format: str = "text") -> str:
+    """🔍 Znajdź graczy po początku nazwy (bez rozróżniania wielkości liter)
+    
+    Args:
+        prefix: Początek nazwy gracza
+        limit: Liczba podpowiedzi (1-50)
+        rank_by: "activity" (najwięcej prób) lub "best_time" (najlepszy czas)
+        difficulty: Poziom trudności (easy, medium, hard) lub puste dla wszystkich
+        output_format: "text" (lista) lub "json" (PlayerSearchResult)
+    
+    Returns:
+        Pasujący gracze, najlepsi według rank_by
+    """
+    if rank_by not in ("activity", "best_time"):
+        return _error("rank_by musi być: activity lub best_time", output_format)
+    if difficulty and difficulty not in DIFFICULTIES:
+        return _error("Poziom musi być: easy, medium lub hard", output_format)
+    
+    try:
+        return _respond(await _search_players(prefix, limit, rank_by, difficulty), output_format,
+                        _format_player_search)
+    except Exception as e:
+        return _error(f"Błąd wyszukiwania graczy: {e}", output_format)
+
 
 @mcp.resource("mcp://api-docs")
 async def get_api_docs() -> str:
@@ -153,6 +1089,8 @@ async def get_api_docs() -> str:
 
 ### 🏆 Scores (Wyniki)
 GET  /api/scores?difficulty={easy|medium|hard}&limit={1-100}
+GET  /api/scores/page?difficulty={easy|medium|hard}&afterTime={s}&afterId={id}&limit={1-1000}
+     Stronicowanie keyset: kolejna strona od (timeSeconds, id) ostatniego wyniku
 POST /api/scores
      Content-Type: application/json
      {
@@ -180,38 +1118,165 @@ GET /api/progress/{playerName}/rewards
 - 🥇 Złota tekstura: Ukończ poziom trudny
 
 Aktywna tekstura to najwyższa odblokowana.
+
+## 📊 Zasoby MCP
+
+- mcp://game-stats - statystyki wszystkich wyników
+- mcp://leaderboard-analytics - percentyle p50/p90/p99 i histogramy czasów per poziom
+- mcp://report/{day|week|month|all} - statystyki i analiza za okres (okna kroczące, JSON)
 """
 
-@mcp.resource("mcp://game-stats")
-async def get_game_stats() -> str:
-    """📊 Statystyki gry w czasie rzeczywistym"""
-    try:
-        async with httpx.AsyncClient() as client:
-            # Pobierz wszystkie wyniki (max 100 - limit API)
-            response = await client.get(f"{API_BASE}/scores?limit=100")
-            response.raise_for_status()
-            scores = response.json()
-            
-            if not scores:
-                return "📊 Brak danych - nie ma jeszcze żadnych wyników"
-            
-            # Analiza statystyk
-            total_games = len(scores)
-            easy_games = len([s for s in scores if s['difficulty'] == 'easy'])
-            medium_games = len([s for s in scores if s['difficulty'] == 'medium'])
-            hard_games = len([s for s in scores if s['difficulty'] == 'hard'])
-            
-            unique_players = len(set(s['playerName'] for s in scores))
-            
-            # Najlepsze czasy
-            best_easy = min([s['timeSeconds'] for s in scores if s['difficulty'] == 'easy'], default=0)
-            best_medium = min([s['timeSeconds'] for s in scores if s['difficulty'] == 'medium'], default=0)
-            best_hard = min([s['timeSeconds'] for s in scores if s['difficulty'] == 'hard'], default=0)
-            
-            stats = f"""📊 Statystyki gry Saper
+API_DOCS = {
+    "endpoints": [
+        {"method": "GET", "path": "/api/scores", "query": {"difficulty": "easy|medium|hard", "limit": "1-100"}},
+        {"method": "GET", "path": "/api/scores/page",
+         "query": {"difficulty": "easy|medium|hard", "afterTime": "int", "afterId": "int", "limit": "1-1000"}},
+        {"method": "POST", "path": "/api/scores",
+         "body": {"playerName": "string (2-50)", "difficulty": "easy|medium|hard", "timeSeconds": "1-9999"}},
+        {"method": "GET", "path": "/api/progress/{playerName}"},
+        {"method": "GET", "path": "/api/progress/{playerName}/rewards"},
+    ],
+    "difficulties": {
+        "easy": {"size": "9x9", "mines": 10, "time_limit_minutes": 10},
+        "medium": {"size": "16x16", "mines": 40, "time_limit_minutes": 40},
+        "hard": {"size": "16x30", "mines": 99, "time_limit_minutes": 99},
+    },
+    "rewards": {"easy": "bronze", "medium": "silver", "hard": "gold"},
+}
+
+
+@mcp.resource("mcp://api-docs/json", mime_type="application/json")
+async def get_api_docs_json() -> str:
+    """📖 Dokumentacja API gry Saper (JSON)"""
+    return json.dumps(API_DOCS, ensure_ascii=False)
+
+
+async def _iter_new_scores(after_id: int, page_size: int = SCAN_PAGE_SIZE) -> AsyncIterator[List[Dict]]:
+    """Przejdź stronami GET /scores/since po wynikach zapisanych po wyniku `after_id` (rosnąco po Id)"""
+    limit = max(1, min(page_size, 1000))
+    
+    while True:
+        page = await _get_json("/scores/since", {"afterId": after_id, "limit": limit})
+        if page:
+            yield page
+        if len(page) < limit:
+            return
+        after_id = page[-1]["id"]
+
+
+class _StatsSnapshot:
+    """Wszystkie wyniki w magazynie kolumnowym, rollupach czasowych i indeksie graczy
+
+    Budowany raz, potem tylko uzupełniany: wyniki zapisane przez ten serwer trafiają
+    tu od razu (`add`), wyniki z innych workerów - przy odświeżeniu, które pobiera
+    z API wyłącznie wyniki z Id większym niż `last_id`. Wyniki dodane przez `add`
+    przed odświeżeniem (`_ahead`) nie są liczone drugi raz.
+    """
+    
+    def __init__(self):
+        self.store: Optional[ScoreStore] = None
+        self.rollups: Optional[TimeBucketedStats] = None
+        self.players: Optional[PlayerIndex] = None
+        self.last_id = 0
+        self.built_at = 0.0
+        self.refreshes = 0
+        self._ahead: set = set()
+        self._refresh: Optional[asyncio.Task] = None
+    
+    @property
+    def ready(self) -> bool:
+        return self.built_at > 0
+    
+    def age(self) -> float:
+        return time.monotonic() - self.built_at
+    
+    def _ensure(self) -> None:
+        if self.store is None:
+            self.store = ScoreStore(DIFFICULTIES)
+            self.rollups = TimeBucketedStats(unique=UNIQUE_PLAYERS_METHOD)
+            self.players = PlayerIndex(DIFFICULTIES)
+    
+    def _ingest(self, score: Dict) -> None:
+        """Dodaj wynik (format API) do magazynu i wszystkich indeksów"""
+        played_at = parse_played_at(score.get("playedAt"))
+        self.store.append_score(score, played_at)
+        self.players.add(score["playerName"], score["difficulty"], score["timeSeconds"], played_at)
+        if played_at is not None:
+            self.rollups.add(score["playerName"], score["difficulty"], score["timeSeconds"], played_at)
+    
+    def add(self, score: Dict) -> None:
+        """Wynik zapisany przez ten serwer - widoczny od razu, bez czekania na odświeżenie"""
+        score_id = score.get("id")
+        if self.store is None or score_id is None or score_id <= self.last_id or score_id in self._ahead:
+            return
+        self._ahead.add(score_id)
+        self._ingest(score)
+    
+    async def _pull(self) -> None:
+        self._ensure()
+        async for page in _iter_new_scores(self.last_id):
+            for score in page:
+                if score["id"] in self._ahead:
+                    self._ahead.discard(score["id"])
+                else:
+                    self._ingest(score)
+            self.last_id = page[-1]["id"]
+        self.built_at = time.monotonic()
+        self.refreshes += 1
+    
+    def refresh(self) -> "asyncio.Task":
+        """Odświeżenie w tle (jedno naraz); anulowanie oczekującego nie przerywa pobierania"""
+        if self._refresh is None or self._refresh.done():
+            # Czysty kontekst - termin żądania, które zleciło odświeżenie, go nie dotyczy
+            self._refresh = asyncio.create_task(self._pull(), context=contextvars.Context())
+            self._refresh.add_done_callback(self._log_failure)
+        return self._refresh
+    
+    @staticmethod
+    def _log_failure(task: "asyncio.Task") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("⚠️  Game stats refresh failed: %s", task.exception())
+    
+    async def close(self) -> None:
+        if self._refresh is not None and not self._refresh.done():
+            self._refresh.cancel()
+            await asyncio.gather(self._refresh, return_exceptions=True)
+
+
+stats_snapshot = _StatsSnapshot()
+
+
+async def _score_store(max_age: Optional[float] = None) -> ScoreStore:
+    """Magazyn wyników; pełny przegląd tylko przy pierwszym użyciu
+    
+    Po STATS_TTL sekundach odczyt zleca odświeżenie w tle i od razu dostaje dotychczasowe
+    wyniki. `max_age` wymusza poczekanie na nowe wyniki, jeśli migawka jest starsza.
+    """
+    if not stats_snapshot.ready or (max_age is not None and stats_snapshot.age() >= max_age):
+        await asyncio.shield(stats_snapshot.refresh())
+    elif stats_snapshot.age() >= STATS_TTL:
+        stats_snapshot.refresh()
+    return stats_snapshot.store
+
+
+async def _fetch_game_stats() -> GameStats:
+    return (await _score_store()).stats()
+
+
+def _format_game_stats(stats: GameStats) -> str:
+    total_games = stats["total_games"]
+    if not total_games:
+        return "📊 Brak danych - nie ma jeszcze żadnych wyników"
+    
+    easy_games = stats["distribution"]["easy"]
+    medium_games = stats["distribution"]["medium"]
+    hard_games = stats["distribution"]["hard"]
+    best = {difficulty: time or 0 for difficulty, time in stats["best_times"].items()}
+    
+    return f"""📊 Statystyki gry Saper
 
 🎮 Rozegranych gier: {total_games}
-👥 Unikalnych graczy: {unique_players}
+👥 Unikalnych graczy: {stats['unique_players']}
 
 📈 Gry według poziomu:
   🟢 Łatwy:  {easy_games} ({easy_games/total_games*100:.1f}%)
@@ -219,19 +1284,183 @@ async def get_game_stats() -> str:
   🔴 Trudny: {hard_games} ({hard_games/total_games*100:.1f}%)
 
 🏆 Najlepsze czasy:
-  🟢 Łatwy:  {best_easy}s
-  🟡 Średni: {best_medium}s  
-  🔴 Trudny: {best_hard}s
+  🟢 Łatwy:  {best['easy']}s
+  🟡 Średni: {best['medium']}s  
+  🔴 Trudny: {best['hard']}s
 
-📊 Średnia gier na gracza: {total_games/unique_players:.1f}
+📊 Średnia gier na gracza: {stats['avg_games_per_player']:.1f}
 """
-            return stats
-            
+
+
+@mcp.resource("mcp://game-stats")
+async def get_game_stats() -> str:
+    """📊 Statystyki gry w czasie rzeczywistym"""
+    try:
+        return _format_game_stats(await _fetch_game_stats())
     except Exception as e:
         return f"❌ Błąd pobierania statystyk: {e}"
 
+
+@mcp.resource("mcp://game-stats/json", mime_type="application/json")
+async def get_game_stats_json() -> str:
+    """📊 Statystyki gry w czasie rzeczywistym (JSON: GameStats)"""
+    try:
+        return _respond(await _fetch_game_stats(), "json", _format_game_stats)
+    except Exception as e:
+        return _error(f"Błąd pobierania statystyk: {e}", "json")
+
+
+async def _fetch_leaderboard_analytics() -> LeaderboardAnalytics:
+    # Wektorowo na kolumnach magazynu (bez NumPy: szkice KLL w jednym przebiegu)
+    return (await _score_store()).analytics()
+
+
+LEVEL_LABELS = {"easy": "🟢 Łatwy", "medium": "🟡 Średni", "hard": "🔴 Trudny"}
+
+
+def _format_leaderboard_analytics(analytics: LeaderboardAnalytics) -> str:
+    if not analytics["total_games"]:
+        return "📊 Brak danych - nie ma jeszcze żadnych wyników"
+    
+    lines = ["📊 Analiza czasów ukończenia", ""]
+    for difficulty, level in analytics["levels"].items():
+        label = LEVEL_LABELS.get(difficulty, difficulty)
+        if not level["count"]:
+            lines += [f"{label}: brak wyników", ""]
+            continue
+        
+        percentiles = ", ".join(f"{name}={value}s" for name, value in level["percentiles"].items())
+        lines.append(f"{label} ({level['count']} gier, najlepszy {level['best_time']}s)")
+        lines.append(f"  ⏱️  {percentiles}")
+        for entry in level["histogram"]:
+            share = entry["count"] / level["count"]
+            bucket = f"{entry['from']}-{entry['to']}s" if entry["to"] is not None else f"≥{entry['from']}s"
+            lines.append(f"  {bucket:>11} {'█' * round(share * 20):<20} {entry['count']} ({share*100:.1f}%)")
+        lines.append("")
+    
+    if analytics["most_popular"]:
+        popular = analytics["most_popular"]
+        lines.append(f"🔥 Najpopularniejszy poziom: {LEVEL_LABELS.get(popular, popular)}")
+    return "\n".join(lines)
+
+
+@mcp.resource("mcp://leaderboard-analytics")
+async def get_leaderboard_analytics() -> str:
+    """⏱️ Percentyle (p50/p90/p99) i histogramy czasów ukończenia per poziom"""
+    try:
+        return _format_leaderboard_analytics(await _fetch_leaderboard_analytics())
+    except Exception as e:
+        return f"❌ Błąd pobierania analizy wyników: {e}"
+
+
+@mcp.resource("mcp://leaderboard-analytics/json", mime_type="application/json")
+async def get_leaderboard_analytics_json() -> str:
+    """⏱️ Percentyle i histogramy czasów ukończenia (JSON: LeaderboardAnalytics)"""
+    try:
+        return _respond(await _fetch_leaderboard_analytics(), "json", _format_leaderboard_analytics)
+    except Exception as e:
+        return _error(f"Błąd pobierania analizy wyników: {e}", "json")
+
+
+async def _fetch_period_report(period: str) -> PeriodReport:
+    store = await _score_store()
+    if period == "all":
+        return {"period": period, "since": None, "stats": store.stats(), "analytics": store.analytics()}
+    
+    if period not in PERIODS:
+        raise ValueError(f"Nieznany okres '{period}' - dostępne: {', '.join([*PERIODS, 'all'])}")
+    
+    # Złączenie kilkudziesięciu kubełków zamiast przeglądu wszystkich wyników
+    now = datetime.now(timezone.utc)
+    window = stats_snapshot.rollups.window(PERIODS[period], now)
+    since = now.replace(minute=0, second=0, microsecond=0) - PERIODS[period] + timedelta(hours=1)
+    return {
+        "period": period,
+        "since": since.isoformat(),
+        "stats": window.result(),
+        "analytics": window.analytics(),
+    }
+
+
+@mcp.resource("mcp://report/{period}", mime_type="application/json")
+async def get_period_report(period: str) -> str:
+    """🗓️ Statystyki i analiza czasów za okres: day, week, month (okna kroczące) lub all (JSON: PeriodReport)"""
+    try:
+        return json.dumps(await _fetch_period_report(period), ensure_ascii=False)
+    except Exception as e:
+        return _error(f"Błąd generowania raportu: {e}", "json")
+
+
+async def _fetch_game_overview(limit: int) -> GameOverview:
+    # Jeden przegląd wyników (wspólny z mcp://game-stats) zamiast osobnego GET /scores;
+    # ranking nie może być starszy niż cache get_scores, więc migawka najwyżej CACHE_TTL sekund
+    store = await _score_store(max_age=CACHE_TTL)
+    entries = [_score_entry(score) for score in store.top(max(1, min(limit, 100)))]
+    scores: ScoresResult = {"difficulty": None, "count": len(entries), "scores": entries}
+    return {
+        "scores": scores,
+        "scores_text": _format_scores(scores),
+        "stats": store.stats(),
+    }
+
+
+def _format_game_overview(overview: GameOverview) -> str:
+    return _format_scores(overview["scores"]) + "\n" + _format_game_stats(overview["stats"])
+
+
+@mcp.tool()
+async def get_game_overview(limit: int = 5, output_format: str = "text") -> str:
+    """🧭 Najlepsze wyniki i statystyki gry w jednym wywołaniu
+    
+    Oba wyniki liczone są z tego samego przeglądu wyników (jak mcp://game-stats),
+    więc są ze sobą spójne, a API odpytywane jest raz. Ranking jest co najwyżej
+    tak nieaktualny jak get_scores (MINESWEEPER_CACHE_TTL).
+    
+    Args:
+        limit: Liczba najlepszych wyników (1-100)
+        output_format: "text" (ranking i statystyki) lub "json" (GameOverview)
+    
+    Returns:
+        Ranking najlepszych wyników i statystyki gry
+    """
+    try:
+        return _respond(await _fetch_game_overview(limit), output_format, _format_game_overview)
+            
+    except httpx.RequestError as e:
+        return _error(f"Błąd połączenia z API: {e}", output_format)
+    except Exception as e:
+        return _error(f"Błąd: {e}", output_format)
+
+
+@mcp.resource("mcp://metrics", mime_type="application/json")
+async def get_metrics() -> str:
+    """📈 Metryki serwera MCP
+
+    Cache odczytów, single-flight, ponowienia, circuit breaker, limit równoległości
+    i przeglądy statystyk.
+    """
+    return json.dumps({
+        "cache": read_cache.stats(),
+        "single_flight": get_flights.stats(),
+        "upstream": upstream.stats(),
+        "game_stats": {
+            "refreshes": stats_snapshot.refreshes,
+            "last_id": stats_snapshot.last_id,
+            "age_seconds": stats_snapshot.age() if stats_snapshot.ready else None,
+            "ttl_seconds": STATS_TTL,
+            "unique_players_method": UNIQUE_PLAYERS_METHOD,
+            "scores": len(stats_snapshot.store) if stats_snapshot.store else 0,
+            "store_bytes": stats_snapshot.store.nbytes() if stats_snapshot.store else 0,
+            "vectorized": stats_snapshot.store.vectorized if stats_snapshot.store else None,
+            "indexed_players": len(stats_snapshot.players) if stats_snapshot.players else 0,
+            "hour_buckets": len(stats_snapshot.rollups.hours) if stats_snapshot.rollups else 0,
+            "day_buckets": len(stats_snapshot.rollups.days) if stats_snapshot.rollups else 0,
+            "window_cache": stats_snapshot.rollups.window_cache.stats() if stats_snapshot.rollups else None,
+        },
+    })
+
 if __name__ == "__main__":
     print("🚀 MCP Server dla MinesweeperAPI")
     print(f"📡 API endpoint: {API_BASE}")
     print("🔧 Uruchamiam serwer...")
-    mcp.run()
\ No newline at end of file
+    mcp.run()
@@ -57,10 +57,8 @@ async def test_data_agent():
     # 1. Analiza statystyk
     print("\n📈 2.1 Analiza statystyk gry:")
     result = await data_agent.analyze()
-    print("\nSurowe statystyki (pierwsze 300 znaków):")
-    print(result['raw_stats'][:300] + "...")
     
-    print("\n📊 Sparsowane dane:")
+    print("\n📊 Statystyki (GameStats):")
     print(json.dumps(result['parsed'], indent=2, ensure_ascii=False))
     
     # 2. Generuj raport
@@ -0,0 +1,6 @@
+"""Testy agentów i serwera MCP - uruchamiane z katalogu głównego: python -m pytest tests"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
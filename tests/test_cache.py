@@ -0,0 +1,167 @@
+"""TTLCache i ResultCache orchestratora - inwalidacja w trakcie pobierania"""
+
+import asyncio
+
+from agents.cache import ResultCache, TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Source:
+    """Źródło danych z wersją zmienianą przez "zapisy"; pobranie można wstrzymać"""
+
+    def __init__(self):
+        self.version = 0
+        self.loads = 0
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.started = asyncio.Event()
+
+    async def load(self):
+        self.loads += 1
+        version = self.version
+        self.started.set()
+        await self.gate.wait()
+        return {"status": "success", "version": version}
+
+
+def test_ttl_cache_expiry_lru_and_generation_guard():
+    clock = _Clock()
+    cache = TTLCache(max_entries=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1
+
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.set("a", "stale", generation=generation)
+    assert cache.get("a") is None
+
+    clock.now = 10
+    assert cache.get("c") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_fresh_hit_and_concurrent_misses_load_once():
+    async def scenario():
+        cache = ResultCache({"read": 5})
+        source = _Source()
+        source.gate.clear()
+        waiters = [asyncio.create_task(cache.get_or_load("read", "k", source.load)) for _ in range(10)]
+        await asyncio.sleep(0)
+        source.gate.set()
+        results = await asyncio.gather(*waiters)
+        return source.loads, results, await cache.get_or_load("read", "k", source.load), cache.stats()
+
+    loads, results, again, stats = asyncio.run(scenario())
+    assert loads == 1
+    assert all(result == {"status": "success", "version": 0} for result in results)
+    assert again == results[0]
+    assert stats["coalesced"] == 9 and stats["fresh_hits"] == 1
+
+
+def test_result_loaded_across_invalidation_is_not_cached():
+    async def scenario():
+        cache = ResultCache({"read": 5})
+        source = _Source()
+        source.gate.clear()
+        loading = asyncio.create_task(cache.get_or_load("read", "k", source.load))
+        await source.started.wait()
+        source.version = 1
+        cache.invalidate_all()
+        source.gate.set()
+        stale = await loading
+        return stale, await cache.get_or_load("read", "k", source.load)
+
+    stale, fresh = asyncio.run(scenario())
+    assert stale["version"] == 0
+    assert fresh["version"] == 1
+
+
+def test_miss_after_invalidation_does_not_join_older_load():
+    async def scenario():
+        cache = ResultCache({"read": 5})
+        source = _Source()
+        source.gate.clear()
+        before = asyncio.create_task(cache.get_or_load("read", "k", source.load))
+        await source.started.wait()
+        # Zapis kończy się, zanim pobranie sprzed zapisu zwróci wynik
+        source.version = 1
+        cache.invalidate_all()
+        after = asyncio.create_task(cache.get_or_load("read", "k", source.load))
+        await asyncio.sleep(0)
+        source.gate.set()
+        return await before, await after
+
+    before, after = asyncio.run(scenario())
+    assert before["version"] == 0
+    assert after["version"] == 1
+
+
+def test_stale_entry_is_served_while_one_revalidation_runs():
+    async def scenario():
+        clock = _Clock()
+        cache = ResultCache({"analytics": 10}, stale={"analytics": 60}, clock=clock)
+        source = _Source()
+        await cache.get_or_load("analytics", "k", source.load)
+        source.version = 1
+        clock.now = 15
+        source.gate.clear()
+        served = [await cache.get_or_load("analytics", "k", source.load) for _ in range(3)]
+        source.gate.set()
+        await asyncio.sleep(0.01)
+        refreshed = await cache.get_or_load("analytics", "k", source.load)
+        await cache.close()
+        return served, refreshed, source.loads, cache.stats()
+
+    served, refreshed, loads, stats = asyncio.run(scenario())
+    assert [result["version"] for result in served] == [0, 0, 0]
+    assert refreshed["version"] == 1
+    assert loads == 2
+    assert stats["revalidations"] == 1 and stats["stale_hits"] == 3
+
+
+def test_revalidation_racing_invalidation_is_discarded():
+    async def scenario():
+        clock = _Clock()
+        cache = ResultCache({"analytics": 10}, stale={"analytics": 60}, clock=clock)
+        source = _Source()
+        await cache.get_or_load("analytics", "k", source.load)
+        clock.now = 15
+        source.gate.clear()
+        source.started.clear()
+        await cache.get_or_load("analytics", "k", source.load)
+        await source.started.wait()
+        source.version = 1
+        cache.invalidate_all()
+        source.gate.set()
+        await asyncio.sleep(0.01)
+        return await cache.get_or_load("analytics", "k", source.load)
+
+    assert asyncio.run(scenario())["version"] == 1
+
+
+def test_uncacheable_results_and_disabled_kinds_always_load():
+    async def scenario():
+        cache = ResultCache({"read": 5}, cacheable=lambda result: result.get("status") == "success")
+        calls = 0
+
+        async def failing():
+            nonlocal calls
+            calls += 1
+            return {"status": "error"}
+
+        for _ in range(3):
+            await cache.get_or_load("read", "k", failing)
+            await cache.get_or_load("write", "w", failing)
+        return calls
+
+    assert asyncio.run(scenario()) == 6
@@ -0,0 +1,74 @@
+"""ScoreStore: ścieżka NumPy i ścieżka bez NumPy dają te same wyniki"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agents import columnar
+from agents.aggregates import DIFFICULTIES
+
+pytest.importorskip("numpy")
+
+NOW = datetime(2026, 1, 15, tzinfo=timezone.utc)
+
+
+def _rows(count: int = 3000, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        (index + 2, f"Player{rng.randint(1, 200)}", rng.choice(DIFFICULTIES + ["unknown"]),
+         rng.randint(5, 400), NOW - timedelta(minutes=rng.randint(0, 60 * 24 * 20)))
+        for index in range(count)
+    ]
+
+
+def _store(rows):
+    store = columnar.ScoreStore()
+    for row in rows:
+        store.append(*row)
+    return store
+
+
+@pytest.fixture
+def stores(monkeypatch):
+    rows = _rows()
+    vectorized = _store(rows)
+    monkeypatch.setattr(columnar, "np", None)
+    return vectorized, _store(rows)
+
+
+def test_stats_match_without_numpy(stores):
+    vectorized, plain = stores
+    assert plain.stats() == vectorized.stats()
+    assert plain.stats(difficulty="hard") == vectorized.stats(difficulty="hard")
+    since = NOW - timedelta(days=3)
+    assert plain.stats(since=since) == vectorized.stats(since=since)
+
+
+def test_unfiltered_stats_do_not_scan_rows(stores, monkeypatch):
+    _, plain = stores
+    monkeypatch.setattr(plain, "_rows", lambda **filters: pytest.fail("stats() przegląda wiersze"))
+    assert plain.stats()["total_games"] == 3000
+    assert plain.analytics()["total_games"] == 3000
+
+
+def test_analytics_match_without_numpy(stores):
+    vectorized, plain = stores
+    exact, sketched = vectorized.analytics(), plain.analytics()
+    assert sketched["most_popular"] == exact["most_popular"]
+    for difficulty in DIFFICULTIES:
+        ours, theirs = sketched["levels"][difficulty], exact["levels"][difficulty]
+        assert ours["count"] == theirs["count"]
+        assert ours["best_time"] == theirs["best_time"]
+        assert ours["histogram"] == theirs["histogram"]
+
+
+def test_top_matches_full_sort_with_ties_at_the_cutoff(stores):
+    vectorized, plain = stores
+    rows = sorted(_rows(), key=lambda row: (row[3], row[0]))
+    known = [row for row in rows if row[2] == "easy"]
+    for limit in (1, 5, 37, 100):
+        expected = [row[0] for row in rows[:limit]]
+        assert [score["id"] for score in vectorized.top(limit)] == expected
+        assert [score["id"] for score in plain.top(limit)] == expected
+        assert [score["id"] for score in vectorized.top(limit, difficulty="easy")] == [row[0] for row in known[:limit]]
@@ -0,0 +1,85 @@
+"""Drzewo Fenwicka i ranking graczy względem prostych implementacji na posortowanych listach"""
+
+import bisect
+import random
+
+from agents.indexes import FenwickTree, Leaderboard, PlayerIndex
+
+
+def test_fenwick_prefix_sum_and_find_match_list():
+    rng = random.Random(1)
+    size = 257
+    tree, counts = FenwickTree(size), [0] * size
+    for _ in range(3000):
+        index = rng.randrange(size)
+        delta = rng.choice([1, 1, 2, -1]) if counts[index] else rng.randint(1, 3)
+        tree.add(index, delta)
+        counts[index] += delta
+
+        probe = rng.randrange(-1, size + 5)
+        assert tree.prefix_sum(probe) == sum(counts[:max(0, probe + 1)])
+        assert tree.total == sum(counts)
+        if tree.total:
+            k = rng.randint(1, tree.total)
+            expected = next(i for i in range(size) if sum(counts[:i + 1]) >= k)
+            assert tree.find(k) == expected
+
+
+class _ReferenceBoard:
+    """Najlepsze czasy graczy w słowniku - ranga i percentyl liczone przeglądem"""
+
+    def __init__(self):
+        self.best = {}
+
+    def rank(self, time_seconds):
+        return 1 + sum(1 for best in self.best.values() if best < time_seconds)
+
+    def percentile_rank(self, time_seconds):
+        worse = sum(1 for best in self.best.values() if best > time_seconds)
+        return worse / len(self.best) * 100 if self.best else 0.0
+
+    def order(self):
+        return sorted(self.best, key=lambda name: (self.best[name], name))
+
+
+def test_leaderboard_matches_reference():
+    rng = random.Random(2)
+    board, reference = Leaderboard(max_time=600), _ReferenceBoard()
+    for _ in range(2000):
+        name = f"P{rng.randint(1, 150)}"
+        time_seconds = rng.randint(1, 600)
+        old = reference.best.get(name)
+        if old is None or time_seconds < old:
+            board.update(name, old, time_seconds)
+            reference.best[name] = time_seconds
+
+        probe = rng.randint(0, 600)
+        assert len(board) == len(reference.best)
+        assert board.rank(probe) == reference.rank(probe)
+        assert board.percentile_rank(probe) == reference.percentile_rank(probe)
+
+    order = reference.order()
+    for position, name in enumerate(order, 1):
+        assert board.position(name, reference.best[name]) == position
+        assert board.entry_at(position) == (name, reference.best[name])
+
+
+def test_player_index_rank_neighbours():
+    rng = random.Random(3)
+    index = PlayerIndex()
+    best = {}
+    for _ in range(1500):
+        name = f"P{rng.randint(1, 80)}"
+        time_seconds = rng.randint(10, 900)
+        index.add(name, "medium", time_seconds)
+        best[name] = min(best.get(name, time_seconds), time_seconds)
+
+    order = sorted(best, key=lambda name: (best[name], name))
+    times = sorted(best.values())
+    for name in rng.sample(order, 20):
+        result = index.rank(name, "medium", neighbours=2)
+        position = order.index(name) + 1
+        assert result["position"] == position
+        assert result["rank"] == bisect.bisect_left(times, best[name]) + 1
+        assert [n["player_name"] for n in result["neighbours"]] == order[max(0, position - 3):position + 2]
+    assert index.rank("Nobody", "medium") is None
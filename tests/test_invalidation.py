@@ -0,0 +1,40 @@
+"""Unieważnianie cache odczytów po zapisach obsłużonych przez inny worker floty"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+import mcp_server_minesweeper as server
+from benchmarks.stub_api import StubState, create_app
+
+
+@pytest.fixture
+def state(monkeypatch):
+    state = StubState(scores_count=50, players_count=10)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(state)))
+    monkeypatch.setattr(server, "_http_client", client)
+    monkeypatch.setattr(server, "stats_snapshot", server._StatsSnapshot())
+    server.read_cache.clear()
+    return state
+
+
+def test_invalidate_cache_drops_reads_written_elsewhere(state):
+    async def top(session):
+        result = await session.call_tool("get_scores", {"limit": 1, "output_format": "json"})
+        return json.loads(result.content[0].text)["scores"][0]["player_name"]
+
+    async def scenario():
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            before = await top(session)
+            # Zapis przez "inny worker": trafia do API z pominięciem tego serwera
+            state.add_score("Elsewhere", "easy", 1)
+            cached = await top(session)
+            await session.call_tool("invalidate_cache", {"difficulties": ["easy"], "player_names": ["Elsewhere"]})
+            return before, cached, await top(session)
+
+    before, cached, after = asyncio.run(scenario())
+    assert cached == before
+    assert after == "Elsewhere"
@@ -0,0 +1,111 @@
+"""Orchestrator na transporcie in-process ze stubem MinesweeperAPI"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+import mcp_server_minesweeper as server
+from agents.cache import ResultCache
+from agents.mcp_agent import InProcessPool
+from agents.orchestrator import OrchestratorAgent
+from benchmarks.stub_api import StubState, create_app
+
+
+@pytest.fixture
+def orchestrator(monkeypatch, tmp_path):
+    state = StubState(scores_count=200, players_count=20)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(state)))
+    monkeypatch.setattr(server, "_http_client", client)
+    monkeypatch.setattr(server, "stats_snapshot", server._StatsSnapshot())
+    server.read_cache.clear()
+    config = tmp_path / "agents.json"
+    config.write_text(json.dumps({
+        "orchestrator": {"timeout_seconds": 10, "result_cache": {"ttl_seconds": {}}},
+        "mcp_agent": {"transport": "inprocess"},
+    }))
+    orchestrator = OrchestratorAgent(str(config))
+    orchestrator.stub = state
+    return orchestrator
+
+
+def test_complex_request_keeps_the_two_agent_result_shape(orchestrator):
+    async def scenario():
+        try:
+            legacy = {
+                "status": "success",
+                "scores": await orchestrator.agents["game"].get_scores(limit=5),
+                "analytics": await orchestrator.agents["data"].analyze(),
+            }
+            return legacy, await orchestrator.process_request("Daj mi wszystko")
+        finally:
+            await orchestrator.close()
+
+    legacy, result = asyncio.run(scenario())
+    assert result == legacy
+
+
+def test_complex_request_is_as_fresh_as_get_scores(orchestrator, monkeypatch):
+    async def scenario():
+        try:
+            await orchestrator.process_request("Daj mi wszystko")
+            # Zapis przez inny worker - migawka statystyk go jeszcze nie zna
+            orchestrator.stub.add_score("Newcomer", "easy", 1)
+            monkeypatch.setattr(server, "CACHE_TTL", 0.0)
+            return await orchestrator.process_request("Daj mi wszystko")
+        finally:
+            await orchestrator.close()
+
+    result = asyncio.run(scenario())
+    assert "1. Newcomer - 1s (easy)" in result["scores"]["data"]
+    assert result["analytics"]["parsed"]["total_games"] == 201
+
+
+def test_shared_cache_load_is_not_bound_by_first_callers_deadline(orchestrator):
+    orchestrator.result_cache = ResultCache({"get_scores": 30}, cacheable=orchestrator._cacheable)
+    orchestrator.stub.latency_ms = 300
+
+    async def scenario():
+        try:
+            impatient = asyncio.create_task(orchestrator.process_request("Pokaż top 5 easy", timeout=0.1))
+            await asyncio.sleep(0)
+            patient = asyncio.create_task(orchestrator.process_request("Pokaż top 5 easy", timeout=5))
+            return await impatient, await patient
+        finally:
+            await orchestrator.close()
+
+    impatient, patient = asyncio.run(scenario())
+    assert impatient == {"status": "error", "error": "Request timed out after 0.1s"}
+    assert patient["status"] == "success"
+
+
+def test_concurrent_first_calls_start_in_process_transport_once(orchestrator, monkeypatch):
+    entered = []
+    lifespan = server.server_lifespan
+
+    @asynccontextmanager
+    async def counting_lifespan(mcp):
+        # Start serwera oddaje pętlę, zanim sesja jest gotowa
+        entered.append(mcp)
+        await asyncio.sleep(0)
+        async with lifespan(mcp) as context:
+            yield context
+
+    monkeypatch.setattr(server, "server_lifespan", counting_lifespan)
+
+    async def scenario():
+        pool = InProcessPool()
+        try:
+            async def call():
+                async with pool.session() as session:
+                    return await session.call_tool("get_scores", {"limit": 1})
+
+            return await asyncio.gather(*(call() for _ in range(5)))
+        finally:
+            await pool.close()
+
+    results = asyncio.run(scenario())
+    assert len(entered) == 1
+    assert all(not result.isError for result in results)
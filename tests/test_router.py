@@ -0,0 +1,101 @@
+"""IntentRouter a dotychczasowe listy słów kluczowych orchestratora (`_analyze_intent`)"""
+
+import random
+
+import pytest
+
+from agents.router import DEFAULT_LIMIT, IntentRouter, ScoreRecord
+
+# Listy i kolejność z `_analyze_intent` sprzed routera
+LEGACY_KEYWORDS = [
+    ('get_scores', ['wyniki', 'scores', 'top', 'ranking', 'najlepsi', 'pokaż']),
+    ('submit_score', ['dodaj', 'zapisz', 'submit', 'nowy wynik']),
+    ('analytics', ['analiza', 'statystyki', 'raport', 'stats']),
+    ('complex', ['wszystko', 'pełny', 'kompletny']),
+]
+
+
+def legacy_record(segment: str):
+    """Parsowanie "Dodaj wynik Jan, easy, 120" z `_handle_submit_score` (None zamiast wyjątku)"""
+    parts = segment.split(',')
+    if len(parts) < 3:
+        return None
+    head = parts[0].split()
+    digits = ''.join(filter(str.isdigit, parts[2]))
+    # Dawny int() zgłaszał ValueError na '²' - cyfry spoza ASCII odrzucają cały rekord
+    if not head or not digits or not digits.isascii():
+        return None
+    return ScoreRecord(head[-1].strip(), parts[1].strip(), int(digits))
+
+
+def legacy_route(request: str):
+    lower = request.lower()
+    intent = next((name for name, words in LEGACY_KEYWORDS if any(word in lower for word in words)), 'unknown')
+    if intent == 'submit_score':
+        return intent, tuple(legacy_record(segment) for segment in request.split(';'))
+    difficulty = next((d for d in ('easy', 'medium', 'hard') if d in lower), None)
+    limit = next((int(word) for word in request.split() if word.isdecimal()), DEFAULT_LIMIT)
+    return intent, difficulty, limit
+
+
+def route(router: IntentRouter, request: str):
+    routed = router.route(request)
+    if routed.intent == 'submit_score':
+        return routed.intent, routed.records
+    return routed.intent, routed.difficulty, routed.limit
+
+
+@pytest.fixture
+def router():
+    return IntentRouter()
+
+
+@pytest.mark.parametrize("request_text", [
+    "Pokaż top 5 wyników easy",
+    "Pokaż statystyki",
+    "Statystyki hard medium",
+    "Daj mi wszystko",
+    "Dodaj wynik Jan, easy, 120",
+    "Dodaj wynik Jan, easy, 120s; Ola, hard, 300; zepsuty",
+    "nowy wyniki 7",
+    "scorestats",
+    "analiza top",
+    "Dodaj wynik Jan, easy, 1²",
+    "Dodaj wynik Jan, easy, 12²",
+    "Dodaj wynik Jan, easy, 1٣",
+    "Zapisz Jan, easy, abc",
+    "co słychać?",
+    "",
+])
+def test_matches_legacy_keyword_lists(router, request_text):
+    assert route(router, request_text) == legacy_route(request_text)
+
+
+def test_time_with_non_ascii_digits_is_rejected(router):
+    assert router.route("Dodaj wynik Jan, easy, 12²").records == (None,)
+    assert router.route("Dodaj wynik Jan, easy, 12s").records == (ScoreRecord("Jan", "easy", 12),)
+
+
+def _fuzz_request(rng: random.Random) -> str:
+    fragments = [
+        'wyniki', 'scores', 'top', 'ranking', 'najlepsi', 'pokaż', 'POKAŻ', 'dodaj', 'zapisz', 'submit',
+        'nowy', 'nowy wynik', 'wynik', 'analiza', 'statystyki', 'raport', 'stats', 'wszystko', 'pełny',
+        'kompletny', 'easy', 'medium', 'hard', 'EASY', 'Jan', 'Ola', '5', '12', '007', '1²', '²', '٣',
+        'İ', 'ß', ',', ';', ' ', ' ', '  ', '\t', ' ', 's', 'x', 'ea', 'sy', 'ws', 'core',
+    ]
+
+    def soup(max_fragments: int) -> str:
+        return ''.join(rng.choice(fragments) for _ in range(rng.randint(0, max_fragments)))
+
+    if rng.random() < 0.5:
+        return soup(12)
+    # Kształt zapisu: "<słowo kluczowe> gracz, poziom, czas[; ...]" z losową zawartością pól
+    segments = [f"{soup(3)},{soup(2)},{soup(3)}" for _ in range(rng.randint(1, 3))]
+    return rng.choice(['Dodaj wynik ', 'zapisz ', 'nowy wynik ', '']) + ';'.join(segments)
+
+
+def test_fuzz_matches_legacy_and_never_raises(router):
+    rng = random.Random(2024)
+    for _ in range(20000):
+        request_text = _fuzz_request(rng)
+        assert route(router, request_text) == legacy_route(request_text), request_text
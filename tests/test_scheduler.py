@@ -0,0 +1,111 @@
+"""PriorityScheduler: ważone sprawiedliwe kolejkowanie slotów agentów"""
+
+import asyncio
+
+from agents.scheduler import DEFAULT_CLASSES, PriorityScheduler
+
+CLASSES = {
+    "write": {"weight": 8, "max_concurrent": 4},
+    "read": {"weight": 4, "max_concurrent": 4},
+    "analytics": {"weight": 1, "max_concurrent": 4},
+}
+
+
+def _run_saturated(scheduler: PriorityScheduler, per_class: int):
+    """Wszystkie klasy stale mają czekających; zwraca kolejność przyjęć i szczytowe zajętości"""
+    order = []
+    peak = {"total": 0, **{name: 0 for name in scheduler.classes}}
+
+    async def job(priority: str):
+        async with scheduler.slot(priority):
+            order.append(priority)
+            peak["total"] = max(peak["total"], scheduler.running)
+            peak[priority] = max(peak[priority], scheduler.classes[priority].running)
+            await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(*(job(name) for name in scheduler.classes for _ in range(per_class)))
+
+    asyncio.run(main())
+    return order, peak
+
+
+def test_saturated_classes_share_slots_in_proportion_to_weights():
+    scheduler = PriorityScheduler(1, CLASSES)
+    order, _ = _run_saturated(scheduler, per_class=200)
+
+    # Okno, w którym wszystkie klasy mają jeszcze czekających: 13 przyjęć na rundę 8:4:1
+    window = order[:130]
+    assert window.count("write") == 80
+    assert window.count("read") == 40
+    assert window.count("analytics") == 10
+
+
+def test_capacity_and_class_limits_are_respected():
+    scheduler = PriorityScheduler(5, {**CLASSES, "analytics": {"weight": 1, "max_concurrent": 2}})
+    _, peak = _run_saturated(scheduler, per_class=50)
+    assert peak["total"] == 5
+    assert peak["analytics"] <= 2
+    assert scheduler.running == 0
+    assert all(cls.queued == 0 for cls in scheduler.classes.values())
+
+
+def test_idle_class_does_not_bank_credit():
+    async def main():
+        scheduler = PriorityScheduler(1, CLASSES)
+        order = []
+
+        async def job(priority: str):
+            async with scheduler.slot(priority):
+                order.append(priority)
+                await asyncio.sleep(0)
+
+        # Długo działają tylko analizy - zapisy nie zbierają w tym czasie kredytu
+        await asyncio.gather(*(job("analytics") for _ in range(50)))
+        order.clear()
+        await asyncio.gather(*(job(name) for name in ("write", "analytics") for _ in range(45)))
+        return order
+
+    order = asyncio.run(main())
+    # Po powrocie zapisy dostają ~8 z każdych 9 slotów; z kredytem za bezczynność
+    # zajęłyby wszystkie 45 pierwszych
+    assert 4 <= order[:45].count("analytics") <= 5
+
+
+def test_cancelled_waiter_releases_its_slot():
+    async def main():
+        scheduler = PriorityScheduler(1, CLASSES)
+        gate = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot("read"):
+                await gate.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        gate.set()
+        await asyncio.gather(holder, waiter, return_exceptions=True)
+        async with scheduler.slot("write"):
+            pass
+        return scheduler
+
+    scheduler = asyncio.run(main())
+    assert scheduler.running == 0
+    assert scheduler.classes["read"].queued == 0
+
+
+def test_classes_missing_from_config_keep_defaults():
+    async def main():
+        scheduler = PriorityScheduler(5, {"write": {"weight": 2, "max_concurrent": 5}})
+        for priority in ("write", "read", "analytics"):
+            async with scheduler.slot(priority):
+                pass
+        return scheduler
+
+    scheduler = asyncio.run(main())
+    assert scheduler.classes["write"].weight == 2
+    assert scheduler.classes["analytics"].max_concurrent == DEFAULT_CLASSES["analytics"]["max_concurrent"]
+    assert all(cls.admitted == 1 for cls in scheduler.classes.values())
@@ -0,0 +1,100 @@
+"""Termin żądania z `_meta.timeoutSeconds` po stronie serwera MCP"""
+
+import asyncio
+import time
+
+import pytest
+from mcp import types
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from agents import deadline as deadline_module
+from mcp_server_minesweeper import MinesweeperMCP
+
+
+def _server() -> MinesweeperMCP:
+    server = MinesweeperMCP("deadline-test")
+
+    @server.tool()
+    async def slow(seconds: float = 5.0) -> str:
+        await asyncio.sleep(seconds)
+        return "done"
+
+    @server.tool()
+    async def remaining() -> str:
+        return str(deadline_module.remaining())
+
+    @server.resource("test://slow")
+    async def slow_resource() -> str:
+        await asyncio.sleep(5)
+        return "done"
+
+    return server
+
+
+def _run(scenario):
+    async def main():
+        async with create_connected_server_and_client_session(_server()) as session:
+            return await scenario(session)
+    return asyncio.run(main())
+
+
+def test_tool_call_is_cancelled_at_client_deadline():
+    async def scenario(session):
+        started = time.monotonic()
+        result = await session.call_tool("slow", {}, meta={"timeoutSeconds": 0.2})
+        return result, time.monotonic() - started
+
+    result, elapsed = _run(scenario)
+    assert result.isError
+    assert "Przekroczono termin" in result.content[0].text
+    assert elapsed < 2
+
+
+def test_resource_read_is_cancelled_at_client_deadline():
+    async def scenario(session):
+        # ClientSession.read_resource nie przyjmuje meta - żądanie budowane ręcznie
+        request = types.ClientRequest(types.ReadResourceRequest(
+            method="resources/read",
+            params=types.ReadResourceRequestParams(uri="test://slow", _meta={"timeoutSeconds": 0.2}),
+        ))
+        with pytest.raises(McpError) as error:
+            await session.send_request(request, types.ReadResourceResult)
+        return error.value.error.code
+
+    assert _run(scenario) == 408
+
+
+def test_deadline_is_visible_to_tool_code():
+    async def scenario(session):
+        result = await session.call_tool("remaining", {}, meta={"timeoutSeconds": 3})
+        return float(result.content[0].text)
+
+    assert 0 < _run(scenario) <= 3
+
+
+def test_call_without_timeout_has_no_deadline():
+    async def scenario(session):
+        return (await session.call_tool("remaining", {})).content[0].text
+
+    assert _run(scenario) == "None"
+
+
+@pytest.mark.parametrize("value", ["abc", True, [1]])
+def test_non_numeric_timeout_is_rejected(value):
+    async def scenario(session):
+        return await session.call_tool("slow", {"seconds": 0}, meta={"timeoutSeconds": value})
+
+    result = _run(scenario)
+    assert result.isError
+    assert "timeoutSeconds musi być liczbą" in result.content[0].text
+
+
+def test_numeric_string_timeout_is_accepted():
+    async def scenario(session):
+        return await session.call_tool("slow", {"seconds": 0}, meta={"timeoutSeconds": "2"})
+
+    result = _run(scenario)
+    assert not result.isError
+    assert result.content[0].text == "done"
+
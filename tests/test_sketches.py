@@ -0,0 +1,77 @@
+"""Szkice KLL i HyperLogLog: błąd w deklarowanych granicach względem wartości dokładnych"""
+
+import bisect
+import random
+
+import pytest
+
+from agents.sketches import HyperLogLog, KLLSketch
+
+
+def _rank_error(sketch: KLLSketch, values, q: float) -> float:
+    """Różnica rangi zwróconej wartości i rangi docelowej, jako ułamek liczby wartości"""
+    ordered = sorted(values)
+    estimate = sketch.quantile(q)
+    low = bisect.bisect_left(ordered, estimate) / len(ordered)
+    high = bisect.bisect_right(ordered, estimate) / len(ordered)
+    return 0.0 if low <= q <= high else min(abs(low - q), abs(high - q))
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_kll_rank_error_within_bound(seed):
+    rng = random.Random(seed)
+    values = [rng.lognormvariate(5, 1) for _ in range(50000)]
+    sketch = KLLSketch(k=200, seed=seed)
+    for value in values:
+        sketch.add(value)
+
+    assert len(sketch) == len(values)
+    # Deklarowany błąd rangi ~1.65/k; margines 3x na losowość kompakcji
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+        assert _rank_error(sketch, values, q) <= 3 * 1.65 / 200
+
+
+def test_kll_merge_keeps_error_bound():
+    rng = random.Random(4)
+    shards = [[rng.uniform(0, 3000) for _ in range(20000)] for _ in range(4)]
+    merged = KLLSketch(k=200, seed=0)
+    for index, shard in enumerate(shards):
+        sketch = KLLSketch(k=200, seed=index + 1)
+        for value in shard:
+            sketch.add(value)
+        merged.merge(sketch)
+
+    values = [value for shard in shards for value in shard]
+    assert len(merged) == len(values)
+    for q in (0.5, 0.9, 0.99):
+        assert _rank_error(merged, values, q) <= 3 * 1.65 / 200
+
+
+def test_kll_small_input_is_exact():
+    sketch = KLLSketch(k=200)
+    for value in [5, 1, 4, 2, 3]:
+        sketch.add(value)
+    assert sketch.quantiles([0.2, 0.5, 1.0]) == [1, 3, 5]
+    assert KLLSketch().quantile(0.5) is None
+
+
+@pytest.mark.parametrize("cardinality", [10, 1000, 50000])
+def test_hll_error_within_bound(cardinality):
+    sketch = HyperLogLog(precision=14)
+    for i in range(cardinality):
+        sketch.add(f"player-{i}")
+        sketch.add(f"player-{i}")
+
+    # Błąd standardowy 1.04/sqrt(2^14) ~ 0.8%; 4 sigma
+    assert abs(sketch.count() - cardinality) <= max(1, 4 * 1.04 / 2 ** 7 * cardinality)
+
+
+def test_hll_merge_equals_union():
+    left, right, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    for i in range(30000):
+        (left if i % 2 else right).add(i)
+        union.add(i)
+    for i in range(10000):
+        left.add(i)
+    left.merge(right)
+    assert left.registers == union.registers
@@ -0,0 +1,142 @@
+"""Migawka statystyk serwera MCP: jeden pełny przegląd, potem tylko nowe wyniki"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import mcp_server_minesweeper as server
+from benchmarks.stub_api import StubState, create_app
+
+
+class _Api:
+    """Stub MinesweeperAPI podłączony do klienta HTTP serwera, z licznikiem pobranych wyników"""
+
+    def __init__(self, scores_count: int = 300, latency_ms: float = 0.0):
+        self.state = StubState(scores_count=scores_count, players_count=40, latency_ms=latency_ms)
+        self.fetched = 0
+        app = create_app(self.state)
+
+        async def count(response: httpx.Response) -> None:
+            if response.request.url.path.endswith("/scores/since"):
+                await response.aread()
+                self.fetched += len(response.json())
+
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), event_hooks={"response": [count]})
+
+
+@pytest.fixture
+def api(monkeypatch):
+    api = _Api()
+    monkeypatch.setattr(server, "_http_client", api.client)
+    monkeypatch.setattr(server, "stats_snapshot", server._StatsSnapshot())
+    return api
+
+
+def test_first_read_builds_everything(api):
+    async def scenario():
+        store = await server._score_store()
+        return len(store), server.stats_snapshot.last_id
+
+    count, last_id = asyncio.run(scenario())
+    assert count == 300
+    assert last_id == api.state.scores[-1]["id"]
+    assert api.fetched == 300
+
+
+def test_stale_read_returns_immediately_and_refresh_pulls_only_new_scores(api, monkeypatch):
+    async def scenario():
+        store = await server._score_store()
+        players, rollups = server.stats_snapshot.players, server.stats_snapshot.rollups
+        for i in range(5):
+            api.state.add_score(f"Other{i}", "hard", 50 + i)
+        monkeypatch.setattr(server, "STATS_TTL", 0.0)
+
+        served = await server._score_store()
+        served_count = len(served)
+        await server.stats_snapshot._refresh
+
+        snapshot = server.stats_snapshot
+        return store, served, served_count, players is snapshot.players and rollups is snapshot.rollups
+
+    store, served, served_count, same_indexes = asyncio.run(scenario())
+    assert served is store
+    assert served_count == 300
+    assert len(store) == 305
+    assert same_indexes
+    assert api.fetched == 305
+    assert server.stats_snapshot.refreshes == 2
+
+
+def test_own_writes_are_visible_at_once_and_not_counted_twice(api):
+    async def scenario():
+        await server._score_store()
+        await server._post_score("Writer", "easy", 7)
+        visible = len(server.stats_snapshot.store), server.stats_snapshot.players.best_time("Writer", "easy")
+        await server.stats_snapshot.refresh()
+        return visible
+
+    visible = asyncio.run(scenario())
+    assert visible == (301, 7)
+    assert len(server.stats_snapshot.store) == 301
+    assert server.stats_snapshot.store.stats()["total_games"] == 301
+    assert server.stats_snapshot.players.players["Writer"]["easy"].attempts == 1
+
+
+def test_max_age_waits_for_new_scores(api):
+    async def scenario():
+        await server._score_store()
+        api.state.add_score("Late", "medium", 42)
+        await asyncio.sleep(0.01)
+        return len(await server._score_store(max_age=0.0))
+
+    assert asyncio.run(scenario()) == 301
+
+
+def test_cancelled_reader_does_not_cancel_the_build(monkeypatch):
+    api = _Api(latency_ms=200)
+    monkeypatch.setattr(server, "_http_client", api.client)
+    monkeypatch.setattr(server, "stats_snapshot", server._StatsSnapshot())
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(server._score_store(), timeout=0.05)
+        await server.stats_snapshot._refresh
+        return len(server.stats_snapshot.store)
+
+    assert asyncio.run(scenario()) == 300
+    assert api.fetched == 300
+
+
+def test_search_index_and_prefix_cache_survive_refresh(api):
+    async def scenario():
+        await server._score_store()
+        search = server.stats_snapshot.players.search
+        before = search.search("player1", limit=3)
+        for _ in range(50):
+            api.state.add_score("Player1Busy", "easy", 300)
+        await server.stats_snapshot.refresh()
+        return search, before, search.search("player1", limit=3)
+
+    search, before, after = asyncio.run(scenario())
+    assert server.stats_snapshot.players.search is search
+    assert "player1" in search._top
+    assert after[0] == "Player1Busy"
+    assert after[1:] == before[:2]
+
+
+def test_rollups_survive_refresh_and_count_new_scores(api):
+    async def scenario():
+        await server._score_store()
+        rollups = server.stats_snapshot.rollups
+        before = rollups.window(server.PERIODS["week"]).total_games
+        api.state.add_score("Fresh", "easy", 30)
+        await server.stats_snapshot.refresh()
+        after = rollups.window(server.PERIODS["week"])
+        return rollups, before, after
+
+    rollups, before, after = asyncio.run(scenario())
+    assert server.stats_snapshot.rollups is rollups
+    assert after.total_games == before + 1
+    # Nowy wynik trafił do bieżącej godziny - złączenie zamkniętej części okna pochodzi z cache
+    assert rollups.window_cache.stats()["hits"] >= 1
@@ -0,0 +1,210 @@
+"""Circuit breaker, adaptacyjny limiter (AIMD) i single-flight"""
+
+import asyncio
+
+import pytest
+
+from agents.upstream import (AdaptiveLimiter, CircuitBreaker, CircuitOpenError, LimiterRejectedError,
+                             SingleFlight)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# Circuit breaker
+
+def test_breaker_opens_after_threshold_and_rejects():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 4
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert error.value.retry_after == pytest.approx(6)
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_breaker_success_resets_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, clock=_Clock())
+    for outcome in ["fail", "fail", "ok", "fail", "fail"]:
+        breaker.before_call()
+        breaker.record_failure() if outcome == "fail" else breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_half_open_lets_one_probe_through():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # Próba nieudana - obwód znów otwarty na pełny czas
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 19
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 20
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.opened == 2
+
+
+def test_breaker_released_probe_can_be_retried():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=1, clock=clock)
+    breaker.record_failure()
+    clock.now = 1
+    breaker.before_call()
+    breaker.release_probe()
+    breaker.before_call()
+
+
+# Adaptacyjny limiter
+
+def test_limiter_never_exceeds_limit():
+    async def scenario():
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=4, queue_timeout=5)
+        running = peak = 0
+
+        async def work():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+
+        await asyncio.gather(*(limiter.run(work) for _ in range(50)))
+        return peak, limiter
+
+    peak, limiter = asyncio.run(scenario())
+    assert peak == 4
+    assert limiter.in_flight == 0
+    assert limiter.queue_depth == 0
+
+
+def test_limiter_decreases_once_per_overload_and_respects_min():
+    async def scenario():
+        limiter = AdaptiveLimiter(initial_limit=10, min_limit=2, is_overload=lambda e: isinstance(e, OSError))
+
+        async def overloaded():
+            await asyncio.sleep(0.01)
+            raise OSError("503")
+
+        # Dziesięć równoległych żądań z jednej fali przeciążenia obniża limit raz
+        results = await asyncio.gather(*(limiter.run(overloaded) for _ in range(10)), return_exceptions=True)
+        assert all(isinstance(result, OSError) for result in results)
+        after_wave = limiter.limit
+
+        for _ in range(40):
+            with pytest.raises(OSError):
+                await limiter.run(overloaded)
+        return after_wave, limiter
+
+    after_wave, limiter = asyncio.run(scenario())
+    assert after_wave == pytest.approx(9)
+    assert limiter.limit == limiter.min_limit
+
+
+def test_limiter_grows_additively_when_utilised():
+    async def scenario():
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=5)
+
+        async def quick():
+            await asyncio.sleep(0)
+
+        for _ in range(30):
+            await asyncio.gather(*(limiter.run(quick) for _ in range(8)))
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.limit == 5
+    assert limiter.increases == 3
+
+
+def test_limiter_rejects_when_queue_is_full_or_times_out():
+    async def scenario():
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1, max_queue=1, queue_timeout=0.05)
+        gate = asyncio.Event()
+
+        async def blocked():
+            await gate.wait()
+
+        holder = asyncio.create_task(limiter.run(blocked))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(limiter.run(blocked))
+        await asyncio.sleep(0)
+        with pytest.raises(LimiterRejectedError, match="kolejka pełna"):
+            await limiter.run(blocked)
+        with pytest.raises(LimiterRejectedError, match="oczekiwania"):
+            await queued
+        gate.set()
+        await holder
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert (limiter.rejected, limiter.timed_out, limiter.in_flight) == (1, 1, 0)
+
+
+def test_limiter_returns_slot_granted_as_wait_times_out(monkeypatch):
+    async def scenario():
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1, queue_timeout=5)
+        await limiter.acquire()
+
+        async def granted_then_timeout(waiter, timeout):
+            # release() przydziela slot w tej samej iteracji pętli, w której mija timeout
+            limiter.release(0.0, sample=False)
+            assert waiter.done()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(asyncio, "wait_for", granted_then_timeout)
+        with pytest.raises(LimiterRejectedError):
+            await limiter.acquire()
+        monkeypatch.undo()
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.in_flight == 0
+    assert limiter.timed_out == 1
+
+# Single-flight
+
+def test_single_flight_coalesces_and_survives_one_cancelled_waiter():
+    async def scenario():
+        flights = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return "value"
+
+        waiters = [asyncio.create_task(flights.do("key", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        waiters[0].cancel()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        return calls, results, flights.stats()
+
+    calls, results, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == ["value"] * 4
+    assert stats["abandoned"] == 0 and stats["in_flight"] == 0